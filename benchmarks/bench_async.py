@@ -0,0 +1,49 @@
+"""
+Пропускная способность AsyncCatalog при множестве одновременных корутин.
+
+Каждая корутина добавляет товар и сразу запрашивает среднюю цену категории;
+записи всех корутин применяются пачками на итерациях цикла событий.
+
+Запуск: python -m benchmarks.bench_async [корутин] [запросов на корутину]
+"""
+import asyncio
+import sys
+import time
+
+from src.aio import AsyncCatalog
+from src.classes import Category, LogMixin, Product
+from src.log_sinks import NullSink
+
+
+async def run(coroutines: int, per_coroutine: int) -> None:
+    catalog = AsyncCatalog([Category("Нагрузка", "Замер")])
+    products = [
+        [Product(f"Товар {c}-{i}", "Описание", 10.0 + i, 1) for i in range(per_coroutine)] for c in range(coroutines)
+    ]
+
+    async def client(batch: list) -> None:
+        for product in batch:
+            await catalog.add_product("Нагрузка", product)
+            await catalog.middle_price("Нагрузка")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(batch) for batch in products))
+    elapsed = time.perf_counter() - start
+
+    total = coroutines * per_coroutine
+    assert len(catalog.category("Нагрузка").products) == total
+    print(f"запросы: {2 * total / elapsed:12,.0f} запросов/с ({coroutines} корутин)")
+    print(f"шагов применения: {catalog.apply_steps} на {total} записей")
+
+
+def main(coroutines: int, per_coroutine: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        asyncio.run(run(coroutines, per_coroutine))
+    finally:
+        LogMixin.set_log_sink(previous)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [1_000, 20][len(args):]))
@@ -0,0 +1,40 @@
+"""
+Пакетное создание товаров против построчного Product.new_product.
+
+Запуск: python -m benchmarks.bench_batch [количество строк]
+"""
+import sys
+import time
+
+from src.classes import LogMixin, Product
+from src.log_sinks import NullSink
+
+
+def make_rows(count: int) -> list:
+    return [
+        {"name": f"Товар {i}", "description": "Описание", "price": 100.0 + i % 1000, "quantity": 1 + i % 50}
+        for i in range(count)
+    ]
+
+
+def main(count: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        rows = make_rows(count)
+        start = time.perf_counter()
+        for row in rows:
+            Product.new_product(dict(row))
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Product.new_product_batch(rows)
+        batch = time.perf_counter() - start
+    finally:
+        LogMixin.set_log_sink(previous)
+
+    print(f"new_product:       {count / single:12,.0f} строк/с")
+    print(f"new_product_batch: {count / batch:12,.0f} строк/с")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
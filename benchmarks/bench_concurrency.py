@@ -0,0 +1,59 @@
+"""
+Пропускная способность ConcurrentCategory при одновременных писателях и читателях.
+
+Запуск: python -m benchmarks.bench_concurrency [писателей] [читателей] [товаров на писателя]
+"""
+import sys
+import threading
+import time
+
+from src.classes import LogMixin, Product
+from src.concurrent_category import ConcurrentCategory
+from src.log_sinks import NullSink
+
+
+def main(writers: int, readers: int, per_writer: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    category = ConcurrentCategory("Нагрузка", "Замер")
+    batches = [
+        [Product(f"Товар {w}-{i}", "Описание", 10.0 + i, 1 + i % 5) for i in range(per_writer)] for w in range(writers)
+    ]
+    LogMixin.set_log_sink(previous)
+
+    done = threading.Event()
+    reads = [0] * readers
+
+    def writer(batch: list) -> None:
+        for start in range(0, len(batch), 100):
+            category.add_products(batch[start:start + 100])
+
+    def reader(slot: int) -> None:
+        while not done.is_set():
+            category.middle_price()
+            category.total_quantity
+            len(category.snapshot())
+            reads[slot] += 1
+
+    reader_threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(batch,)) for batch in batches]
+    start = time.perf_counter()
+    for thread in reader_threads + writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    for thread in reader_threads:
+        thread.join()
+
+    total = writers * per_writer
+    assert len(category.snapshot()) == total and category.total_quantity == sum(
+        product.quantity for batch in batches for product in batch
+    )
+    print(f"записи: {total / elapsed:12,.0f} товаров/с ({writers} потоков, пачки по 100)")
+    print(f"чтения: {sum(reads) / elapsed:12,.0f} снимков/с ({readers} потоков)")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [8, 2, 5_000][len(args):]))
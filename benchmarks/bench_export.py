@@ -0,0 +1,100 @@
+"""
+Скорость потоковой выгрузки каталога (строк в секунду), размер файла и пиковая дополнительная
+память при выгрузке. Для сравнения — выгрузка «целиком»: список словарей всех товаров
+собирается в памяти и записывается одним json.dump. Затем замеряется обратная загрузка.
+
+Запуск: python -m benchmarks.bench_export [категорий] [товаров в категории]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from benchmarks.catalog import write_catalog
+from src.classes import Category, LogMixin
+from src.export import FORMATS, export_catalog, load_export
+from src.log_sinks import NullSink
+from src.registry import product_registry
+from src.utils import load_data_from_json
+
+
+def dump_whole(categories: List[Category], path: str) -> int:
+    """Выгрузка без потоковой записи: все записи собираются в памяти"""
+    data = []
+    for category in categories:
+        products = []
+        for product in category._products:
+            spec = product_registry.spec_for(type(product))
+            record = {"type": spec.type_name}
+            record.update((field, getattr(product, field)) for field in spec._names)
+            products.append(record)
+        data.append({"name": category.name, "description": category.description, "products": products})
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False)
+    return sum(len(category["products"]) for category in data)
+
+
+def measure(export: Callable[[], int]) -> Tuple[int, float, int]:
+    """Возвращает число строк, время и пиковую память, выделенную во время выгрузки"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = export()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+def main(categories: int, per_category: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "products.json")
+            write_catalog(source, categories, per_category)
+            catalog = load_data_from_json(source)
+            # orjson при первой выгрузке кэширует UTF-8 представление в самих строках каталога;
+            # эта память принадлежит каталогу, а не выгрузке, поэтому прогреваем её заранее
+            export_catalog(catalog, os.path.join(directory, "warmup.jsonl"))
+            print(f"товаров: {categories * per_category} ({categories} категорий)")
+            print("выгрузка (пиковая память измерена tracemalloc и замедляет выгрузку):")
+
+            path = os.path.join(directory, "whole.json")
+            rows, elapsed, peak = measure(lambda: dump_whole(catalog, path))
+            print(
+                f"  {'json.dump целиком':<18} {rows / elapsed:11,.0f} строк/с, "
+                f"{os.path.getsize(path) / 2 ** 20:7.1f} МБ, пик {peak / 2 ** 20:7.1f} МБ"
+            )
+            for format in FORMATS:
+                path = os.path.join(directory, f"export.{format}")
+                rows, elapsed, peak = measure(lambda: export_catalog(catalog, path, format=format))
+                print(
+                    f"  {format:<18} {rows / elapsed:11,.0f} строк/с, "
+                    f"{os.path.getsize(path) / 2 ** 20:7.1f} МБ, пик {peak / 2 ** 20:7.1f} МБ"
+                )
+
+            print("выгрузка без tracemalloc и обратная загрузка:")
+            for format in FORMATS:
+                path = os.path.join(directory, f"export.{format}")
+                start = time.perf_counter()
+                rows = export_catalog(catalog, path, format=format)
+                export_time = time.perf_counter() - start
+                start = time.perf_counter()
+                loaded = load_data_from_json(path) if format == "json" else load_export(path, format)
+                load_time = time.perf_counter() - start
+                assert [str(category) for category in loaded] == [str(category) for category in catalog]
+                print(
+                    f"  {format:<18} выгрузка {rows / export_time:11,.0f} строк/с, "
+                    f"загрузка {rows / load_time:11,.0f} строк/с"
+                )
+    finally:
+        LogMixin.set_log_sink(previous)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10_000,
+    )
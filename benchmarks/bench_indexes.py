@@ -0,0 +1,59 @@
+"""
+Поиск по индексам категории против линейного просмотра _products.
+
+Запуск: python -m benchmarks.bench_indexes [количество товаров]
+"""
+import sys
+import time
+from typing import Callable
+
+from src.classes import Category, LogMixin, Product
+from src.log_sinks import NullSink
+
+
+def timed(query: Callable[[], object], repeats: int = 100) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        query()
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def main(count: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        products = [
+            Product(f"Товар {i}", "Описание", float(1 + (i * 7919) % 100_000), 1 + i % 500) for i in range(count)
+        ]
+    finally:
+        LogMixin.set_log_sink(previous)
+    category = Category("Большая", "Много товаров", products)
+
+    start = time.perf_counter()
+    category.cheapest()
+    print(f"построение индексов: {time.perf_counter() - start:.2f} с на {count} товаров")
+
+    name = f"Товар {count // 2}"
+    cases = {
+        "по названию": (
+            lambda: category.find_by_name(name),
+            lambda: [p for p in category._products if p.name == name],
+        ),
+        "цена 500..510": (
+            lambda: category.products_in_price_range(500, 510),
+            lambda: sorted((p for p in category._products if 500 <= p.price <= 510), key=lambda p: p.price),
+        ),
+        "10 самых дешёвых": (
+            lambda: category.cheapest(10),
+            lambda: sorted(category._products, key=lambda p: p.price)[:10],
+        ),
+        "остаток <= 1": (
+            lambda: category.low_stock(1),
+            lambda: [p for p in category._products if p.quantity <= 1],
+        ),
+    }
+    for label, (indexed, linear) in cases.items():
+        print(f"{label:<18} индекс: {timed(indexed):8.4f} мс   перебор: {timed(linear, 3):9.2f} мс")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,58 @@
+"""
+Параллельная загрузка нескольких файлов поставщиков.
+
+Запуск: python -m benchmarks.bench_ingest [файлов] [товаров в файле]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.classes import LogMixin
+from src.ingest import find_feeds, load_feeds_parallel, parse_feed
+from src.log_sinks import NullSink
+
+
+def write_feeds(directory: str, files: int, per_file: int) -> None:
+    for number in range(files):
+        products = [
+            {"name": f"Товар {number}-{i}", "description": "Описание", "price": str(100 + i % 900), "quantity": 1}
+            for i in range(per_file)
+        ]
+        categories = [{"name": f"Категория {number % 4}", "description": "Описание", "products": products}]
+        with open(os.path.join(directory, f"feed_{number}.json"), "w", encoding="utf-8") as file:
+            json.dump(categories, file, ensure_ascii=False)
+
+
+def main(files: int, per_file: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            write_feeds(directory, files, per_file)
+            baseline = None
+            paths = find_feeds(directory)
+            print(f"ядер: {os.cpu_count()}")
+            for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+                start = time.perf_counter()
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    list(pool.map(parse_feed, paths))
+                parse_time = time.perf_counter() - start
+                start = time.perf_counter()
+                load_feeds_parallel(directory, max_workers=workers)
+                elapsed = time.perf_counter() - start
+                baseline = baseline or parse_time
+                print(
+                    f"процессов: {workers:<3} разбор: {parse_time:6.2f} с (ускорение {baseline / parse_time:4.1f}x), "
+                    f"вместе с созданием объектов: {elapsed:6.2f} с"
+                )
+    finally:
+        LogMixin.set_log_sink(previous)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50_000,
+    )
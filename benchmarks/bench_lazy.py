@@ -0,0 +1,73 @@
+"""
+Загрузка каталога с созданием всех товаров против ленивых категорий (load_data_from_json(lazy=True)):
+время до сводки всех категорий и память, которую занимают загруженные категории.
+
+Запуск: python -m benchmarks.bench_lazy [категорий] [товаров в категории]
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List, Tuple, cast
+
+from benchmarks.catalog import write_catalog
+from src.classes import Category, LogMixin
+from src.lazy import LazyProducts
+from src.log_sinks import NullSink
+from src.utils import load_data_from_json
+
+REPEATS = 3
+
+
+def measure(path: str, lazy: bool) -> Tuple[float, int, List[str]]:
+    """Возвращает лучшее время загрузки со сводками, занятую память и сводки категорий"""
+    elapsed = float("inf")
+    for _ in range(REPEATS):
+        gc.collect()
+        start = time.perf_counter()
+        categories = load_data_from_json(path, lazy=lazy)
+        summaries = [f"{category} {category.middle_price():.2f} {len(category._products)}" for category in categories]
+        elapsed = min(elapsed, time.perf_counter() - start)
+        del categories
+
+    tracemalloc.start()
+    categories = load_data_from_json(path, lazy=lazy)
+    gc.collect()
+    resident = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del categories
+    return elapsed, resident, summaries
+
+
+def main(categories: int, per_category: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "products.json")
+            write_catalog(path, categories, per_category)
+            eager_time, eager_memory, eager_summaries = measure(path, lazy=False)
+            lazy_time, lazy_memory, lazy_summaries = measure(path, lazy=True)
+
+            lazy = load_data_from_json(path, lazy=True)
+            start = time.perf_counter()
+            storage = cast(LazyProducts, lazy[0]._products)
+            products = list(storage)
+            materialize_time = time.perf_counter() - start
+    finally:
+        LogMixin.set_log_sink(previous)
+
+    assert lazy_summaries == eager_summaries and storage.materialized_count == len(products)
+    Category.category_count = Category.product_count = 0
+    print(f"товаров: {categories * per_category} ({categories} категорий)")
+    print(f"все товары: {eager_time * 1000:9.1f} мс, память {eager_memory / 2 ** 20:8.1f} МБ")
+    print(f"лениво:     {lazy_time * 1000:9.1f} мс, память {lazy_memory / 2 ** 20:8.1f} МБ")
+    print(f"создание товара при обращении: {materialize_time / per_category * 1e6:.1f} мкс")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10_000,
+    )
@@ -0,0 +1,39 @@
+"""
+Скорость создания товаров с разными приёмниками LogMixin.
+
+Запуск: python -m benchmarks.bench_logging [количество объектов]
+"""
+import sys
+import time
+
+from src.classes import LogMixin, Product
+from src.log_sinks import BufferedSink, LogSink, NullSink, PrintSink, SampledSink
+
+
+def constructions_per_second(sink: LogSink, count: int) -> float:
+    previous = LogMixin.set_log_sink(sink)
+    try:
+        start = time.perf_counter()
+        for i in range(count):
+            Product("Ноутбук", "Мощный", 99999.99, 5)
+        sink.flush()
+        return count / (time.perf_counter() - start)
+    finally:
+        LogMixin.set_log_sink(previous)
+
+
+def main(count: int) -> None:
+    sinks = {
+        "print": PrintSink(),
+        "sampled(1/1000)": SampledSink(PrintSink(), every=1000),
+        "buffered": BufferedSink(),
+        "none": NullSink(),
+    }
+    results = {name: constructions_per_second(sink, count) for name, sink in sinks.items()}
+    sinks["buffered"].close()
+    for name, rate in results.items():
+        print(f"{name:<16} {rate:12,.0f} объектов/с", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
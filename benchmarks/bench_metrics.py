@@ -0,0 +1,40 @@
+"""
+Стоимость метрик src.metrics: выключенные против включённых.
+
+Запуск: python -m benchmarks.bench_metrics [количество товаров]
+"""
+import sys
+import time
+
+from src.classes import Category, LogMixin, Product
+from src.log_sinks import NullSink
+from src.metrics import metrics
+
+
+def workload(count: int) -> float:
+    start = time.perf_counter()
+    category = Category("Замер", "Метрики")
+    for number in range(count):
+        category.add_product(Product(f"Товар {number}", "Описание", 10.0 + number % 100, 1))
+        category.middle_price()
+    return time.perf_counter() - start
+
+
+def main(count: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        disabled = min(workload(count) for _ in range(3))
+        metrics.enable()
+        try:
+            enabled = min(workload(count) for _ in range(3))
+        finally:
+            metrics.disable()
+    finally:
+        LogMixin.set_log_sink(previous)
+
+    print(f"метрики выключены: {disabled:.3f} с ({count:,} товаров: создание, add_product, middle_price)")
+    print(f"метрики включены:  {enabled:.3f} с (+{(enabled / disabled - 1) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
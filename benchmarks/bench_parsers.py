@@ -0,0 +1,69 @@
+"""
+Пропускная способность парсеров src.parsers на большом синтетическом файле, МБ/с.
+
+Для сравнения приводятся разбор одного JSON без приведения записей и потоковое
+чтение iter_raw_categories. Полная загрузка load_data_from_json включает создание объектов.
+
+Запуск: python -m benchmarks.bench_parsers [категорий] [товаров в категории]
+"""
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+from typing import Any, Callable, Dict
+
+from benchmarks.catalog import write_catalog
+from src.classes import LogMixin
+from src.log_sinks import NullSink
+from src.parsers import PARSERS, SchemaParser, StdlibParser, available_parsers, get_parser
+from src.utils import iter_raw_categories, load_data_from_json
+
+
+def best_time(function: Callable[[], Any], repeats: int = 3) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(category_count: int, per_category: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "products.json")
+            write_catalog(path, category_count, per_category)
+            with open(path, "rb") as file:
+                data = file.read()
+            megabytes = len(data) / 1_000_000
+            print(f"файл: {megabytes:.1f} МБ, товаров: {category_count * per_category}")
+            print(f"доступные парсеры: {', '.join(available_parsers())}, по умолчанию: {get_parser()!r}")
+
+            cases: Dict[str, Callable[[], Any]] = {
+                "потоковое чтение без приведения": lambda: list(iter_raw_categories(path)),
+            }
+            for name in available_parsers():
+                parser = PARSERS[name]()
+                if name != "schema":
+                    cases[f"{name}: только JSON"] = partial(parser.loads, data)
+                cases[f"{name}: типизированные строки"] = partial(parser.parse, data)
+            if "orjson" in available_parsers():
+                schema_stdlib = SchemaParser(StdlibParser())
+                cases["schema на json: типизированные строки"] = lambda: schema_stdlib.parse(data)
+            cases["load_data_from_json (stdlib)"] = lambda: load_data_from_json(path, parser="stdlib")
+            cases["load_data_from_json (по умолчанию)"] = lambda: load_data_from_json(path)
+
+            for name, case in cases.items():
+                elapsed = best_time(case)
+                print(f"{name:40} {elapsed:7.3f} с {megabytes / elapsed:8.1f} МБ/с")
+    finally:
+        LogMixin.set_log_sink(previous)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2_000,
+    )
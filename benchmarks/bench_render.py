@@ -0,0 +1,42 @@
+"""
+Повторный вывод списка товаров категории (Category.products).
+
+Запуск: python -m benchmarks.bench_render [товаров в категории] [повторов]
+"""
+import sys
+import time
+from typing import List
+
+from src.classes import Category, LawnGrass, LogMixin, Product, Smartphone
+from src.log_sinks import NullSink
+
+
+def build_category(count: int) -> Category:
+    products: List[Product] = [
+        Smartphone(f"Смартфон {i}", "Флагман", 10000.0 + i, 5, "A15", f"Модель {i}", 256, "Черный")
+        if i % 2
+        else LawnGrass(f"Трава {i}", "Для дачи", 500.0 + i, 20, "Россия", "3 недели", "Зелёный")
+        for i in range(count)
+    ]
+    return Category("Смешанная", "Смартфоны и трава", products)
+
+
+def main(count: int, repeats: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        category = build_category(count)
+    finally:
+        LogMixin.set_log_sink(previous)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        category.products
+    elapsed = time.perf_counter() - start
+    print(f"{repeats} выводов по {count} товаров: {elapsed * 1000 / repeats:.3f} мс на вывод")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    )
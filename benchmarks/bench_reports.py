@@ -0,0 +1,46 @@
+"""
+Повторные отчёты через кэш Category.report против построения при каждом запросе.
+
+Запуск: python -m benchmarks.bench_reports [количество товаров] [запросов]
+"""
+import sys
+import time
+
+from src.classes import Category, LogMixin, Product
+from src.log_sinks import NullSink
+
+BANDS = [(0, 1_000), (1_000, 5_000), (5_000, 20_000)]
+
+
+def main(count: int, queries: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        products = [
+            Product(f"Товар {i}", "Описание", float(1 + (i * 7919) % 20_000), 1 + i % 50) for i in range(count)
+        ]
+    finally:
+        LogMixin.set_log_sink(previous)
+    category = Category("Отчёты", "Замер", products)
+    category.cheapest()
+
+    start = time.perf_counter()
+    for number in range(queries):
+        low, high = BANDS[number % len(BANDS)]
+        [str(product) for product in category.products_in_price_range(low, high)]
+        [str(product) for product in category.most_expensive(10)]
+    direct = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for number in range(queries):
+        category.report("price_band", *BANDS[number % len(BANDS)])
+        category.report("most_expensive", 10)
+    cached = time.perf_counter() - start
+
+    stats = category.report_stats()
+    print(f"без кэша: {direct:8.3f} с на {queries} пар запросов")
+    print(f"с кэшем:  {cached:8.3f} с (попаданий {stats.hit_rate:.1%}, в {direct / cached:.0f} раз быстрее)")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [100_000, 200][len(args):]))
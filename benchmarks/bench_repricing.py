@@ -0,0 +1,65 @@
+"""
+Пакетная переоценка PriceJournal.reprice против цикла по сеттеру Product.price.
+
+Замер идёт для обычной категории, категории с построенным индексом цен
+и ConcurrentCategory.
+
+Запуск: python -m benchmarks.bench_repricing [количество товаров]
+"""
+import sys
+import time
+from typing import Callable, Type
+
+from src.classes import Category, LogMixin, Product
+from src.concurrent_category import ConcurrentCategory
+from src.log_sinks import NullSink
+from src.repricing import PriceJournal
+
+
+def make_category(cls: Type[Category], count: int, indexed: bool) -> Category:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        products = [Product(f"Товар {i}", "Описание", 100.0 + i % 1000, 1 + i % 50) for i in range(count)]
+    finally:
+        LogMixin.set_log_sink(previous)
+    category = cls("Распродажа", "Замер", products)
+    if indexed:
+        category.cheapest()
+    return category
+
+
+def on_sale(product: Product) -> bool:
+    return product.price >= 500
+
+
+def setter_loop(category: Category) -> None:
+    for product in category._products:
+        if product.price >= 500:
+            product.price = round(product.price * 0.8, 2)
+
+
+def measure(action: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def main(count: int) -> None:
+    for label, cls, indexed in (
+        ("Category", Category, False),
+        ("Category с индексом цен", Category, True),
+        ("ConcurrentCategory", ConcurrentCategory, False),
+    ):
+        looped, batched = make_category(cls, count, indexed), make_category(cls, count, indexed)
+        journal = PriceJournal()
+        setter = measure(lambda: setter_loop(looped))
+        bulk = measure(lambda: journal.reprice(batched, percent=-20, where=on_sale, ndigits=2))
+        rollback = measure(journal.rollback)
+        print(
+            f"{label:24} сеттер {setter:7.3f} с, reprice {bulk:7.3f} с "
+            f"(в {setter / bulk:5.1f} раз быстрее), rollback {rollback:7.3f} с"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
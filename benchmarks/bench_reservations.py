@@ -0,0 +1,99 @@
+"""
+Пропускная способность StockReservations: потоки-покупатели оформляют заказы из нескольких
+позиций (резерв, затем подтверждение или отмена), пока товар не закончится.
+Остаток товаров покрывает около 90% ожидаемого спроса, так что к концу прогона часть товаров
+заканчивается. После каждого прогона проверяется, что ничего не продано сверх начального остатка.
+Для сравнения те же заказы выполняются с одной полосой, то есть под общей блокировкой.
+
+Запуск: python -m benchmarks.bench_reservations [товаров] [заказов на поток]
+"""
+import random
+import sys
+import threading
+import time
+from typing import List, Tuple
+
+from src.classes import Category, LogMixin, Product
+from src.log_sinks import NullSink
+from src.reservations import ReservationError, StockReservations
+
+THREADS = (1, 2, 4, 8, 16)
+STRIPES = (1, 64)
+ITEMS_PER_ORDER = 3
+CANCEL_RATE = 0.1
+SUPPLY = 0.9
+
+
+def run(threads: int, stripes: int, products_count: int, orders: int) -> Tuple[float, int, int, int]:
+    """Возвращает заказов/с, подтверждённые заказы, отказы и перепроданные единицы"""
+    # в среднем 2 шт. на позицию
+    stock = max(1, int(SUPPLY * threads * orders * ITEMS_PER_ORDER * 2 / products_count))
+    products = [Product(f"Товар {i}", "Описание", 10.0 + i % 100, stock) for i in range(products_count)]
+    categories = [
+        Category(f"Категория {start}", "Замер", products[start:start + 100]) for start in range(0, products_count, 100)
+    ]
+    engine = StockReservations(stripes)
+    barrier = threading.Barrier(threads + 1)
+    sold: List[List[int]] = [[0] * products_count for _ in range(threads)]
+    outcomes = [[0, 0] for _ in range(threads)]
+
+    def buyer(worker: int) -> None:
+        rng = random.Random(worker)
+        positions = range(products_count)
+        plans = [
+            [(position, rng.randint(1, 3)) for position in rng.sample(positions, ITEMS_PER_ORDER)]
+            for _ in range(orders)
+        ]
+        cancels = [rng.random() < CANCEL_RATE for _ in range(orders)]
+        counts = sold[worker]
+        barrier.wait()
+        for plan, cancel in zip(plans, cancels):
+            try:
+                reservation = engine.reserve([(products[position], quantity) for position, quantity in plan])
+            except ReservationError:
+                outcomes[worker][1] += 1
+                continue
+            if cancel:
+                engine.release(reservation)
+                continue
+            engine.commit(reservation)
+            outcomes[worker][0] += 1
+            for position, quantity in plan:
+                counts[position] += quantity
+
+    workers = [threading.Thread(target=buyer, args=(worker,)) for worker in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    totals = [sum(column) for column in zip(*sold)]
+    oversold = sum(max(0, total - stock) for total in totals)
+    assert [product.quantity for product in products] == [stock - total for total in totals]
+    assert sum(category.total_quantity for category in categories) == sum(product.quantity for product in products)
+    committed = sum(outcome[0] for outcome in outcomes)
+    rejected = sum(outcome[1] for outcome in outcomes)
+    return threads * orders / elapsed, committed, rejected, oversold
+
+
+def main(products_count: int, orders: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        print(f"{products_count} товаров, {orders} заказов на поток, {ITEMS_PER_ORDER} позиции в заказе")
+        for stripes in STRIPES:
+            for threads in THREADS:
+                rate, committed, rejected, oversold = run(threads, stripes, products_count, orders)
+                print(
+                    f"полос {stripes:>2}, {threads:>2} потоков: {rate:9,.0f} заказов/с, "
+                    f"подтверждено {committed:>7,}, отказов {rejected:>6,}, перепродано {oversold} шт."
+                )
+    finally:
+        LogMixin.set_log_sink(previous)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [1_000, 20_000][len(args):]))
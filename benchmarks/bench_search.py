@@ -0,0 +1,106 @@
+"""
+Поиск по словам и фасетам через src.search.SearchIndex против линейного просмотра товаров.
+
+Запуск: python -m benchmarks.bench_search [категорий] [товаров в категории]
+"""
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.catalog import generate_catalog
+from src.classes import Category, LogMixin, Product
+from src.log_sinks import NullSink
+from src.registry import product_registry
+from src.search import SearchIndex
+
+# (слова, фильтры фасетов)
+QUERIES: List[Tuple[str, Dict[str, Any]]] = [
+    ("samsung", {}),
+    ("samsung", {"color": "Черный"}),
+    ("", {"memory": 256, "price_band": "от 100000"}),
+    ("газон", {"country": "Россия", "color": "Зеленый"}),
+    ("черный цвет", {"memory": [128, 256]}),
+]
+
+
+def linear_search(products: List[Product], text: str, filters: Dict[str, Any]) -> List[Product]:
+    """Поиск без индекса: подстроки в названии и описании и сравнение атрибутов"""
+    words = text.lower().split()
+    found = []
+    for product in products:
+        haystack = f"{product.name} {product.description}".lower()
+        if not all(word in haystack for word in words):
+            continue
+        if "color" in filters and getattr(product, "color", None) != filters["color"]:
+            continue
+        if "country" in filters and getattr(product, "country", None) != filters["country"]:
+            continue
+        memory = filters.get("memory")
+        allowed = memory if isinstance(memory, list) else [memory]
+        if memory is not None and getattr(product, "memory", None) not in allowed:
+            continue
+        if filters.get("price_band") == "от 100000" and product.price < 100_000:
+            continue
+        found.append(product)
+    return found
+
+
+def median_ms(function: Callable[[], Any], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main(category_count: int, per_category: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        categories = [
+            Category(data["name"], data["description"], list(map(product_registry.build, data["products"])))
+            for data in generate_catalog(category_count, per_category)
+        ]
+        products = [product for category in categories for product in category._products]
+        print(f"товаров: {len(products)}")
+
+        start = time.perf_counter()
+        index = SearchIndex(categories)
+        elapsed = time.perf_counter() - start
+        print(f"построение индекса: {elapsed:.2f} с ({len(products) / elapsed:,.0f} товаров/с)")
+
+        for text, filters in QUERIES:
+            indexed = median_ms(lambda: index.search(text, limit=20, **filters), 7)
+            linear = median_ms(lambda: linear_search(products, text, filters), 1)
+            total = index.search(text, limit=0, **filters).total
+            label = " ".join(filter(None, [repr(text) if text else "", *(f"{k}={v}" for k, v in filters.items())]))
+            print(
+                f"{label:50} найдено {total:>8}: индекс {indexed:8.2f} мс, "
+                f"перебор {linear:9.1f} мс ({linear / indexed:6.0f}x)"
+            )
+
+        rates = []
+        for target in (Category("Без индекса", "Замер"), categories[0]):
+            additions = [
+                Product(f"Samsung новинка {number}", "64GB, Белый цвет", 1000.0 + number, 1)
+                for number in range(10_000)
+            ]
+            start = time.perf_counter()
+            for product in additions:
+                target.add_product(product)
+            rates.append(len(additions) / (time.perf_counter() - start))
+        first_query = median_ms(lambda: index.search("samsung новинка", limit=20, color="Белый"), 1)
+        print(
+            f"add_product: без индекса {rates[0]:,.0f} товаров/с, с обновлением индекса {rates[1]:,.0f} товаров/с, "
+            f"первый запрос после добавлений: {first_query:.2f} мс"
+        )
+    finally:
+        LogMixin.set_log_sink(previous)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50_000,
+    )
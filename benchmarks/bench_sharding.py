@@ -0,0 +1,111 @@
+"""
+Чтение цен и остатков из разделяемой памяти шардов несколькими процессами.
+
+Каждый процесс-читатель подключается к каталогу через CatalogReader и в течение заданного
+времени считает middle_price, общий остаток и стоимость остатка по колонкам. Для сравнения
+те же запросы выполняются в одном процессе по объектам Category. Отдельно замеряются
+записи через координатор.
+
+Запуск: python -m benchmarks.bench_sharding [категорий] [товаров в категории] [секунд]
+"""
+import multiprocessing
+import os
+import sys
+import time
+from typing import List, cast
+
+from benchmarks.catalog import generate_catalog
+from src.classes import Category, LogMixin, Product
+from src.log_sinks import NullSink
+from src.registry import product_registry
+from src.sharding import CatalogDescriptor, CatalogReader, ShardedCatalog
+
+
+def read_objects(categories: List[Category], seconds: float) -> int:
+    reads = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for category in categories:
+            category.middle_price()
+            category.total_quantity
+            category.stock_value
+            reads += 1
+    return reads
+
+
+def read_shared(descriptor: CatalogDescriptor, seconds: float, queue: "multiprocessing.Queue[int]") -> None:
+    reads = 0
+    with CatalogReader(descriptor) as reader:
+        names = reader.category_names
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for name in names:
+                # одно согласованное чтение даёт все агрегаты категории
+                count, price_sum, quantity, stock_value = reader.totals(name)
+                price_sum / count if count else 0
+                reads += 1
+    queue.put(reads)
+
+
+def main(category_count: int, per_category: int, seconds: float) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        categories = [
+            Category(data["name"], data["description"], list(map(product_registry.build, data["products"])))
+            for data in generate_catalog(category_count, per_category)
+        ]
+        # стоимость по колонкам, как и Product.__add__, считается только для товаров одного типа
+        uniform = Category(
+            "Однородная",
+            "Только Product",
+            [Product(f"Товар {i}", "Описание", 1.0 + i % 997, 1 + i % 7) for i in range(per_category)],
+        )
+        categories.append(uniform)
+        print(f"ядер: {os.cpu_count()}, категорий: {category_count}, товаров: {category_count * per_category}")
+        reads = read_objects(categories, seconds)
+        print(f"один процесс, объекты Category: {reads / seconds:12,.0f} чтений категории/с")
+
+        with ShardedCatalog(categories) as catalog:
+            for readers in sorted({1, 2, 4, os.cpu_count() or 1}):
+                queue: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+                processes = [
+                    multiprocessing.Process(target=read_shared, args=(catalog.descriptor, seconds, queue))
+                    for _ in range(readers)
+                ]
+                for process in processes:
+                    process.start()
+                total = sum(queue.get() for _ in processes)
+                for process in processes:
+                    process.join()
+                print(f"читателей: {readers:<3} разделяемая память: {total / seconds:12,.0f} чтений категории/с")
+
+            name = uniform.name
+            start = time.perf_counter()
+            valuation = catalog.reader.valuation(name)
+            elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            # категория создана из списка товаров, поэтому её хранилище — список
+            products = cast(List[Product], uniform._products)
+            pairwise = sum(first + second for first, second in zip(products[::2], products[1::2]))
+            pairwise_elapsed = time.perf_counter() - start
+            print(
+                f"стоимость категории ({per_category} товаров): по колонкам {elapsed * 1000:.2f} мс, "
+                f"через Product.__add__ {pairwise_elapsed * 1000:.2f} мс ({valuation:,.0f} / {pairwise:,.0f})"
+            )
+
+            writes = 2_000
+            start = time.perf_counter()
+            for number in range(writes):
+                catalog.add_product(name, Product(f"Новый {number}", "Описание", 100.0, 1))
+            elapsed = time.perf_counter() - start
+            print(f"add_product через координатор: {writes / elapsed:,.0f} записей/с")
+    finally:
+        LogMixin.set_log_sink(previous)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10_000,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 2.0,
+    )
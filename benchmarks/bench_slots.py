@@ -0,0 +1,50 @@
+"""
+Размер экземпляра и скорость создания товаров иерархии Product.
+
+Запуск: python -m benchmarks.bench_slots [количество объектов]
+"""
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+from src.classes import LawnGrass, Product, Smartphone
+
+FACTORIES = {
+    "Product": lambda: Product("Ноутбук", "Мощный", 99999.99, 5),
+    "Smartphone": lambda: Smartphone("iPhone", "Флагман", 100000.0, 5, "A15", "iPhone 13", 256, "Черный"),
+    "LawnGrass": lambda: LawnGrass("Газонная трава", "Для дачи", 500.0, 20, "Россия", "3 недели", "Зелёный"),
+}
+
+
+def bytes_per_instance(factory: Callable[[], object], count: int) -> float:
+    """Память, удерживаемая одним экземпляром (строки общие и в замер не попадают)"""
+    tracemalloc.start()
+    objects: List[object] = [factory() for _ in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # вычитаем сам список ссылок
+    return (current - sys.getsizeof(objects)) / len(objects)
+
+
+def constructions_per_second(factory: Callable[[], object], count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        factory()
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int) -> None:
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = {
+            name: (bytes_per_instance(factory, count), constructions_per_second(factory, count))
+            for name, factory in FACTORIES.items()
+        }
+    for name, (size, rate) in results.items():
+        print(f"{name:<12} {size:7.1f} байт/экземпляр  {rate:12,.0f} объектов/с")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
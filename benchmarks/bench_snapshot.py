@@ -0,0 +1,68 @@
+"""
+Время старта: загрузка каталога из JSON против загрузки бинарного снимка.
+
+Запуск: python -m benchmarks.bench_snapshot [категорий] [товаров в категории]
+"""
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+from src.classes import Category
+from src.snapshot import load_snapshot, save_snapshot
+from src.utils import load_data_from_json
+
+
+def write_catalog(path: str, categories: int, per_category: int) -> None:
+    data = [
+        {
+            "name": f"Категория {c}",
+            "description": "Описание категории",
+            "products": [
+                {"name": f"Товар {c}-{i}", "description": "Описание", "price": 100.0 + i, "quantity": 1 + i % 9}
+                for i in range(per_category)
+            ],
+        }
+        for c in range(categories)
+    ]
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False)
+
+
+def main(categories: int, per_category: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "products.json")
+        snapshot_path = os.path.join(directory, "catalog.snap")
+        write_catalog(json_path, categories, per_category)
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            loaded = load_data_from_json(json_path)
+            summaries = [str(category) for category in loaded]
+            json_time = time.perf_counter() - start
+        save_snapshot(loaded, snapshot_path)
+
+        start = time.perf_counter()
+        restored = load_snapshot(snapshot_path)
+        assert [str(category) for category in restored] == summaries
+        snapshot_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for category in restored:
+            category.products
+        materialize_time = time.perf_counter() - start
+
+    total = categories * per_category
+    print(f"товаров: {total}, категорий: {Category.category_count}")
+    print(f"JSON до первого ответа:    {json_time * 1000:10.1f} мс")
+    print(f"снимок до первого ответа:  {snapshot_time * 1000:10.1f} мс")
+    print(f"создание всех товаров из снимка: {materialize_time * 1000:10.1f} мс")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2_000,
+    )
@@ -0,0 +1,49 @@
+"""
+Сравнение расхода памяти на один товар: список объектов Product против ProductTable.
+
+Запуск: python -m benchmarks.bench_table [количество товаров]
+"""
+import contextlib
+import os
+import sys
+import tracemalloc
+from typing import Callable, Iterator
+
+from src.classes import Product
+from src.table import ProductTable
+
+
+def make_records(count: int) -> Iterator[dict]:
+    """Генерирует записи на лету, чтобы строки товаров учитывались в замере каждой структуры"""
+    for i in range(count):
+        yield {
+            "name": f"Товар {i}",
+            "description": f"Описание группы {i % 100}",
+            "price": 100.0 + i % 1000,
+            "quantity": 1 + i % 50,
+        }
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Возвращает прирост памяти, который остаётся занятым построенной структурой"""
+    tracemalloc.start()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main(count: int) -> None:
+    objects_bytes = measure(lambda: [Product(**record) for record in make_records(count)])
+    table_bytes = measure(lambda: ProductTable.from_records(make_records(count)))
+
+    print(f"товаров: {count}")
+    print(f"list[Product]: {objects_bytes / count:8.1f} байт/товар")
+    print(f"ProductTable:  {table_bytes / count:8.1f} байт/товар")
+    print(f"выигрыш: {objects_bytes / table_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
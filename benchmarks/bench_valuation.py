@@ -0,0 +1,70 @@
+"""
+Оценка остатков движком src.valuation против попарного сложения через Product.__add__.
+
+Запуск: python -m benchmarks.bench_valuation [категорий] [товаров в категории]
+"""
+import sys
+import time
+
+import src.valuation as valuation
+from src.classes import Category, LogMixin, Product
+from src.log_sinks import NullSink
+from src.table import ProductTable
+from src.valuation import value_by_category
+
+
+def pairwise(categories: list) -> dict:
+    totals = {}
+    for category in categories:
+        products = category._products
+        total = 0.0
+        for index in range(0, len(products) - 1, 2):
+            total += products[index] + products[index + 1]
+        if len(products) % 2:
+            total += products[-1].price * products[-1].quantity
+        totals[category.name] = total
+    return totals
+
+
+def main(category_count: int, per_category: int) -> None:
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        categories = [
+            Category(
+                f"Категория {c}",
+                "Описание",
+                [Product(f"Товар {i}", "Описание", 10.0 + i % 997 * 0.01, 1 + i % 50) for i in range(per_category)],
+            )
+            for c in range(category_count)
+        ]
+    finally:
+        LogMixin.set_log_sink(previous)
+
+    start = time.perf_counter()
+    pairwise(categories)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    value_by_category(categories)
+    engine = time.perf_counter() - start
+
+    tables = [
+        Category(category.name, category.description, ProductTable(category._products)) for category in categories
+    ]
+    start = time.perf_counter()
+    value_by_category(tables)
+    columnar = time.perf_counter() - start
+
+    backend = "numpy" if valuation.np is not None else "python"
+    total = category_count * per_category
+    for label, elapsed in (
+        ("попарно через __add__", loop),
+        (f"value_by_category ({backend})", engine),
+        ("value_by_category, ProductTable", columnar),
+    ):
+        print(f"{label:34} {elapsed:8.3f} с ({total / elapsed:12,.0f} товаров/с)")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [100, 10_000][len(args):]))
@@ -0,0 +1,67 @@
+"""
+Генератор синтетического каталога для замеров: N категорий по M товаров,
+смартфоны и газонная трава вперемешку, в формате data/products.json.
+"""
+import json
+import random
+from typing import Any, Dict, List
+
+_COLORS = ("Черный", "Белый", "Серый", "Синий", "Зеленый", "Красный")
+_COUNTRIES = ("Россия", "США", "Китай", "Германия", "Нидерланды")
+_BRANDS = ("Samsung", "Iphone", "Xiaomi", "Honor", "Realme")
+
+
+def generate_products(count: int, rng: random.Random, prefix: str = "") -> List[Dict[str, Any]]:
+    """Записи товаров с полем type: примерно поровну smartphone и lawn_grass"""
+    products = []
+    for number in range(count):
+        price = round(rng.uniform(100, 200_000), 2)
+        quantity = rng.randint(1, 100)
+        color = rng.choice(_COLORS)
+        if rng.random() < 0.5:
+            memory = rng.choice((64, 128, 256, 512))
+            products.append(
+                {
+                    "type": "smartphone",
+                    "name": f"{rng.choice(_BRANDS)} {prefix}{number}",
+                    "description": f"{memory}GB, {color} цвет",
+                    "price": price,
+                    "quantity": quantity,
+                    "efficiency": f"{rng.uniform(80, 99):.1f}",
+                    "model": f"M{number % 50}",
+                    "memory": memory,
+                    "color": color,
+                }
+            )
+        else:
+            products.append(
+                {
+                    "type": "lawn_grass",
+                    "name": f"Газон {prefix}{number}",
+                    "description": "Газонная трава",
+                    "price": price,
+                    "quantity": quantity,
+                    "country": rng.choice(_COUNTRIES),
+                    "germination_period": f"{rng.randint(5, 21)} дней",
+                    "color": color,
+                }
+            )
+    return products
+
+
+def generate_catalog(categories: int, products_per_category: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Каталог из categories категорий по products_per_category товаров; seed делает его воспроизводимым"""
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Категория {number}",
+            "description": f"Синтетическая категория {number}",
+            "products": generate_products(products_per_category, rng, prefix=f"{number}-"),
+        }
+        for number in range(categories)
+    ]
+
+
+def write_catalog(path: str, categories: int, products_per_category: int, seed: int = 0) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(generate_catalog(categories, products_per_category, seed), file, ensure_ascii=False)
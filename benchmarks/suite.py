@@ -0,0 +1,253 @@
+"""
+Набор замеров основных операций каталога на синтетических данных разного размера.
+
+Результаты сохраняются в JSON (базовая линия), а режим сравнения сообщает о замедлениях
+относительно сохранённой базовой линии и завершается с кодом 1, если они есть.
+
+Запуск:
+    python -m benchmarks.suite --save [PATH]
+    python -m benchmarks.suite --compare [PATH] [--threshold 0.25] [--scales small medium large]
+
+По умолчанию базовая линия хранится в benchmarks/baseline.json. Файл зависит от машины и версии
+Python, поэтому в репозиторий не добавляется (см. .gitignore) и записывается там, где выполняется сравнение.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+from benchmarks.catalog import generate_catalog
+from src.classes import Category, LogMixin, Product
+from src.log_sinks import NullSink
+from src.registry import product_registry
+from src.utils import load_data_from_json
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+# размер: (категорий, товаров в категории)
+SCALES: Dict[str, Tuple[int, int]] = {
+    "small": (10, 100),
+    "medium": (20, 1_000),
+    "large": (50, 2_000),
+}
+
+
+class Case(NamedTuple):
+    """Замер: setup готовит данные (не входит во время), run выполняет измеряемую операцию"""
+
+    name: str
+    setup: Callable[[List[Dict[str, Any]], str], Any]
+    run: Callable[[Any], Any]
+
+
+def _load(catalog: List[Dict[str, Any]], path: str) -> str:
+    return path
+
+
+def _records(catalog: List[Dict[str, Any]], path: str) -> List[Dict[str, Any]]:
+    # new_product изменяет переданный словарь, поэтому каждому повтору нужны свои копии
+    return [
+        {field: record[field] for field in ("name", "description", "price", "quantity")}
+        for category in catalog
+        for record in category["products"]
+    ]
+
+
+def _new_products(records: List[Dict[str, Any]]) -> None:
+    for record in records:
+        Product.new_product(record)
+
+
+def _products(catalog: List[Dict[str, Any]], path: str) -> Tuple[Category, List[Product]]:
+    products = [product_registry.build(record) for category in catalog for record in category["products"]]
+    return Category("Замер", "add_product"), products
+
+
+def _add_products(state: Tuple[Category, List[Product]]) -> None:
+    category, products = state
+    for product in products:
+        category.add_product(product)
+
+
+def _categories(catalog: List[Dict[str, Any]], path: str) -> List[Category]:
+    return load_data_from_json(path)
+
+
+def _middle_prices(categories: List[Category]) -> None:
+    for _ in range(1_000):
+        for category in categories:
+            category.middle_price()
+
+
+def _render(categories: List[Category]) -> None:
+    for category in categories:
+        category.products
+
+
+def _pairs(catalog: List[Dict[str, Any]], path: str) -> List[Tuple[Product, Product]]:
+    pairs: List[Tuple[Product, Product]] = []
+    for category in load_data_from_json(path):
+        by_type: Dict[type, List[Product]] = {}
+        for product in category._products:
+            by_type.setdefault(type(product), []).append(product)
+        for products in by_type.values():
+            pairs.extend(zip(products[::2], products[1::2]))
+    return pairs
+
+
+def _add_pairs(pairs: List[Tuple[Product, Product]]) -> float:
+    return sum(first + second for first, second in pairs)
+
+
+CASES = (
+    Case("load_data_from_json", _load, load_data_from_json),
+    Case("Product.new_product", _records, _new_products),
+    Case("Category.add_product", _products, _add_products),
+    Case("Category.middle_price", _categories, _middle_prices),
+    Case("Category.products", _categories, _render),
+    Case("Product.__add__", _pairs, _add_pairs),
+)
+
+
+def _measure(run: Callable[[Any], Any], state: Any) -> float:
+    """Время одного выполнения; сборщик мусора на время замера отключается, как в timeit"""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        run(state)
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def calibrate(repeats: int = 5) -> float:
+    """
+    Время эталонной нагрузки на чистом Python. По нему сравнение приводит результаты
+    к скорости машины, на которой снята базовая линия.
+    """
+
+    def workload() -> None:
+        values: Dict[int, str] = {}
+        for number in range(200_000):
+            values[number % 1_000] = f"{number}"
+
+    return min(_measure(lambda _: workload(), None) for _ in range(repeats))
+
+
+def run_suite(scales: Sequence[str], repeats: int = 5, verbose: bool = True) -> Dict[str, Any]:
+    """Выполняет все замеры; для каждого сохраняются минимальное и медианное время в секундах"""
+    results: Dict[str, Dict[str, float]] = {}
+    previous = LogMixin.set_log_sink(NullSink())
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for scale in scales:
+                category_count, per_category = SCALES[scale]
+                catalog = generate_catalog(category_count, per_category)
+                path = os.path.join(directory, f"{scale}.json")
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump(catalog, file, ensure_ascii=False)
+
+                for case in CASES:
+                    timings = []
+                    for _ in range(repeats):
+                        state = case.setup(catalog, path)
+                        timings.append(_measure(case.run, state))
+                        del state
+                    key = f"{case.name}@{scale}"
+                    results[key] = {"min": min(timings), "median": statistics.median(timings)}
+                    if verbose:
+                        print(f"{key:40} {min(timings) * 1000:10.2f} мс", file=sys.stderr)
+    finally:
+        LogMixin.set_log_sink(previous)
+
+    return {
+        "meta": {
+            "calibration": calibrate(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "repeats": repeats,
+            "scales": {scale: SCALES[scale] for scale in scales},
+        },
+        "results": results,
+    }
+
+
+class Comparison(NamedTuple):
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD
+) -> Tuple[List[Comparison], List[Comparison]]:
+    """
+    Сравнивает минимальные времена общих замеров.
+
+    Время базовой линии масштабируется на отношение калибровочных замеров двух запусков.
+    Возвращает все сравнения и те из них, что медленнее базовой линии больше чем на threshold.
+    """
+    scale = 1.0
+    if baseline["meta"].get("calibration") and current["meta"].get("calibration"):
+        scale = current["meta"]["calibration"] / baseline["meta"]["calibration"]
+    comparisons = [
+        Comparison(key, baseline["results"][key]["min"] * scale, result["min"])
+        for key, result in current["results"].items()
+        if key in baseline["results"]
+    ]
+    regressions = [comparison for comparison in comparisons if comparison.ratio > 1 + threshold]
+    return comparisons, regressions
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    parser = argparse.ArgumentParser(description="Замеры производительности каталога")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--save", metavar="PATH", nargs="?", const=DEFAULT_BASELINE, help="сохранить результаты как базовую линию"
+    )
+    parser.add_argument(
+        "--compare", metavar="PATH", nargs="?", const=DEFAULT_BASELINE, help="сравнить с базовой линией"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="допустимое замедление (0.25 = 25%%)"
+    )
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.scales, args.repeats)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(current, file, ensure_ascii=False, indent=2)
+    if not args.compare:
+        if not args.save:
+            json.dump(current, sys.stdout, ensure_ascii=False, indent=2)
+        return 0
+
+    with open(args.compare, encoding="utf-8") as file:
+        baseline = json.load(file)
+    comparisons, regressions = compare(baseline, current, args.threshold)
+    for comparison in comparisons:
+        mark = "ЗАМЕДЛЕНИЕ" if comparison in regressions else ""
+        print(
+            f"{comparison.key:40} {comparison.baseline * 1000:10.2f} -> {comparison.current * 1000:10.2f} мс "
+            f"({comparison.ratio:5.2f}x) {mark}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,236 @@
+"""
+Асинхронный фасад каталога для веб-слоя на asyncio.
+
+Чтение файлов и создание объектов (вместе с логированием LogMixin) выполняются
+в пуле потоков, поэтому не блокируют цикл событий. Записи от множества корутин
+не применяются по одной: они копятся в очереди и применяются одним шагом
+на следующей итерации цикла. Идущие подряд добавления товаров в одну категорию
+объединяются в один вызов add_products (у ConcurrentCategory — одна публикация снимка).
+
+Каждая запись проверяется до применения, поэтому некорректная запись ничего не меняет,
+а ошибку получает только корутина, которая её поставила. Если хранилище категории отвергает
+товар из объединённых добавлений, ошибку получает только запись с этим товаром: записи
+перед ней уже применены, а следующие за ней добавляются заново.
+"""
+import asyncio
+from typing import AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from src.classes import Category, Product
+from src.repricing import RepriceError, _invalid, _write_prices
+from src.utils import DEFAULT_DATA_PATH, build_category, iter_raw_categories
+
+Mutation = Callable[[], None]
+
+
+class _Write(NamedTuple):
+    """Запись в очереди: добавление товаров в категорию или произвольное изменение"""
+
+    waiter: "asyncio.Future[None]"
+    category: Optional[Category]
+    products: List[Product]
+    mutation: Optional[Mutation]
+
+
+class _Additions(NamedTuple):
+    """Идущие подряд добавления в одну категорию"""
+
+    category: Category
+    writes: List[_Write]
+
+
+def _settle(waiter: "asyncio.Future[None]", error: Optional[BaseException] = None) -> None:
+    if waiter.done():
+        return
+    if error is None:
+        waiter.set_result(None)
+    else:
+        waiter.set_exception(error)
+
+
+def _check_products(products: List[Product]) -> None:
+    for product in products:
+        if not isinstance(product, Product):
+            raise TypeError("Можно добавлять только объекты класса Product или его наследников")
+
+
+class AsyncCatalog:
+    def __init__(self, categories: Optional[List[Category]] = None):
+        self._categories: Dict[str, Category] = {category.name: category for category in categories or ()}
+        self._pending: List[_Write] = []
+        self._apply_scheduled = False
+        self.apply_steps = 0
+
+    # --- загрузка ---
+
+    async def iter_categories(self, path: str = DEFAULT_DATA_PATH) -> AsyncIterator[Category]:
+        """Потоково загружает категории, разбирая файл и создавая объекты в отдельном потоке"""
+        raw = iter_raw_categories(path)
+
+        def next_category() -> Optional[Category]:
+            for category_data in raw:
+                return build_category(category_data)
+            return None
+
+        while True:
+            category = await asyncio.to_thread(next_category)
+            if category is None:
+                return
+            self._categories[category.name] = category
+            yield category
+
+    async def load(self, path: str = DEFAULT_DATA_PATH) -> List[Category]:
+        return [category async for category in self.iter_categories(path)]
+
+    # --- записи ---
+
+    def _schedule(
+        self,
+        category: Optional[Category] = None,
+        products: Optional[List[Product]] = None,
+        mutation: Optional[Mutation] = None,
+    ) -> "asyncio.Future[None]":
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._pending.append(_Write(waiter, category, products or [], mutation))
+        if not self._apply_scheduled:
+            self._apply_scheduled = True
+            loop.call_soon(self._apply)
+        return waiter
+
+    def _apply(self) -> None:
+        """Применяет все накопленные записи одним шагом и будит ожидающие корутины"""
+        pending, self._pending = self._pending, []
+        self._apply_scheduled = False
+        self.apply_steps += 1
+        # добавления копятся, пока их не прервёт другая запись, чтобы не менять порядок записей
+        additions: Dict[int, _Additions] = {}
+        for write in pending:
+            if write.category is None:
+                self._add_all(additions)
+                additions.clear()
+                try:
+                    if write.mutation is not None:
+                        write.mutation()
+                except Exception as error:
+                    _settle(write.waiter, error)
+                else:
+                    _settle(write.waiter)
+                continue
+            try:
+                _check_products(write.products)
+            except TypeError as error:
+                _settle(write.waiter, error)
+                continue
+            group = additions.get(id(write.category))
+            if group is None:
+                group = additions[id(write.category)] = _Additions(write.category, [])
+            group.writes.append(write)
+        self._add_all(additions)
+
+    @staticmethod
+    def _add_all(additions: Dict[int, _Additions]) -> None:
+        """
+        Добавляет товары записей группы одним вызовом. add_products добавляет товары по мере
+        перебора, поэтому при ошибке известно, на какой записи она произошла.
+        """
+        for category, writes in additions.values():
+            add_products = getattr(category, "add_products", None)
+            while writes:
+                # номер записи, товары которой сейчас добавляются
+                current = 0
+
+                def products() -> Iterator[Product]:
+                    nonlocal current
+                    for current, write in enumerate(writes):
+                        yield from write.products
+
+                try:
+                    if add_products is not None:
+                        add_products(products())
+                    else:
+                        for product in products():
+                            category.add_product(product)
+                except Exception as error:
+                    for write in writes[:current]:
+                        _settle(write.waiter)
+                    _settle(writes[current].waiter, error)
+                    writes = writes[current + 1:]
+                else:
+                    for write in writes:
+                        _settle(write.waiter)
+                    writes = []
+
+    def category(self, name: str) -> Category:
+        try:
+            return self._categories[name]
+        except KeyError:
+            raise KeyError(f"Категория {name} не найдена") from None
+
+    async def add_category(self, category: Category) -> None:
+        await self._schedule(mutation=lambda: self._categories.__setitem__(category.name, category))
+
+    async def add_product(self, category_name: str, product: Product) -> None:
+        await self._schedule(category=self.category(category_name), products=[product])
+
+    async def add_products(self, category_name: str, products: List[Product]) -> None:
+        await self._schedule(category=self.category(category_name), products=list(products))
+
+    async def set_prices(self, prices: Dict[Product, float]) -> None:
+        """
+        Пакетно меняет цены. Если хотя бы одна цена не положительна, не меняется ни одна,
+        а вызывающий получает RepriceError.
+        """
+        await self._schedule(mutation=lambda: self._set_prices(prices))
+
+    @staticmethod
+    def _set_prices(prices: Dict[Product, float]) -> None:
+        products = list(prices)
+        new_prices = list(prices.values())
+        old_prices = [product.price for product in products]
+        invalid = _invalid(products, old_prices, new_prices)
+        if invalid:
+            raise RepriceError("Цена не должна быть нулевая или отрицательная", invalid)
+        _write_prices(products, old_prices, new_prices)
+
+    async def set_quantities(self, quantities: Dict[Product, int]) -> None:
+        """Пакетно меняет остатки; при некорректном остатке не меняется ни один"""
+        await self._schedule(mutation=lambda: self._set_quantities(quantities))
+
+    @staticmethod
+    def _set_quantities(quantities: Dict[Product, int]) -> None:
+        invalid = [quantity for quantity in quantities.values() if type(quantity) is not int or quantity < 0]
+        if invalid:
+            raise ValueError(f"Остаток товара должен быть неотрицательным целым числом: {invalid[0]!r}")
+        for product, quantity in quantities.items():
+            product.quantity = quantity
+
+    async def flush(self) -> None:
+        """Дожидается применения всех ранее поставленных записей"""
+        if self._pending:
+            await self._schedule()
+
+    # --- запросы ---
+
+    async def categories(self) -> List[str]:
+        await self.flush()
+        return list(self._categories)
+
+    async def summary(self, category_name: str) -> str:
+        await self.flush()
+        return str(self.category(category_name))
+
+    async def middle_price(self, category_name: str) -> float:
+        await self.flush()
+        return self.category(category_name).middle_price()
+
+    async def products(self, category_name: str) -> List[str]:
+        await self.flush()
+        return self.category(category_name).products
+
+    async def find_by_name(self, category_name: str, name: str) -> List[Product]:
+        await self.flush()
+        return self.category(category_name).find_by_name(name)
+
+    async def products_in_price_range(self, category_name: str, min_price: float, max_price: float) -> List[Product]:
+        await self.flush()
+        return self.category(category_name).products_in_price_range(min_price, max_price)
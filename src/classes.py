@@ -1,37 +1,342 @@
+import threading
 from abc import ABC
-from typing import Any, Dict, Optional, List
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+from src.indexes import CategoryIndex
+from src.log_sinks import LogRecord, LogSink, PrintSink
+from src.report_cache import CacheStats, ReportCache
+
+if TYPE_CHECKING:
+    from src.storage import DeferredProducts
+    from src.table import ProductTable
+
+
+_MISSING = object()
+
+# Сколько товаров пакетного изменения цен можно перенести в индексе по одному;
+# при большем числе индекс выгоднее построить заново
+_REINDEX_THRESHOLD = 1024
+
+
+class RowError(NamedTuple):
+    """
+    Ошибка в одной строке пакета товаров.
+
+    field — поле с ошибкой; пустая строка, если конструктор товара отклонил строку,
+    не указав поле (атрибутом field исключения).
+    """
+
+    row: int
+    field: str
+    message: str
+
+
+class BatchResult(NamedTuple):
+    """Результат пакетного создания: созданные товары и ошибки по строкам"""
+
+    products: List["Product"]
+    errors: List[RowError]
+
+
+def _coerce_column(
+    values: List[Any],
+    field: str,
+    accepted: Tuple[type, ...],
+    convert: Callable[[Any], Any],
+    expected: str,
+    valid: List[bool],
+    errors: List[RowError],
+) -> List[Any]:
+    """
+    Приводит колонку к нужному типу; значения уже подходящего типа проходят без преобразования.
+    expected описывает допустимые значения в сообщении об ошибке.
+    """
+    result = []
+    for row, value in enumerate(values):
+        if type(value) in accepted:
+            result.append(value)
+            continue
+        if value is _MISSING:
+            errors.append(RowError(row, field, f"Отсутствует обязательное поле: {field}"))
+        else:
+            try:
+                result.append(convert(value))
+                continue
+            except (ValueError, TypeError):
+                errors.append(RowError(row, field, f"Поле '{field}' должно быть {expected}"))
+        valid[row] = False
+        result.append(None)
+    return result
+
+
+def _require_str(value: Any) -> str:
+    if not isinstance(value, str):
+        raise TypeError
+    return value
+
+
+def validate_product_records(
+    records: Union[Iterable[Mapping[str, Any]], Mapping[str, Sequence[Any]]],
+) -> Tuple[Dict[str, List[Any]], List[bool], List[RowError]]:
+    """
+    Проверяет и приводит типы полей сразу для всех строк пакета.
+
+    Принимает либо последовательность словарей, либо колоночный словарь {поле: список значений}.
+    Входные данные не изменяются. Возвращает приведённые колонки, признак корректности
+    каждой строки и список ошибок; на первой ошибке проверка не останавливается.
+    """
+    fields = ("name", "description", "price", "quantity")
+    if isinstance(records, Mapping):
+        size = max((len(column) for column in records.values()), default=0)
+        columns = {}
+        for field in fields:
+            column = list(records.get(field, ()))
+            columns[field] = column + [_MISSING] * (size - len(column))
+    else:
+        rows = list(records)
+        size = len(rows)
+        columns = {field: [row.get(field, _MISSING) for row in rows] for field in fields}
+
+    valid = [True] * size
+    errors: List[RowError] = []
+    number = "числом или строкой, представляющей число"
+    coerced = {
+        "name": _coerce_column(columns["name"], "name", (str,), _require_str, "строкой", valid, errors),
+        "description": _coerce_column(
+            columns["description"], "description", (str,), _require_str, "строкой", valid, errors
+        ),
+        "price": _coerce_column(columns["price"], "price", (int, float), float, number, valid, errors),
+        "quantity": _coerce_column(columns["quantity"], "quantity", (int,), int, number, valid, errors),
+    }
+
+    for row, (price, quantity) in enumerate(zip(coerced["price"], coerced["quantity"])):
+        if not valid[row]:
+            continue
+        if quantity < 0:
+            errors.append(RowError(row, "quantity", "Количество товара не может быть отрицательным"))
+            valid[row] = False
+        elif quantity == 0:
+            errors.append(RowError(row, "quantity", "Товар с нулевым количеством не может быть добавлен"))
+            valid[row] = False
+        if price < 0:
+            errors.append(RowError(row, "price", "Цена товара не может быть отрицательной"))
+            valid[row] = False
+
+    errors.sort(key=lambda error: error.row)
+    return coerced, valid, errors
+
+
+class _RenderedField:
+    """
+    Атрибут товара, входящий в строковое представление.
+
+    Значение хранится в слоте с префиксом «_»; присваивание сбрасывает кэш строки товара
+    и уведомляет категории-владельцы, чтобы те сбросили закэшированный список.
+    """
+
+    __slots__ = ("slot",)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.slot = "_" + name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        return getattr(instance, self.slot)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance._set(self.slot, value)
+
+
+def _unpickle_product(cls: Type["BaseProduct"], state: Dict[str, Any]) -> "BaseProduct":
+    product = cls.__new__(cls)
+    product._owners = None
+    product._rendered = None
+    for slot, value in state.items():
+        setattr(product, slot, value)
+    return product
+
+
+# слоты, которые не входят в pickle товара (см. BaseProduct.__reduce__)
+_UNPICKLED_SLOTS = frozenset(("_owners", "_rendered"))
+
 
 class BaseProduct(ABC):
+    """
+    Базовый товар.
+
+    Атрибуты объявлены в __slots__: у экземпляров нет __dict__, а цена хранится
+    в единственном поле _price, общем для всей иерархии. В _owners хранятся категории,
+    которые нужно уведомлять об изменении цены и остатка: None, одна категория или список.
+    В _rendered кэшируется результат __str__.
+    """
+
+    __slots__ = ("_name", "_description", "_price", "_quantity", "_owners", "_rendered")
+
+    name = _RenderedField()
+    description = _RenderedField()
+
     def __init__(self, name: str, description: str, price: float, quantity: int):
-        self.name = name
-        self.description = description
+        self._owners: Union[None, "Category", List["Category"]] = None
+        self._rendered: Optional[str] = None
+        self._name = name
+        self._description = description
         self._price = price
-        self.quantity = quantity
+        self._quantity = quantity
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        Товар передаётся в pickle без категорий-владельцев и кэша строки: иначе вместе
+        с ним копировался бы весь граф категорий, а копия считала бы их своими.
+        """
+        state = {
+            slot: getattr(self, slot)
+            for cls in type(self).__mro__
+            for slot in getattr(cls, "__slots__", ())
+            if slot not in _UNPICKLED_SLOTS and hasattr(self, slot)
+        }
+        return _unpickle_product, (type(self), state)
+
+    def _attach(self, category: "Category") -> None:
+        """Подписывает категорию на изменения товара"""
+        owners = self._owners
+        if owners is None:
+            self._owners = category
+        elif isinstance(owners, list):
+            owners.append(category)
+        else:
+            self._owners = [owners, category]
+
+    def _detach(self, category: "Category") -> None:
+        """Отписывает категорию от изменений товара"""
+        owners = self._owners
+        if owners is category:
+            self._owners = None
+        elif isinstance(owners, list):
+            owners.remove(category)
+            if len(owners) == 1:
+                self._owners = owners[0]
+
+    def _set(self, slot: str, value: Any) -> None:
+        """
+        Записывает слот и уведомляет категории-владельцы. Запись идёт через Category._mutate
+        каждого владельца, поэтому владелец с блокировкой (ConcurrentCategory) выполняет
+        чтение старого значения, запись и пересчёт агрегатов целиком под ней.
+        """
+        owners = self._owners
+        if owners is None:
+            self._write(slot, value)
+        elif isinstance(owners, list):
+            # блокировки нескольких владельцев берутся в порядке id, чтобы писатели не ждали друг друга по кругу
+            write: Callable[..., None] = self._write
+            for category in sorted(owners, key=id, reverse=True):
+                write = partial(category._mutate, write)
+            write(slot, value)
+        else:
+            owners._mutate(self._write, slot, value)
+
+    def _write(self, slot: str, value: Any) -> None:
+        old_price, old_quantity = self._price, self._quantity
+        setattr(self, slot, value)
+        self._notify(old_price, old_quantity)
+
+    def _notify(self, old_price: float, old_quantity: int) -> None:
+        """Сбрасывает кэш строки и сообщает категориям-владельцам об изменении товара"""
+        self._rendered = None
+        owners = self._owners
+        if owners is None:
+            return
+        # к категориям подключаются только товары, то есть объекты Product
+        product = cast("Product", self)
+        if isinstance(owners, list):
+            for category in owners:
+                category._on_product_change(product, old_price, old_quantity)
+        else:
+            owners._on_product_change(product, old_price, old_quantity)
 
 
 class LogMixin:
+    """
+    Сообщает о создании товара в приёмник log_sink.
+
+    По умолчанию запись печатается в stdout, как и раньше. Приёмник можно заменить
+    через set_log_sink: NullSink отключает логирование, SampledSink прореживает записи,
+    BufferedSink выводит их пачками из фонового потока.
+    """
+
+    __slots__ = ()
+
+    log_sink: LogSink = PrintSink()
+
     def __init__(self, name: str, description: str, price: float, quantity: int):
         super().__init__(name=name, description=description, price=price, quantity=quantity)
-        print(f"{self.__class__.__name__}({name}, {description}, {price}, {quantity})")
+        sink = self.log_sink
+        if sink.enabled:
+            sink.emit(LogRecord(self.__class__.__name__, name, description, price, quantity))
+
+    @classmethod
+    def set_log_sink(cls, sink: LogSink) -> LogSink:
+        """Устанавливает приёмник для класса и его наследников; возвращает прежний"""
+        previous = cls.log_sink
+        cls.log_sink = sink
+        return previous
+
 
 class Product(LogMixin, BaseProduct):
+    __slots__ = ()
+
     def __init__(self, name: str, description: str, price: float, quantity: int):
         if quantity <= 0:
             raise ValueError("Товар с нулевым количеством не может быть добавлен")
         super().__init__(name, description, price, quantity)
-        self.__price = price if price > 0 else 0
-
+        self._price = price if price > 0 else 0
 
     @property
     def price(self) -> float:
-        return self.__price
+        return self._price
 
     @price.setter
     def price(self, value: float):
         if value <= 0:
             print("Цена не должна быть нулевая или отрицательная")
         else:
-            self.__price = value
+            self._set("_price", value)
+
+    @property
+    def quantity(self) -> int:
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, value: int) -> None:
+        self._set("_quantity", value)
+
+    @classmethod
+    def _restore(cls, name: str, description: str, price: float, quantity: int, **fields: Any) -> "Product":
+        """
+        Восстанавливает ранее проверенный товар (например, из снимка каталога) без вызова
+        конструктора: без повторных проверок и без записи в журнал LogMixin.
+        """
+        product = cls.__new__(cls)
+        BaseProduct.__init__(product, name, description, price, quantity)
+        for field, value in fields.items():
+            setattr(product, field, value)
+        return product
 
     @classmethod
     def new_product(cls, data: Dict[str, Any]) -> "Product":
@@ -66,76 +371,384 @@ class Product(LogMixin, BaseProduct):
             quantity=data["quantity"]
         )
 
-    def __str__(self) -> str:
+    @classmethod
+    def new_product_batch(
+        cls, records: Union[Iterable[Mapping[str, Any]], Mapping[str, Sequence[Any]]]
+    ) -> BatchResult:
+        """
+        Создаёт товары из пакета записей (списка словарей или колонок).
+
+        Все строки проверяются за один проход по колонкам, входные данные не изменяются.
+        Некорректные строки не прерывают обработку, а попадают в список ошибок результата.
+        """
+        columns, valid, errors = validate_product_records(records)
+        products = []
+        for row, (name, description, price, quantity) in enumerate(
+            zip(columns["name"], columns["description"], columns["price"], columns["quantity"])
+        ):
+            if not valid[row]:
+                continue
+            try:
+                products.append(cls(name=name, description=description, price=price, quantity=quantity))
+            except ValueError as error:
+                errors.append(RowError(row, getattr(error, "field", ""), str(error)))
+        errors.sort(key=lambda error: error.row)
+        return BatchResult(products, errors)
+
+    def _render(self) -> str:
         return f"{self.name}, {int(self.price)} руб. Остаток: {self.quantity} шт."
 
+    def __str__(self) -> str:
+        rendered = self._rendered
+        if rendered is None:
+            rendered = self._rendered = self._render()
+        return rendered
+
+    @classmethod
+    def _product_type(cls) -> type:
+        """Класс товара для проверки «товары одного типа»; представления хранилищ отвечают классом товара"""
+        return cls
+
     def __add__(self, other: "Product") -> float:
         if not isinstance(other, Product):
             raise TypeError("Можно складывать только товары и их наследников")
-        if type(self) is not type(other):
+        if self._product_type() is not other._product_type():
             raise TypeError("Можно складывать только товары одного типа")
         return self.price * self.quantity + other.price * other.quantity
 
 
 class Smartphone(Product):
+    __slots__ = ("efficiency", "_model", "_memory", "_color")
+
+    model = _RenderedField()
+    memory = _RenderedField()
+    color = _RenderedField()
+
     def __init__(self, name: str, description: str, price: float, quantity: int, efficiency: str, model: str, memory: int, color: str):
         super().__init__(name, description, price, quantity)
+        # при создании кэш ещё пуст и владельцев нет, поэтому пишем прямо в слоты
         self.efficiency = efficiency
-        self.model = model
-        self.memory = int(memory)
-        self.color = str(color)
+        self._model = model
+        self._memory = int(memory)
+        self._color = str(color)
 
-    def __str__(self) -> str:
-        base = super().__str__()
-        parts = base.split(" шт.")
-        return f"{parts[0]} шт., модель: {self.model}, память: {self.memory} ГБ, цвет: {self.color}"
+    def _render(self) -> str:
+        return (
+            f"{self.name}, {int(self.price)} руб. Остаток: {self.quantity} шт., "
+            f"модель: {self.model}, память: {self.memory} ГБ, цвет: {self.color}"
+        )
 
 
 class LawnGrass(Product):
+    __slots__ = ("_country", "_germination_period", "_color")
+
+    country = _RenderedField()
+    germination_period = _RenderedField()
+    color = _RenderedField()
+
     def __init__(self, name: str, description: str, price: float, quantity: int, country: str, germination_period: str, color: str):
         super().__init__(name, description, price, quantity)
-        self.country = country
-        self.germination_period = germination_period
-        self.color = str(color)
+        self._country = country
+        self._germination_period = germination_period
+        self._color = str(color)
+
+    def _render(self) -> str:
+        return (
+            f"{self.name}, {int(self.price)} руб. Остаток: {self.quantity} шт., "
+            f"страна: {self.country}, срок прорастания: {self.germination_period}, цвет: {self.color}"
+        )
 
-    def __str__(self) -> str:
-        base = super().__str__()
-        parts = base.split(" шт.")
-        return f"{parts[0]} шт., страна: {self.country}, срок прорастания: {self.germination_period}, цвет: {self.color}"
+
+def _add_compensated(total: float, error: float, value: float) -> Tuple[float, float]:
+    """
+    Прибавляет value к сумме total, у которой error — отличие точной суммы от total
+    (суммирование Ноймайера). Возвращает сумму, округлённую с учётом погрешности,
+    и новую погрешность, поэтому циклы добавления и удаления товаров не накапливают ошибку.
+    """
+    result = total + value
+    if abs(total) >= abs(value):
+        error += (total - result) + value
+    else:
+        error += (value - result) + total
+    rounded = result + error
+    return rounded, error - (rounded - result)
+
+
+class CategoryListener:
+    """
+    Подписчик на изменения состава и товаров категории (см. Category.add_listener).
+
+    Методы вызываются после того, как категория обновила свои агрегаты и индексы.
+    """
+
+    def products_added(self, category: "Category", products: List[Product]) -> None:
+        for product in products:
+            self.product_added(category, product)
+
+    def product_added(self, category: "Category", product: Product) -> None:
+        pass
+
+    def product_removed(self, category: "Category", product: Product) -> None:
+        pass
+
+    def product_changed(self, category: "Category", product: Product) -> None:
+        pass
+
+    def prices_changed(self, category: "Category", products: List[Product]) -> None:
+        for product in products:
+            self.product_changed(category, product)
 
 
 class Category:
+    """
+    Категория товаров.
+
+    Количество товаров, сумма цен, общий остаток и стоимость остатка (то же, что считает
+    Product.__add__) поддерживаются инкрементально: их обновляют add_product и уведомления
+    от сеттеров price и quantity, поэтому middle_price и __str__ работают за O(1).
+    Список строк products кэшируется до следующего изменения категории или её товаров.
+
+    Для поиска внутри категории есть индексы по названию, цене и остатку. Они строятся
+    при первом запросе, а затем поддерживаются add_product и уведомлениями от товаров.
+
+    Внешние структуры (например, поисковый индекс src.search) подписываются на изменения
+    через add_listener.
+
+    Готовые отчёты (report) хранятся в LRU-кэше категории. Любое изменение состава или
+    товаров увеличивает версию категории _version, и отчёты старой версии строятся заново.
+    """
+
     category_count = 0
     product_count = 0
+    _counter_lock = threading.Lock()
 
-    def __init__(self, name: str, description: str, products: Optional[List[Product]] = None):
+    # Ограничения кэша отчётов по умолчанию: число отчётов и суммарное число строк в них
+    report_cache_size = 128
+    report_cache_weight: Optional[int] = None
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        products: Optional[Union[List[Product], "ProductTable", "DeferredProducts"]] = None,
+    ):
         self.name = name
         self.description = description
         self._products = products if products is not None else []
 
-        Category.category_count += 1
-        Category.product_count += len(self._products)
+        self._count = 0
+        self._price_sum = 0.0
+        self._quantity_sum = 0
+        self._stock_value = 0.0
+        # погрешности округления сумм цен и стоимости остатка (см. _add_compensated)
+        self._price_error = 0.0
+        self._stock_error = 0.0
+        self._listing: Optional[List[str]] = None
+        self._index: Optional[CategoryIndex] = None
+        self._version = 0
+        self._reports: Optional[ReportCache] = None
+        self._listeners: List[CategoryListener] = []
+        storage = self._products
+        if not isinstance(storage, list):
+            # Хранилище (например, ProductTable) само уведомляет категорию и считает агрегаты по колонкам
+            storage._attach(self)
+            self._count, self._price_sum, self._quantity_sum, self._stock_value = storage._aggregates()
+        else:
+            for product in storage:
+                product._attach(self)
+                self._account(product.price, product.quantity, 1)
+
+        Category._bump_counters(1, len(self._products))
+
+    @staticmethod
+    def _bump_counters(categories: int, products: int) -> None:
+        """Изменяет общие счётчики под блокировкой, чтобы они не расходились между потоками"""
+        with Category._counter_lock:
+            Category.category_count += categories
+            Category.product_count += products
+
+    def _account(self, price: float, quantity: int, sign: int) -> None:
+        """Добавляет (sign=1) или вычитает (sign=-1) товар из агрегатов"""
+        self._count += sign
+        if not self._count:
+            # без товаров суммы точно равны нулю: накопленная погрешность отбрасывается
+            self._price_sum = self._stock_value = self._price_error = self._stock_error = 0.0
+            self._quantity_sum = 0
+            return
+        self._price_sum, self._price_error = _add_compensated(self._price_sum, self._price_error, sign * price)
+        self._quantity_sum += sign * quantity
+        self._stock_value, self._stock_error = _add_compensated(
+            self._stock_value, self._stock_error, sign * price * quantity
+        )
+
+    def _mutate(self, write: Callable[..., None], *args: Any) -> None:
+        """Выполняет запись в товар категории; наследники могут выполнять её под своей блокировкой"""
+        write(*args)
+
+    def _on_product_change(self, product: Product, old_price: float, old_quantity: int) -> None:
+        """Пересчитывает агрегаты после изменения товара и сбрасывает кэш списка"""
+        self._version += 1
+        self._listing = None
+        self._account(old_price, old_quantity, -1)
+        self._account(product.price, product.quantity, 1)
+        if self._index is not None:
+            self._index.update(product)
+        for listener in self._listeners:
+            listener.product_changed(self, product)
+
+    def _on_prices_change(self, products: List[Product], price_delta: float, stock_delta: float) -> None:
+        """
+        Учитывает пакетное изменение цен (src.repricing) одним шагом вместо уведомления
+        от каждого товара. Индексы при большом числе изменений строятся заново при запросе.
+        """
+        self._version += 1
+        self._listing = None
+        self._price_sum, self._price_error = _add_compensated(self._price_sum, self._price_error, price_delta)
+        self._stock_value, self._stock_error = _add_compensated(self._stock_value, self._stock_error, stock_delta)
+        index = self._index
+        if index is not None:
+            if len(products) > _REINDEX_THRESHOLD:
+                self._index = None
+            else:
+                for product in products:
+                    index.by_price.update(product.price, product)
+        for listener in self._listeners:
+            listener.prices_changed(self, products)
 
     def middle_price(self) -> float:
         """Возвращает среднюю цену товаров в категории"""
-        if not self._products:
-            return 0
-        try:
-            total = sum(product.price for product in self._products)
-            return total / len(self._products)
-        except ZeroDivisionError:
+        if not self._count:
             return 0
+        return self._price_sum / self._count
+
+    @property
+    def total_quantity(self) -> int:
+        """Общий остаток товаров в категории"""
+        return self._quantity_sum
+
+    @property
+    def stock_value(self) -> float:
+        """Стоимость остатка: сумма price * quantity по всем товарам"""
+        return self._stock_value
 
     def add_product(self, product: Product):
         if not isinstance(product, Product):
             raise TypeError("Можно добавлять только объекты класса Product или его наследников")
         self._products.append(product)
-        Category.product_count += 1
+        stored = self._products[-1]
+        stored._attach(self)
+        self._account(stored.price, stored.quantity, 1)
+        self._version += 1
+        self._listing = None
+        if self._index is not None:
+            self._index.add(stored)
+        for listener in self._listeners:
+            listener.product_added(self, stored)
+        Category._bump_counters(0, 1)
+
+    def remove_product(self, product: Product) -> None:
+        """Удаляет товар из категории и из всех её агрегатов и индексов"""
+        remove = getattr(self._products, "remove", None)
+        if remove is None:
+            raise TypeError("Хранилище товаров этой категории не поддерживает удаление")
+        remove(product)
+        product._detach(self)
+        self._account(product.price, product.quantity, -1)
+        self._version += 1
+        self._listing = None
+        if self._index is not None:
+            self._index.remove(product)
+        for listener in self._listeners:
+            listener.product_removed(self, product)
+        Category._bump_counters(0, -1)
+
+    def add_listener(self, listener: CategoryListener) -> None:
+        """
+        Подписывает listener на добавление, удаление и изменение товаров категории.
+        Товары, уже находящиеся в категории, передаются ему одним вызовом products_added.
+        """
+        listener.products_added(self, list(self._products))
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: CategoryListener) -> None:
+        self._listeners.remove(listener)
+
+    def _get_index(self) -> CategoryIndex:
+        if self._index is None:
+            self._index = CategoryIndex(self._products)
+        return self._index
+
+    def find_by_name(self, name: str) -> List[Product]:
+        """Товары с точно совпадающим названием"""
+        return self._get_index().find_by_name(name)
+
+    def products_in_price_range(self, min_price: float, max_price: float) -> List[Product]:
+        """Товары с ценой от min_price до max_price включительно, по возрастанию цены"""
+        return self._get_index().by_price.between(min_price, max_price)
+
+    def cheapest(self, n: int = 1) -> List[Product]:
+        """n самых дешёвых товаров"""
+        return self._get_index().by_price.first(n)
+
+    def most_expensive(self, n: int = 1) -> List[Product]:
+        """n самых дорогих товаров"""
+        return self._get_index().by_price.last(n)
+
+    def low_stock(self, threshold: int) -> List[Product]:
+        """Товары с остатком не больше threshold, по возрастанию остатка"""
+        return self._get_index().by_quantity.between(float("-inf"), threshold)
+
+    # --- отчёты ---
+
+    def configure_report_cache(self, max_entries: int, max_weight: Optional[int] = None) -> None:
+        """Задаёт ограничения кэша отчётов этой категории; накопленные отчёты сбрасываются"""
+        self._reports = ReportCache(max_entries, max_weight)
+
+    def report(self, name: str, *params: Any) -> Any:
+        """
+        Возвращает отчёт name с параметрами params из кэша или строит его.
+
+        Отчёты: summary (строка категории), middle_price, most_expensive(n), cheapest(n),
+        low_stock(threshold) и price_band(min_price, max_price); списочные отчёты —
+        кортежи строк товаров, их можно безопасно отдавать нескольким потребителям.
+        """
+        build = getattr(self, f"_report_{name}", None)
+        if build is None:
+            raise ValueError(f"Неизвестный отчёт: {name}")
+        reports = self._reports
+        if reports is None:
+            reports = self._reports = ReportCache(self.report_cache_size, self.report_cache_weight)
+        return reports.get((name, params), (self._version, self.name), lambda: build(*params))
+
+    def report_stats(self) -> CacheStats:
+        """Попадания, промахи и вытеснения кэша отчётов"""
+        if self._reports is None:
+            return CacheStats(0, 0, 0, 0, 0)
+        return self._reports.stats()
+
+    def _report_summary(self) -> str:
+        return str(self)
+
+    def _report_middle_price(self) -> float:
+        return self.middle_price()
+
+    def _report_most_expensive(self, n: int = 1) -> Tuple[str, ...]:
+        return tuple(str(product) for product in self.most_expensive(n))
+
+    def _report_cheapest(self, n: int = 1) -> Tuple[str, ...]:
+        return tuple(str(product) for product in self.cheapest(n))
+
+    def _report_low_stock(self, threshold: int) -> Tuple[str, ...]:
+        return tuple(str(product) for product in self.low_stock(threshold))
+
+    def _report_price_band(self, min_price: float, max_price: float) -> Tuple[str, ...]:
+        return tuple(str(product) for product in self.products_in_price_range(min_price, max_price))
 
     @property
     def products(self) -> List[str]:
-        return [str(product) for product in self._products]
+        if self._listing is None:
+            self._listing = [str(product) for product in self._products]
+        return list(self._listing)
 
     def __str__(self) -> str:
-        total_quantity = sum(product.quantity for product in self._products)
-        return f"{self.name}, общее количество товаров: {total_quantity} шт."
+        return f"{self.name}, общее количество товаров: {self._quantity_sum} шт."
@@ -0,0 +1,171 @@
+import threading
+from itertools import islice
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.classes import Category, CategoryListener, Product
+
+
+class CategoryState(NamedTuple):
+    """
+    Неизменяемый снимок категории, который читатели получают одной операцией.
+
+    products — список товаров категории, общий для снимков: писатели только дописывают
+    в его конец, поэтому снимку принадлежат первые size элементов. Удаление товара
+    заменяет список копией, а старые снимки продолжают ссылаться на прежний список.
+    """
+
+    products: List[Product]
+    size: int
+    price_sum: float
+    quantity_sum: int
+    stock_value: float
+
+    def items(self) -> Tuple[Product, ...]:
+        return tuple(islice(self.products, self.size))
+
+
+class ConcurrentCategory(Category):
+    """
+    Категория для многопоточного доступа.
+
+    Писатели (add_product, add_products, изменения цены и остатка товаров) выполняются
+    последовательно под блокировкой категории и в конце публикуют новый CategoryState.
+    Сеттер товара берёт блокировку через _mutate до чтения старого значения, поэтому
+    одновременные записи в один товар не искажают агрегаты.
+    Читатели берут текущий снимок одной атомарной операцией чтения атрибута и работают
+    с ним без блокировок, поэтому никогда не видят частично применённую запись.
+    Публикация не копирует список товаров, поэтому добавление товара стоит O(1).
+    """
+
+    _products: List[Product]
+
+    def __init__(self, name: str, description: str, products: Optional[List[Product]] = None):
+        self._lock = threading.RLock()
+        self._version = 0
+        with self._lock:
+            # свой список: снимки не должны видеть изменений списка, переданного снаружи
+            super().__init__(name, description, list(products) if products is not None else None)
+            self._publish()
+
+    def _publish(self) -> None:
+        """Публикует снимок после записи; вызывается под блокировкой"""
+        self._state = CategoryState(
+            self._products, self._count, self._price_sum, self._quantity_sum, self._stock_value
+        )
+        # версия меняется после снимка: прочитавший новую версию увидит и новый снимок
+        self._version += 1
+
+    def _republish_totals(self) -> None:
+        """Публикует новые агрегаты при неизменном составе товаров"""
+        self._state = self._state._replace(
+            size=self._count,
+            price_sum=self._price_sum,
+            quantity_sum=self._quantity_sum,
+            stock_value=self._stock_value,
+        )
+        self._version += 1
+
+    def snapshot(self) -> Tuple[Product, ...]:
+        """Текущий состав категории; кортеж не меняется при последующих записях"""
+        return self._state.items()
+
+    def add_product(self, product: Product) -> None:
+        with self._lock:
+            super().add_product(product)
+            self._publish()
+
+    def add_products(self, products: Iterable[Product]) -> None:
+        """Добавляет несколько товаров за одну публикацию снимка"""
+        with self._lock:
+            try:
+                for product in products:
+                    super().add_product(product)
+            finally:
+                self._publish()
+
+    def remove_product(self, product: Product) -> None:
+        with self._lock:
+            # удаление сдвигает элементы, поэтому меняется копия, а не список опубликованных снимков
+            self._products = list(self._products)
+            try:
+                super().remove_product(product)
+            finally:
+                self._publish()
+
+    def add_listener(self, listener: CategoryListener) -> None:
+        with self._lock:
+            super().add_listener(listener)
+
+    def remove_listener(self, listener: CategoryListener) -> None:
+        with self._lock:
+            super().remove_listener(listener)
+
+    def _mutate(self, write: Callable[..., None], *args: Any) -> None:
+        with self._lock:
+            write(*args)
+
+    def _on_product_change(self, product: Product, old_price: float, old_quantity: int) -> None:
+        with self._lock:
+            super()._on_product_change(product, old_price, old_quantity)
+            self._republish_totals()
+
+    def _on_prices_change(self, products: List[Product], price_delta: float, stock_delta: float) -> None:
+        with self._lock:
+            super()._on_prices_change(products, price_delta, stock_delta)
+            self._republish_totals()
+
+    def middle_price(self) -> float:
+        state = self._state
+        if not state.size:
+            return 0
+        return state.price_sum / state.size
+
+    @property
+    def total_quantity(self) -> int:
+        return self._state.quantity_sum
+
+    @property
+    def stock_value(self) -> float:
+        return self._state.stock_value
+
+    @property
+    def products(self) -> List[str]:
+        listing = self._listing
+        if listing is None:
+            version = self._version
+            state = self._state
+            listing = [str(product) for product in islice(state.products, state.size)]
+            with self._lock:
+                # кэш сохраняется, только если за время построения не было записей
+                if self._version == version:
+                    self._listing = listing
+        return list(listing)
+
+    # Индексы достраиваются при запросе, поэтому запросы к ним сериализуются с записями
+
+    def find_by_name(self, name: str) -> List[Product]:
+        with self._lock:
+            return super().find_by_name(name)
+
+    def products_in_price_range(self, min_price: float, max_price: float) -> List[Product]:
+        with self._lock:
+            return super().products_in_price_range(min_price, max_price)
+
+    def cheapest(self, n: int = 1) -> List[Product]:
+        with self._lock:
+            return super().cheapest(n)
+
+    def most_expensive(self, n: int = 1) -> List[Product]:
+        with self._lock:
+            return super().most_expensive(n)
+
+    def low_stock(self, threshold: int) -> List[Product]:
+        with self._lock:
+            return super().low_stock(threshold)
+
+    def report(self, name: str, *params: Any) -> Any:
+        with self._lock:
+            return super().report(name, *params)
+
+    def __str__(self) -> str:
+        return f"{self.name}, общее количество товаров: {self._state.quantity_sum} шт."
@@ -0,0 +1,369 @@
+"""
+Потоковая выгрузка каталога в файлы и обратная загрузка.
+
+Форматы:
+
+- "json" — формат data/products.json (массив категорий), читается load_data_from_json;
+- "jsonl" — строка JSON на каждый товар;
+- "csv" — строка таблицы на каждый товар;
+- "columnar" — компактный колоночный формат: строки собираются в группы, внутри группы
+  каждая колонка хранится отдельным блоком (строки — словарём с номерами, числа —
+  массивами), а группа сжимается zlib.
+
+В построчных форматах (jsonl, csv, columnar) у каждого товара есть поля category
+и category_description, а также тип товара из реестра src.registry и все его поля,
+включая поля наследников. Категория без товаров записывается строкой без типа.
+Категории восстанавливаются по подряд идущим строкам с одинаковым названием.
+
+Выгрузка обходит товары по одному и пишет их пачками по chunk_rows строк (CHUNK_ROWS,
+для колоночного формата GROUP_ROWS), поэтому память ограничена размером пачки, а не каталога.
+"""
+import csv
+import json
+import struct
+import zlib
+from array import array
+from itertools import groupby
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.classes import Category
+from src.parsers import ParsedCategory
+from src.registry import product_registry
+from src.utils import build_parsed_category
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None  # type: ignore[assignment]
+
+# строк в пачке построчных форматов и в группе колоночного (группы побольше лучше сжимаются)
+CHUNK_ROWS = 1_000
+GROUP_ROWS = 10_000
+WRITE_BUFFER = 1 << 20
+
+FORMATS = ("json", "jsonl", "csv", "columnar")
+_EXTENSIONS = {".json": "json", ".jsonl": "jsonl", ".csv": "csv", ".ecol": "columnar"}
+
+COLUMNAR_MAGIC = b"ECCOL1\0\0"
+_LENGTH = struct.Struct("<Q")
+_GROUP = struct.Struct("<IQ")
+
+_CATEGORY_COLUMNS = ("category", "category_description", "type")
+
+# тип значения колонки в группе -> код типа блока
+_KIND_STR, _KIND_INT, _KIND_FLOAT, _KIND_JSON = b"s", b"q", b"d", b"j"
+_NULL_INDEX = 0xFFFFFFFF
+
+Row = Tuple[Any, ...]
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def export_columns() -> Tuple[str, ...]:
+    """Колонки построчных форматов: категория, тип и поля всех типов реестра без повторов"""
+    columns = list(_CATEGORY_COLUMNS)
+    for spec in product_registry._specs.values():
+        for field in spec._names:
+            if field not in columns:
+                columns.append(field)
+    return tuple(columns)
+
+
+class _RowBuilder:
+    """Превращает товары в строки с колонками columns; описания классов кэшируются"""
+
+    def __init__(self, columns: Tuple[str, ...]):
+        self.columns = columns
+        self._positions = {column: position for position, column in enumerate(columns)}
+        self._classes: Dict[type, Tuple[str, Callable[[Any], Tuple[Any, ...]], List[int]]] = {}
+
+    def _describe(self, cls: type) -> Tuple[str, Callable[[Any], Tuple[Any, ...]], List[int]]:
+        described = self._classes.get(cls)
+        if described is None:
+            spec = product_registry.spec_for(cls)
+            described = self._classes[cls] = (
+                spec.type_name,
+                attrgetter(*spec._names),
+                [self._positions[field] for field in spec._names],
+            )
+        return described
+
+    def rows(self, categories: Iterable[Category]) -> Iterator[Row]:
+        width = len(self.columns) - len(_CATEGORY_COLUMNS)
+        for category in categories:
+            head = (category.name, category.description)
+            products = category._products
+            if not len(products):
+                yield head + (None,) + (None,) * width
+                continue
+            for product in products:
+                type_name, getter, positions = self._describe(type(product))
+                row = list(head + (type_name,) + (None,) * width)
+                for position, value in zip(positions, getter(product)):
+                    row[position] = value
+                yield tuple(row)
+
+
+def _chunks(rows: Iterator[Row], size: int) -> Iterator[List[Row]]:
+    while True:
+        chunk = [row for _, row in zip(range(size), rows)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def _record(columns: Tuple[str, ...], row: Row) -> Dict[str, Any]:
+    """Словарь строки без пустых полей"""
+    return {column: value for column, value in zip(columns, row) if value is not None}
+
+
+# --- запись ---
+
+
+def export_json(categories: Iterable[Category], path: str, chunk_rows: int = CHUNK_ROWS) -> int:
+    """Записывает каталог в формате data/products.json; возвращает число товаров"""
+    builder = _RowBuilder(export_columns())
+    columns = builder.columns[2:]
+    written = 0
+    with open(path, "wb", buffering=WRITE_BUFFER) as file:
+        file.write(b"[")
+        for number, (key, rows) in enumerate(groupby(builder.rows(categories), key=itemgetter(0, 1))):
+            file.write(b"," if number else b"")
+            file.write(b'{"name":' + _dumps(key[0]) + b',"description":' + _dumps(key[1]) + b',"products":[')
+            first = True
+            for chunk in _chunks(rows, chunk_rows):
+                records = [_record(columns, row[2:]) for row in chunk if row[2] is not None]
+                if not records:
+                    continue
+                file.write((b"" if first else b",") + b",".join(map(_dumps, records)))
+                first = False
+                written += len(records)
+            file.write(b"]}")
+        file.write(b"]")
+    return written
+
+
+def export_jsonl(categories: Iterable[Category], path: str, chunk_rows: int = CHUNK_ROWS) -> int:
+    """Записывает строку JSON на каждый товар; возвращает число строк"""
+    builder = _RowBuilder(export_columns())
+    columns = builder.columns
+    written = 0
+    with open(path, "wb", buffering=WRITE_BUFFER) as file:
+        for chunk in _chunks(builder.rows(categories), chunk_rows):
+            lines = [_dumps(_record(columns, row)) for row in chunk]
+            file.write(b"\n".join(lines) + b"\n")
+            written += len(lines)
+    return written
+
+
+def export_csv(categories: Iterable[Category], path: str, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Записывает строку CSV на каждый товар; возвращает число строк. Пустая ячейка — пустая
+    строка у полей категории и типа товара строки и отсутствие значения у остальных полей.
+    """
+    builder = _RowBuilder(export_columns())
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER) as file:
+        writer = csv.writer(file)
+        writer.writerow(builder.columns)
+        for chunk in _chunks(builder.rows(categories), chunk_rows):
+            writer.writerows(chunk)
+            written += len(chunk)
+    return written
+
+
+def _encode_strings(values: List[Optional[str]]) -> bytes:
+    strings: Dict[str, int] = {}
+    number = strings.setdefault
+    indices = array("I", [_NULL_INDEX if value is None else number(value, len(strings)) for value in values])
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = array("I", [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    return struct.pack("<I", len(encoded)) + offsets.tobytes() + b"".join(encoded) + indices.tobytes()
+
+
+def _encode_column(values: List[Any]) -> bytes:
+    """Блок колонки: код типа, маска пропусков (если они есть) и значения"""
+    types = set(map(type, values))
+    nulls = type(None) in types
+    types.discard(type(None))
+    if types <= {str}:
+        kind, data = _KIND_STR, _encode_strings(values)
+    elif types == {int}:
+        try:
+            kind, data = _KIND_INT, array("q", [0 if value is None else value for value in values]).tobytes()
+        except OverflowError:
+            kind, data = _KIND_JSON, _dumps(values)
+    elif types == {float}:
+        kind, data = _KIND_FLOAT, array("d", [0.0 if value is None else value for value in values]).tobytes()
+    else:
+        kind, data = _KIND_JSON, _dumps(values)
+    # у строк пропуск кодируется номером _NULL_INDEX, у JSON — значением null
+    mask = bytes(value is None for value in values) if nulls and kind in (_KIND_INT, _KIND_FLOAT) else b""
+    return kind + bytes((bool(mask),)) + mask + _LENGTH.pack(len(data)) + data
+
+
+def export_columnar(
+    categories: Iterable[Category], path: str, chunk_rows: int = GROUP_ROWS, level: int = 1
+) -> int:
+    """Записывает каталог в колоночном формате группами по chunk_rows строк; возвращает число строк"""
+    builder = _RowBuilder(export_columns())
+    header = _dumps({"version": 1, "columns": builder.columns})
+    written = 0
+    with open(path, "wb", buffering=WRITE_BUFFER) as file:
+        file.write(COLUMNAR_MAGIC + _LENGTH.pack(len(header)) + header)
+        for chunk in _chunks(builder.rows(categories), chunk_rows):
+            payload = zlib.compress(b"".join(_encode_column(list(column)) for column in zip(*chunk)), level)
+            file.write(_GROUP.pack(len(chunk), len(payload)) + payload)
+            written += len(chunk)
+    return written
+
+
+_EXPORTERS = {"json": export_json, "jsonl": export_jsonl, "csv": export_csv, "columnar": export_columnar}
+
+
+def _format_of(path: str, format: Optional[str]) -> str:
+    if format is None:
+        extension = path[path.rfind("."):].lower() if "." in path else ""
+        format = _EXTENSIONS.get(extension)
+        if format is None:
+            raise ValueError(f"Не удалось определить формат по имени файла {path}; укажите format")
+    if format not in FORMATS:
+        raise ValueError(f"Неизвестный формат выгрузки: {format}")
+    return format
+
+
+def export_catalog(
+    categories: Iterable[Category], path: str, format: Optional[str] = None, chunk_rows: Optional[int] = None
+) -> int:
+    """
+    Выгружает категории в файл path в формате format (json, jsonl, csv или columnar;
+    по умолчанию — по расширению .json, .jsonl, .csv или .ecol). Возвращает число записанных строк.
+    """
+    exporter = _EXPORTERS[_format_of(path, format)]
+    if chunk_rows is None:
+        return exporter(categories, path)
+    if chunk_rows < 1:
+        raise ValueError("Размер пачки должен быть положительным")
+    return exporter(categories, path, chunk_rows)
+
+
+# --- чтение ---
+
+
+def _iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as file:
+        for line in file:
+            if line.strip():
+                yield _loads(line)
+
+
+def _iter_csv(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Пустая ячейка поля, которого нет у типа товара строки, означает отсутствие значения;
+    у полей категории и полей типа товара это пустая строка.
+    """
+    fields = {type_name: _CATEGORY_COLUMNS + spec._names for type_name, spec in product_registry._specs.items()}
+    with open(path, encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            names = fields.get(row.get("type", ""))
+            if names is None:
+                # категория без товаров (или неизвестный тип, о котором сообщит реестр)
+                yield {key: value for key, value in row.items() if value != "" or key in _CATEGORY_COLUMNS[:2]}
+            else:
+                yield {key: row[key] for key in names if key in row}
+
+
+def _decode_strings(data: memoryview) -> List[Optional[str]]:
+    (count,) = struct.unpack_from("<I", data)
+    offsets = data[4:4 + (count + 1) * 4].cast("I")
+    blob_start = 4 + (count + 1) * 4
+    blob = bytes(data[blob_start:blob_start + offsets[count]])
+    strings: List[Optional[str]] = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)]
+    strings.append(None)
+    indices = data[blob_start + offsets[count]:].cast("I")
+    return [strings[count if index == _NULL_INDEX else index] for index in indices]
+
+
+def _decode_column(payload: memoryview, position: int, rows: int) -> Tuple[List[Any], int]:
+    kind = bytes(payload[position:position + 1])
+    has_mask = payload[position + 1]
+    position += 2
+    mask = bytes(payload[position:position + rows]) if has_mask else b""
+    position += len(mask)
+    (size,) = _LENGTH.unpack_from(payload, position)
+    position += _LENGTH.size
+    data = payload[position:position + size]
+    position += size
+    values: List[Any]
+    if kind == _KIND_STR:
+        values = _decode_strings(data)
+    elif kind == _KIND_INT:
+        values = data.cast("q").tolist()
+    elif kind == _KIND_FLOAT:
+        values = data.cast("d").tolist()
+    else:
+        values = _loads(bytes(data))
+    if mask:
+        values = [None if missing else value for value, missing in zip(values, mask)]
+    return values, position
+
+
+def _iter_columnar(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as file:
+        if file.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"Файл {path} не является колоночной выгрузкой каталога")
+        (size,) = _LENGTH.unpack(file.read(_LENGTH.size))
+        columns = _loads(file.read(size))["columns"]
+        while True:
+            group = file.read(_GROUP.size)
+            if not group:
+                return
+            rows, size = _GROUP.unpack(group)
+            payload = memoryview(zlib.decompress(file.read(size)))
+            position = 0
+            values = []
+            for _ in columns:
+                column, position = _decode_column(payload, position, rows)
+                values.append(column)
+            for row in zip(*values):
+                yield _record(columns, row)
+
+
+_READERS = {"jsonl": _iter_jsonl, "csv": _iter_csv, "columnar": _iter_columnar}
+
+
+def iter_export_records(path: str, format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Потоково читает строки построчной выгрузки (jsonl, csv или columnar) в виде словарей"""
+    format = _format_of(path, format)
+    if format == "json":
+        raise ValueError("Выгрузка в формате json читается load_data_from_json")
+    return _READERS[format](path)
+
+
+def load_export(path: str, format: Optional[str] = None) -> List[Category]:
+    """
+    Загружает категории из построчной выгрузки. Строки проверяются и приводятся через реестр
+    типов так же, как при load_data_from_json, и до создания первой категории.
+    """
+    parsed = []
+    coerce = product_registry.coerce
+    for (name, description), records in groupby(
+        iter_export_records(path, format), key=itemgetter("category", "category_description")
+    ):
+        # строка без типа обозначает категорию без товаров
+        rows = [coerce(record) for record in records if "type" in record]
+        parsed.append(ParsedCategory(name, description, rows))
+    return [build_parsed_category(category) for category in parsed]
@@ -0,0 +1,170 @@
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    from src.classes import Product
+
+# Сколько отложенных изменений выгоднее применить по одному, а не перестроением списка
+_INSERT_LIMIT = 16
+
+
+class SortedIndex:
+    """
+    Упорядоченный по ключу список товаров.
+
+    Ключи и товары лежат в двух параллельных списках: поиск идёт бинарным поиском по списку
+    ключей-чисел, без сравнения кортежей. Изменения (добавления, удаления, смена ключа) копятся
+    и применяются только перед запросом: немногие — по одному, а большой пакет — одной
+    сортировкой, так что массовые изменения не превращаются в квадратичное количество вставок
+    и удалений в середине списка. При равных ключах сохраняется порядок добавления.
+    """
+
+    def __init__(self) -> None:
+        self._keys: List[float] = []
+        self._items: List["Product"] = []
+        # актуальный ключ каждого товара, в порядке добавления
+        self._key_of: Dict["Product", float] = {}
+        # отложенные изменения (ключ, товар, добавление ли это) в порядке поступления
+        self._pending: List[Tuple[float, "Product", bool]] = []
+        self._pending_removals = 0
+        # изменений слишком много: списки будут построены заново по _key_of
+        self._stale = False
+
+    def __len__(self) -> int:
+        return len(self._key_of)
+
+    def load(self, keys: List[float], products: List["Product"]) -> None:
+        """Заполняет индекс целиком одной сортировкой"""
+        self._key_of.update(zip(products, keys))
+        if self._pending_removals:
+            self._stale = True
+        elif not self._stale:
+            self._pending.extend(zip(keys, products, repeat(True)))
+        self._flush()
+
+    def add(self, key: float, product: "Product") -> None:
+        self._key_of[product] = key
+        self._record(key, product, True)
+
+    def remove(self, product: "Product") -> None:
+        self._record(self._key_of.pop(product), product, False)
+
+    def update(self, key: float, product: "Product") -> None:
+        if self._key_of[product] != key:
+            self.remove(product)
+            self.add(key, product)
+
+    def _record(self, key: float, product: "Product", added: bool) -> None:
+        if self._stale:
+            return
+        self._pending.append((key, product, added))
+        if not added:
+            self._pending_removals += 1
+        if self._pending_removals and len(self._pending) > _INSERT_LIMIT:
+            # удаления не применить слиянием: дальше достаточно поддерживать _key_of
+            self._stale = True
+            self._pending = []
+
+    def _flush(self) -> None:
+        pending = self._pending
+        if self._stale:
+            self._rebuild(list(self._key_of.values()), list(self._key_of))
+        elif len(pending) <= _INSERT_LIMIT:
+            keys, items = self._keys, self._items
+            for key, item, added in pending:
+                if added:
+                    position = bisect_right(keys, key)
+                    keys.insert(position, key)
+                    items.insert(position, item)
+                else:
+                    position = bisect_left(keys, key)
+                    while items[position] != item:
+                        position += 1
+                    del keys[position]
+                    del items[position]
+        else:
+            # одни добавления: уже упорядоченная часть сливается с новыми записями за линейное время
+            self._rebuild(
+                self._keys + [key for key, _, _ in pending], self._items + [item for _, item, _ in pending]
+            )
+        self._pending = []
+        self._pending_removals = 0
+        self._stale = False
+
+    def _rebuild(self, keys: List[float], items: List["Product"]) -> None:
+        """Сортирует товары по ключу; сортировка устойчива, поэтому равные ключи сохраняют порядок"""
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = [keys[i] for i in order]
+        self._items = [items[i] for i in order]
+
+    def between(self, low: float, high: float) -> List["Product"]:
+        """Товары с ключом в диапазоне [low, high] по возрастанию ключа"""
+        self._flush()
+        return self._items[bisect_left(self._keys, low):bisect_right(self._keys, high)]
+
+    def first(self, n: int) -> List["Product"]:
+        """n товаров с наименьшими ключами"""
+        self._flush()
+        return self._items[:max(n, 0)]
+
+    def last(self, n: int) -> List["Product"]:
+        """n товаров с наибольшими ключами, начиная с наибольшего"""
+        self._flush()
+        if n <= 0:
+            return []
+        return self._items[:-n - 1:-1]
+
+
+class CategoryIndex:
+    """
+    Вторичные индексы товаров категории: по названию, по цене и по остатку.
+    """
+
+    def __init__(self, products: Iterable["Product"] = ()) -> None:
+        products = list(products)
+        names = [product.name for product in products]
+        self._names: Dict["Product", str] = dict(zip(products, names))
+        self._by_name: Dict[str, List["Product"]] = {}
+        for product, name in zip(products, names):
+            bucket = self._by_name.get(name)
+            if bucket is None:
+                self._by_name[name] = [product]
+            else:
+                bucket.append(product)
+        self.by_price = SortedIndex()
+        self.by_price.load([product.price for product in products], products)
+        self.by_quantity = SortedIndex()
+        self.by_quantity.load([product.quantity for product in products], products)
+
+    def add(self, product: "Product") -> None:
+        name = product.name
+        self._by_name.setdefault(name, []).append(product)
+        self._names[product] = name
+        self.by_price.add(product.price, product)
+        self.by_quantity.add(product.quantity, product)
+
+    def remove(self, product: "Product") -> None:
+        self._unlink_name(product, self._names.pop(product))
+        self.by_price.remove(product)
+        self.by_quantity.remove(product)
+
+    def update(self, product: "Product") -> None:
+        """Переносит товар в индексах после изменения его названия, цены или остатка"""
+        old_name = self._names[product]
+        name = product.name
+        if old_name != name:
+            self._unlink_name(product, old_name)
+            self._by_name.setdefault(name, []).append(product)
+            self._names[product] = name
+        self.by_price.update(product.price, product)
+        self.by_quantity.update(product.quantity, product)
+
+    def _unlink_name(self, product: "Product", name: str) -> None:
+        bucket = self._by_name[name]
+        bucket.remove(product)
+        if not bucket:
+            del self._by_name[name]
+
+    def find_by_name(self, name: Any) -> List["Product"]:
+        return list(self._by_name.get(name, ()))
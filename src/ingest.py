@@ -0,0 +1,97 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.classes import Category
+from src.metrics import LOAD_SECONDS, LOADED_PRODUCTS, metrics
+from src.parsers import ParsedCategory
+from src.registry import RecordError, product_registry
+from src.utils import iter_raw_categories
+
+
+class FeedError(NamedTuple):
+    """Ошибка в строке товара одного из файлов поставщиков"""
+
+    path: str
+    category: str
+    row: int
+    field: str
+    message: str
+
+
+class IngestResult(NamedTuple):
+    categories: List[Category]
+    errors: List[FeedError]
+
+
+def find_feeds(source: str) -> List[str]:
+    """Возвращает отсортированный список JSON-файлов в каталоге или по шаблону glob"""
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "*.json")))
+    return sorted(glob.glob(source))
+
+
+def parse_feed(path: str) -> Tuple[List[ParsedCategory], List[FeedError]]:
+    """
+    Разбирает и проверяет один файл поставщика, не создавая объектов Product:
+    каждая запись приводится к аргументам конструктора своего типа из реестра.
+
+    Выполняется в процессах пула, поэтому возвращает только простые данные,
+    которые дёшево передать обратно в основной процесс.
+    """
+    parsed = []
+    errors = []
+    for category_data in iter_raw_categories(path):
+        name = category_data["name"]
+        rows = []
+        for row, record in enumerate(category_data["products"]):
+            try:
+                type_name, args = product_registry.coerce(record)
+            except RecordError as error:
+                errors.append(FeedError(path, name, row, error.field, str(error)))
+                continue
+            rows.append((type_name, args))
+        parsed.append(ParsedCategory(name, category_data["description"], rows))
+    return parsed, errors
+
+
+def load_feeds_parallel(source: str, max_workers: Optional[int] = None) -> IngestResult:
+    """
+    Загружает все файлы поставщиков из каталога или по шаблону glob.
+
+    Разбор и проверка файлов идут параллельно в пуле процессов; основной процесс
+    объединяет категории с одинаковым названием (описание берётся из первого файла)
+    и создаёт каждую Category ровно один раз, так что общие счётчики остаются точными.
+    """
+    with LOAD_SECONDS.time("feeds"):
+        paths = find_feeds(source)
+        if max_workers == 1 or len(paths) <= 1:
+            results = [parse_feed(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(parse_feed, paths))
+
+        merged: Dict[str, ParsedCategory] = {}
+        errors: List[FeedError] = []
+        for parsed, feed_errors in results:
+            errors.extend(feed_errors)
+            for category in parsed:
+                existing = merged.get(category.name)
+                if existing is None:
+                    merged[category.name] = ParsedCategory(category.name, category.description, list(category.rows))
+                else:
+                    existing.rows.extend(category.rows)
+
+        categories = [
+            Category(
+                name=category.name,
+                description=category.description,
+                products=[product_registry.construct(type_name, args) for type_name, args in category.rows],
+            )
+            for category in merged.values()
+        ]
+
+    if metrics.enabled:
+        LOADED_PRODUCTS.inc("feeds", amount=sum(len(category._products) for category in categories))
+    return IngestResult(categories, errors)
@@ -0,0 +1,84 @@
+"""
+Ленивые категории: товары создаются при первом обращении к ним.
+
+LazyProducts хранит проверенные строки товаров (см. src.parsers) в колонках: цены и остатки
+лежат в числовых массивах, названия, описания и типы — в списках ссылок на строки.
+Количество товаров, средняя цена, общий остаток и __str__ категории считаются по колонкам,
+поэтому сводка категории не создаёт ни одного объекта Product. Дополнительные поля
+наследников (память смартфона, страна газона и т. п.) тоже хранятся по колонкам.
+
+Объект создаётся через реестр типов (обычным конструктором, с записью LogMixin) только
+при обращении к товару и дальше живёт как обычный товар категории.
+"""
+from array import array
+from itertools import zip_longest
+from operator import itemgetter, mul
+from typing import Any, Dict, List, Sequence, Tuple
+
+from src.classes import Product
+from src.parsers import Row
+from src.registry import product_registry
+from src.storage import DeferredProducts
+
+_get_type = itemgetter(0)
+_get_args = itemgetter(1)
+
+
+def _pooled(column: Sequence[Any], pool: Dict[str, str]) -> List[Any]:
+    """Колонка, в которой равные строки заменены одним объектом из pool"""
+    if set(map(type, column)) != {str}:
+        # числа не объединяются: 1 и 1.0 равны, но должны сохранить свой тип
+        return list(column)
+    return list(map(pool.setdefault, column, column))
+
+
+class LazyProducts(DeferredProducts):
+    """
+    Хранилище товаров категории поверх колонок проверенных строк.
+
+    Строки превращаются в объекты при первом обращении и запоминаются; товары, добавленные
+    позже через add_product, хранятся отдельно. Колонки хранят значения на момент загрузки
+    и нужны только для агрегатов при подключении к категории и для создания объектов:
+    дальнейшие изменения товаров видны только в самих объектах. Удалить можно только
+    уже созданный товар — другого способа получить объект товара нет.
+    """
+
+    def __init__(self, rows: Sequence[Row]):
+        super().__init__(len(rows))
+        self._types = list(map(_get_type, rows))
+        # одна транспозиция строк в колонки; у типов с меньшим числом полей — None
+        columns = list(zip_longest(*map(_get_args, rows))) or [(), (), (), ()]
+        self._names = list(columns[0])
+        # описания и дополнительные поля сильно повторяются, поэтому равные строки
+        # хранятся одним объектом, как в пуле строк ProductTable
+        pool: Dict[str, str] = {}
+        self._descriptions = _pooled(columns[1], pool)
+        self._prices = array("d", columns[2])
+        self._quantities = array("q", columns[3])
+        self._extras = [_pooled(column, pool) for column in columns[4:]]
+
+    def _aggregates(self) -> Tuple[int, float, int, float]:
+        return (
+            len(self._prices),
+            sum(self._prices),
+            sum(self._quantities),
+            sum(map(mul, self._prices, self._quantities)),
+        )
+
+    def _materialize(self, index: int) -> Product:
+        spec = product_registry.spec(self._types[index])
+        extras = [column[index] for column in self._extras[:len(spec.fields) - 4]]
+        return spec.cls(
+            self._names[index], self._descriptions[index], self._prices[index], self._quantities[index], *extras
+        )
+
+    def remove(self, product: Product) -> None:
+        for index, materialized in enumerate(self._materialized):
+            if materialized is product:
+                break
+        else:
+            self._appended.remove(product)
+            return
+        for column in (self._types, self._names, self._descriptions, self._prices, self._quantities, *self._extras):
+            del column[index]
+        del self._materialized[index]
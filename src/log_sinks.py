@@ -0,0 +1,139 @@
+import atexit
+import itertools
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, List, NamedTuple, Optional, TextIO
+
+
+class LogRecord(NamedTuple):
+    """Структурированная запись о создании товара; строка собирается только при выводе"""
+
+    class_name: str
+    name: str
+    description: str
+    price: float
+    quantity: int
+
+    def format(self) -> str:
+        return f"{self.class_name}({self.name}, {self.description}, {self.price}, {self.quantity})"
+
+
+class LogSink(ABC):
+    """Приёмник записей LogMixin. Если enabled ложно, запись даже не создаётся"""
+
+    enabled = True
+
+    @abstractmethod
+    def emit(self, record: LogRecord) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class PrintSink(LogSink):
+    """Поведение по умолчанию: печатает каждую запись в stdout сразу при создании товара"""
+
+    def emit(self, record: LogRecord) -> None:
+        print(record.format())
+
+
+class NullSink(LogSink):
+    """Отключает логирование"""
+
+    enabled = False
+
+    def emit(self, record: LogRecord) -> None:
+        pass
+
+
+class SampledSink(LogSink):
+    """Передаёт дальше только каждую every-ю запись"""
+
+    def __init__(self, inner: LogSink, every: int = 100):
+        if every < 1:
+            raise ValueError("Частота выборки должна быть положительной")
+        self.inner = inner
+        self.every = every
+        self._counter = itertools.count()
+
+    def emit(self, record: LogRecord) -> None:
+        if next(self._counter) % self.every == 0:
+            self.inner.emit(record)
+
+    def flush(self) -> None:
+        self.inner.flush()
+
+
+class BufferedSink(LogSink):
+    """
+    Буферизованный приёмник с фоновым потоком.
+
+    emit только добавляет запись в очередь (deque.append не требует блокировок); фоновый поток
+    просыпается раз в flush_interval секунд или когда накопилось batch_size записей,
+    форматирует всю пачку и пишет её в поток вывода одной операцией.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, batch_size: int = 1000, flush_interval: float = 0.2):
+        self.stream = stream
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: Deque[LogRecord] = deque()
+        self._wakeup = threading.Event()
+        self._idle = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, record: LogRecord) -> None:
+        self._pending.append(record)
+        if len(self._pending) == self.batch_size:
+            self._wakeup.set()
+
+    def _drain(self) -> None:
+        with self._idle:
+            self._busy = True
+        try:
+            while self._pending:
+                batch: List[LogRecord] = []
+                while self._pending and len(batch) < self.batch_size:
+                    batch.append(self._pending.popleft())
+                stream = self.stream if self.stream is not None else sys.stdout
+                stream.write("".join(record.format() + "\n" for record in batch))
+                stream.flush()
+        finally:
+            with self._idle:
+                self._busy = False
+                self._idle.notify_all()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain()
+        self._drain()
+
+    def flush(self) -> None:
+        """Блокирует до тех пор, пока все поставленные записи не будут выведены"""
+        if self._closed:
+            return
+        self._wakeup.set()
+        with self._idle:
+            while self._pending or self._busy:
+                self._idle.wait(self.flush_interval)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        atexit.unregister(self.close)
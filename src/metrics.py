@@ -0,0 +1,387 @@
+"""
+Необязательные метрики каталога: счётчики и гистограммы задержек.
+
+По умолчанию метрики выключены и ничего не стоят: замеры в Product и Category
+устанавливаются только при metrics.enable() — методы классов заменяются обёртками,
+а metrics.disable() возвращает исходные. Каждая метрика защищена своей блокировкой,
+поэтому значения точны при работе из нескольких потоков.
+
+Снимок значений отдаёт metrics.snapshot(), текст в формате Prometheus —
+metrics.to_prometheus(), запись в файл (например, для textfile collector) —
+metrics.write_prometheus(path).
+"""
+import functools
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+# Границы корзин гистограмм задержек, секунды
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0, 10.0,
+)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Монотонный счётчик с необязательными метками"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            values = list(self._values.items())
+        return [{"labels": dict(zip(self.labels, key)), "value": value} for key, value in values]
+
+    def prometheus_lines(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class _Timer:
+    """Контекстный менеджер замера; при выключенных метриках ничего не делает"""
+
+    __slots__ = ("_histogram", "_labels", "_started")
+
+    def __init__(self, histogram: "Histogram", labels: Labels):
+        self._histogram = histogram
+        self._labels = labels
+        self._started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        registry = self._histogram.registry
+        if registry is None or registry.enabled:
+            self._started = perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self._started:
+            self._histogram.observe(perf_counter() - self._started, *self._labels)
+
+
+class Histogram:
+    """Гистограмма задержек с фиксированными корзинами"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional["Metrics"] = None,
+    ):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self.registry = registry
+        self._series: Dict[Labels, _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = _HistogramSeries(len(self.buckets) + 1)
+            series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+
+    def time(self, *label_values: str) -> _Timer:
+        """Замеряет блок with, если метрики включены"""
+        return _Timer(self, label_values)
+
+    def count(self, *label_values: str) -> int:
+        with self._lock:
+            series = self._series.get(label_values)
+            return series.count if series is not None else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _copy(self) -> List[Tuple[Labels, List[int], float, int]]:
+        with self._lock:
+            return [(key, list(series.counts), series.sum, series.count) for key, series in self._series.items()]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        samples = []
+        for key, counts, total, count in self._copy():
+            cumulative, buckets = 0, {}
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                buckets[_format_value(bound)] = cumulative
+            samples.append({"labels": dict(zip(self.labels, key)), "count": count, "sum": total, "buckets": buckets})
+        return samples
+
+    def prometheus_lines(self) -> Iterator[str]:
+        for key, counts, total, count in self._copy():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels, key, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {count}"
+
+
+Metric = Union[Counter, Histogram]
+
+# Состояние замеров текущего потока: какие гистограммы уже замеряют внешний вызов.
+# Нужно, чтобы переопределённый метод, вызывающий super(), учитывался один раз.
+_local = threading.local()
+
+
+def _timed(
+    function: Callable[..., Any],
+    histogram: Histogram,
+    labels: Callable[[Tuple[Any, ...]], Labels],
+    errors: Optional[Counter],
+) -> Callable[..., Any]:
+    name = histogram.name
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            active = _local.active
+        except AttributeError:
+            active = _local.active = set()
+        if name in active:
+            return function(*args, **kwargs)
+        active.add(name)
+        started = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        except Exception as error:
+            if errors is not None:
+                errors.inc(type(error).__name__)
+            raise
+        finally:
+            active.discard(name)
+            histogram.observe(perf_counter() - started, *labels(args))
+
+    return wrapper
+
+
+def _wrap_descriptor(descriptor: Any, wrap: Callable[[Callable[..., Any]], Callable[..., Any]]) -> Any:
+    if isinstance(descriptor, classmethod):
+        return classmethod(wrap(descriptor.__func__))
+    if isinstance(descriptor, property):
+        getter = descriptor.fget
+        return property(
+            wrap(getter) if getter is not None else None, descriptor.fset, descriptor.fdel, descriptor.__doc__
+        )
+    return wrap(descriptor)
+
+
+def _defining_classes(cls: type, name: str, skip: Tuple[type, ...] = ()) -> Iterator[type]:
+    """Класс и все его наследники, которые сами определяют атрибут name, кроме классов skip и их наследников"""
+    stack, seen = [cls], set()
+    while stack:
+        current = stack.pop()
+        if current in seen or current in skip:
+            continue
+        seen.add(current)
+        if name in current.__dict__:
+            yield current
+        stack.extend(current.__subclasses__())
+
+
+class Metrics:
+    """Реестр метрик каталога и переключатель замеров"""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._metrics: Dict[str, Metric] = {}
+        self._installed: List[Tuple[type, str, Any]] = []
+        self._lock = threading.RLock()
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Counter(name, help_text, labels)
+            if not isinstance(metric, Counter):
+                raise ValueError(f"Метрика {name} уже зарегистрирована с другим типом")
+            return metric
+
+    def histogram(
+        self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, help_text, labels, buckets, registry=self)
+            if not isinstance(metric, Histogram):
+                raise ValueError(f"Метрика {name} уже зарегистрирована с другим типом")
+            return metric
+
+    # --- включение ---
+
+    def enable(self) -> None:
+        """
+        Включает замеры: методы Product и Category (и их наследников, объявленных к этому
+        моменту) заменяются обёртками, которые обновляют метрики.
+        """
+        with self._lock:
+            if self.enabled:
+                return
+            for cls, name, histogram, labels, errors, skip in _instrumented_methods():
+                for target in _defining_classes(cls, name, skip):
+                    original = target.__dict__[name]
+                    wrapped = _wrap_descriptor(
+                        original, functools.partial(_timed, histogram=histogram, labels=labels, errors=errors)
+                    )
+                    self._installed.append((target, name, original))
+                    setattr(target, name, wrapped)
+            self.enabled = True
+
+    def disable(self) -> None:
+        """Возвращает исходные методы; накопленные значения сохраняются"""
+        with self._lock:
+            for target, name, original in reversed(self._installed):
+                setattr(target, name, original)
+            self._installed.clear()
+            self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            for metric in self._metrics.values():
+                metric.reset()
+
+    # --- экспорт ---
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Текущие значения всех метрик в виде словаря"""
+        with self._lock:
+            registered = list(self._metrics.values())
+        return {
+            metric.name: {"type": metric.kind, "help": metric.help, "samples": metric.snapshot()}
+            for metric in registered
+        }
+
+    def to_prometheus(self) -> str:
+        """Значения в текстовом формате Prometheus"""
+        with self._lock:
+            registered = list(self._metrics.values())
+        lines = []
+        for metric in registered:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Атомарно записывает метрики в файл: сначала во временный, затем переименовывает"""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus())
+        os.replace(temporary, path)
+
+
+metrics = Metrics()
+
+PRODUCT_INIT_SECONDS = metrics.histogram(
+    "catalog_product_init_seconds", "Время создания товара, включая запись в журнал LogMixin", ("class",)
+)
+NEW_PRODUCT_SECONDS = metrics.histogram(
+    "catalog_new_product_seconds", "Время Product.new_product, включая проверку полей", ("class",)
+)
+NEW_PRODUCT_ERRORS = metrics.counter(
+    "catalog_new_product_errors_total", "Записи, отклонённые проверкой Product.new_product", ("error",)
+)
+ADD_PRODUCT_SECONDS = metrics.histogram("catalog_add_product_seconds", "Время Category.add_product", ("class",))
+ADD_PRODUCT_ERRORS = metrics.counter(
+    "catalog_add_product_errors_total", "Отклонённые вызовы Category.add_product", ("error",)
+)
+QUERY_SECONDS = metrics.histogram("catalog_query_seconds", "Время агрегатных запросов к категории", ("query",))
+LOAD_SECONDS = metrics.histogram("catalog_load_seconds", "Время загрузки каталога", ("source",))
+LOADED_PRODUCTS = metrics.counter("catalog_loaded_products_total", "Товары, загруженные в каталог", ("source",))
+
+
+def _class_label(args: Tuple[Any, ...]) -> Labels:
+    first = args[0]
+    return ((first if isinstance(first, type) else type(first)).__name__,)
+
+
+def _query_label(query: str) -> "LabelGetter":
+    labels = (query,)
+    return lambda args: labels
+
+
+LabelGetter = Callable[[Tuple[Any, ...]], Labels]
+
+
+def _instrumented_methods() -> List[Tuple[type, str, Histogram, LabelGetter, Optional[Counter], Tuple[type, ...]]]:
+    """Замеряемые методы: класс, имя, гистограмма, метки, счётчик ошибок и классы-исключения"""
+    # импорт здесь: src.classes и загрузчики сами импортируют этот модуль
+    from src.classes import Category, LogMixin, Product
+    from src.table import ProductView
+
+    return [
+        # ProductView.__init__ не создаёт товар, а оборачивает строку ProductTable при каждом обращении
+        (LogMixin, "__init__", PRODUCT_INIT_SECONDS, _class_label, None, (ProductView,)),
+        (Product, "new_product", NEW_PRODUCT_SECONDS, _class_label, NEW_PRODUCT_ERRORS, ()),
+        (Category, "add_product", ADD_PRODUCT_SECONDS, _class_label, ADD_PRODUCT_ERRORS, ()),
+        (Category, "middle_price", QUERY_SECONDS, _query_label("middle_price"), None, ()),
+        (Category, "total_quantity", QUERY_SECONDS, _query_label("total_quantity"), None, ()),
+        (Category, "stock_value", QUERY_SECONDS, _query_label("stock_value"), None, ()),
+    ]
@@ -0,0 +1,183 @@
+"""
+Сменные парсеры файла товаров.
+
+Парсер превращает содержимое файла в формате data/products.json в список ParsedCategory:
+строки товаров уже приведены к аргументам конструкторов своих типов из реестра,
+поэтому остаётся только создать объекты.
+
+Доступные парсеры (в порядке предпочтения):
+
+- "schema" — декодер, специализированный под раскладку products.json. Документ разбирается
+  самым быстрым из доступных JSON-парсеров, затем записи каждого типа проверяются колонками:
+  если все значения поля уже имеют нужный тип (str, float, int), преобразование пропускается.
+  Записи, не прошедшие быструю проверку, приводятся общим путём реестра, поэтому результат
+  и ошибки совпадают с остальными парсерами;
+- "orjson" — orjson (если установлен) и приведение каждой записи через реестр;
+- "stdlib" — модуль json стандартной библиотеки и приведение через реестр.
+
+Все парсеры читают файл целиком; для потоковой обработки с ограниченной памятью
+служит src.utils.iter_categories_from_json.
+"""
+import json
+from abc import ABC, abstractmethod
+from operator import itemgetter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from src.classes import _require_str
+from src.registry import DEFAULT_TYPE, Converter, ProductSpec, product_registry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None  # type: ignore[assignment]
+
+# (тип товара из реестра, аргументы конструктора)
+Row = Tuple[str, Tuple[Any, ...]]
+
+# преобразователи, которые для значения своего типа возвращают равное ему значение
+_EXACT_TYPES: Dict[Converter, type] = {str: str, _require_str: str, int: int, float: float}
+
+_get_price = itemgetter(2)
+_get_quantity = itemgetter(3)
+
+
+class ParsedCategory(NamedTuple):
+    """Проверенные строки товаров одной категории"""
+
+    name: str
+    description: str
+    rows: List[Row]
+
+
+class Parser(ABC):
+    """Базовый парсер: JSON-документ разбирается loads, записи приводятся через реестр"""
+
+    name = ""
+    available = True
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        pass
+
+    def parse(self, data: bytes) -> List[ParsedCategory]:
+        document = self.loads(data)
+        if not isinstance(document, list):
+            raise ValueError("Файл товаров должен содержать JSON-массив категорий")
+        return [
+            ParsedCategory(category["name"], category["description"], self.rows(category["products"]))
+            for category in document
+        ]
+
+    def parse_file(self, path: str) -> List[ParsedCategory]:
+        with open(path, "rb") as file:
+            return self.parse(file.read())
+
+    def rows(self, records: List[Dict[str, Any]]) -> List[Row]:
+        coerce = product_registry.coerce
+        return [coerce(record) for record in records]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class StdlibParser(Parser):
+    name = "stdlib"
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonParser(Parser):
+    name = "orjson"
+    available = orjson is not None
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class _ExactSpec(NamedTuple):
+    """Типы полей спецификации, при которых приведение не меняет значения"""
+
+    spec: ProductSpec
+    types: Optional[Tuple[type, ...]]
+
+
+def _exact_spec(spec: ProductSpec) -> _ExactSpec:
+    try:
+        return _ExactSpec(spec, tuple(_EXACT_TYPES[converter] for converter in spec._converters))
+    except KeyError:
+        return _ExactSpec(spec, None)
+
+
+class SchemaParser(Parser):
+    """
+    Декодер раскладки products.json: записи категории группируются по типу,
+    поля извлекаются одним itemgetter, а типы и знаки проверяются сразу для всей колонки.
+    """
+
+    name = "schema"
+
+    def __init__(self, raw: Optional[Parser] = None):
+        self.raw = raw or (OrjsonParser() if OrjsonParser.available else StdlibParser())
+
+    def loads(self, data: bytes) -> Any:
+        return self.raw.loads(data)
+
+    def __repr__(self) -> str:
+        return f"SchemaParser({self.raw!r})"
+
+    def rows(self, records: List[Dict[str, Any]]) -> List[Row]:
+        type_names = [record.get("type", DEFAULT_TYPE) for record in records]
+        distinct = set(type_names)
+        if len(distinct) == 1:
+            return self._typed_rows(type_names[0], records) or super().rows(records)
+
+        rows: List[Any] = [None] * len(records)
+        for type_name in distinct:
+            positions = [position for position, name in enumerate(type_names) if name == type_name]
+            group = [records[position] for position in positions]
+            for position, row in zip(positions, self._typed_rows(type_name, group) or super().rows(group)):
+                rows[position] = row
+        return rows
+
+    def _typed_rows(self, type_name: str, records: List[Dict[str, Any]]) -> Optional[List[Row]]:
+        """Строки группы одного типа или None, если группу нужно привести общим путём"""
+        if type_name not in product_registry:
+            return None
+        exact = _exact_spec(product_registry.spec(type_name))
+        if exact.types is None:
+            return None
+        try:
+            values = list(map(exact.spec._getter, records))
+        except KeyError:
+            return None
+        for column, expected in zip(zip(*values), exact.types):
+            if any(value_type is not expected for value_type in set(map(type, column))):
+                return None
+        # min с NaN в начале колонки даёт NaN, и проверка уходит на общий путь
+        if values and not (min(map(_get_price, values)) >= 0 and min(map(_get_quantity, values)) > 0):
+            return None
+        return [(type_name, args) for args in values]
+
+
+PARSERS = {parser.name: parser for parser in (SchemaParser, OrjsonParser, StdlibParser)}
+
+
+def available_parsers() -> List[str]:
+    """Названия доступных парсеров от самого быстрого к самому медленному"""
+    return [name for name, parser in PARSERS.items() if parser.available]
+
+
+def get_parser(parser: Union[str, Parser, None] = None) -> Parser:
+    """Возвращает парсер по названию; без названия — самый быстрый из доступных"""
+    if isinstance(parser, Parser):
+        return parser
+    if parser is None:
+        parser = available_parsers()[0]
+    try:
+        parser_class = PARSERS[parser]
+    except KeyError:
+        raise ValueError(f"Неизвестный парсер: {parser}") from None
+    if not parser_class.available:
+        raise ValueError(f"Парсер {parser} недоступен: не установлена необязательная зависимость")
+    return parser_class()
@@ -0,0 +1,130 @@
+from operator import itemgetter
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Type
+
+from src.classes import LawnGrass, Product, Smartphone, _require_str
+
+DEFAULT_TYPE = "product"
+
+Converter = Callable[[Any], Any]
+
+# название и описание должны быть строками: str(None) превратил бы null в товар "None"
+_BASE_FIELDS: Tuple[Tuple[str, Converter], ...] = (
+    ("name", _require_str),
+    ("description", _require_str),
+    ("price", float),
+    ("quantity", int),
+)
+
+
+class RecordError(ValueError):
+    """Ошибка в записи товара с указанием поля"""
+
+    def __init__(self, field: str, message: str):
+        super().__init__(message)
+        self.field = field
+
+
+class ProductSpec:
+    """
+    Описание типа товара для загрузчика: класс и порядок полей с преобразователями.
+
+    Порядок полей совпадает с порядком аргументов конструктора класса. Извлечение всех
+    полей из записи выполняется одним заранее собранным itemgetter.
+    """
+
+    def __init__(self, type_name: str, cls: Type[Product], extra_fields: Mapping[str, Converter]):
+        self.type_name = type_name
+        self.cls = cls
+        self.fields = _BASE_FIELDS + tuple(extra_fields.items())
+        self._names = tuple(name for name, _ in self.fields)
+        self._converters = tuple(converter for _, converter in self.fields)
+        self._getter = itemgetter(*self._names)
+
+    def coerce(self, record: Mapping[str, Any]) -> Tuple[Any, ...]:
+        """Извлекает и приводит поля записи к типам конструктора, не создавая объект"""
+        try:
+            values = self._getter(record)
+        except KeyError as error:
+            field = error.args[0]
+            raise RecordError(field, f"Отсутствует обязательное поле: {field}") from None
+        args = []
+        for name, converter, value in zip(self._names, self._converters, values):
+            try:
+                args.append(converter(value))
+            except (ValueError, TypeError):
+                raise RecordError(name, f"Поле '{name}' имеет некорректное значение: {value!r}") from None
+        if args[3] < 0:
+            raise RecordError("quantity", "Количество товара не может быть отрицательным")
+        if args[3] == 0:
+            # Product.__init__ тоже отвергает ноль, но проверка здесь срабатывает до создания объектов
+            raise RecordError("quantity", "Товар с нулевым количеством не может быть добавлен")
+        if args[2] < 0:
+            raise RecordError("price", "Цена товара не может быть отрицательной")
+        return tuple(args)
+
+    def build(self, record: Mapping[str, Any]) -> Product:
+        return self.cls(*self.coerce(record))
+
+
+class ProductRegistry:
+    """
+    Реестр типов товаров.
+
+    Тип записи берётся из поля "type" (по умолчанию "product"). Новые типы
+    добавляются через register без изменений в загрузчике.
+    """
+
+    def __init__(self) -> None:
+        self._specs: Dict[str, ProductSpec] = {}
+
+    def register(
+        self, type_name: str, cls: Type[Product], extra_fields: Optional[Mapping[str, Converter]] = None
+    ) -> ProductSpec:
+        spec = ProductSpec(type_name, cls, extra_fields or {})
+        self._specs[type_name] = spec
+        return spec
+
+    def spec(self, type_name: str) -> ProductSpec:
+        try:
+            return self._specs[type_name]
+        except KeyError:
+            raise RecordError("type", f"Неизвестный тип товара: {type_name}") from None
+
+    def spec_for(self, cls: type) -> ProductSpec:
+        """Описание типа для класса товара или ближайшего зарегистрированного предка"""
+        for klass in cls.__mro__:
+            for spec in self._specs.values():
+                if spec.cls is klass:
+                    return spec
+        raise RecordError("type", f"Класс товара {cls.__name__} не зарегистрирован")
+
+    def coerce(self, record: Mapping[str, Any]) -> Tuple[str, Tuple[Any, ...]]:
+        """Возвращает тип записи и готовые аргументы конструктора"""
+        type_name = record.get("type", DEFAULT_TYPE)
+        return type_name, self.spec(type_name).coerce(record)
+
+    def construct(self, type_name: str, args: Tuple[Any, ...]) -> Product:
+        return self.spec(type_name).cls(*args)
+
+    def build(self, record: Mapping[str, Any]) -> Product:
+        return self.spec(record.get("type", DEFAULT_TYPE)).build(record)
+
+    def __contains__(self, type_name: object) -> bool:
+        return type_name in self._specs
+
+
+product_registry = ProductRegistry()
+product_registry.register(DEFAULT_TYPE, Product)
+product_registry.register(
+    "smartphone", Smartphone, {"efficiency": str, "model": str, "memory": int, "color": str}
+)
+product_registry.register(
+    "lawn_grass", LawnGrass, {"country": str, "germination_period": str, "color": str}
+)
+
+
+def register_product_type(
+    type_name: str, cls: Type[Product], extra_fields: Optional[Mapping[str, Converter]] = None
+) -> ProductSpec:
+    """Регистрирует новый тип товара в общем реестре загрузчика"""
+    return product_registry.register(type_name, cls, extra_fields)
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Tuple
+
+
+class CacheStats(NamedTuple):
+    """Статистика кэша отчётов"""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    weight: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _weight(value: Any) -> int:
+    """Вес отчёта: длина для списков и кортежей, 1 для остальных значений"""
+    return len(value) if isinstance(value, (list, tuple)) else 1
+
+
+class ReportCache:
+    """
+    LRU-кэш готовых отчётов с ограничением числа записей и суммарного веса.
+
+    Каждая запись хранит метку версии данных, на которых построена. Если при запросе
+    метка не совпадает с текущей, запись считается устаревшей и строится заново,
+    поэтому для сброса кэша источнику достаточно изменить свою версию.
+    """
+
+    def __init__(self, max_entries: int = 128, max_weight: Optional[int] = None):
+        if max_entries < 1:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, Any, int]]" = OrderedDict()
+        self._weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: Hashable, build: Callable[[], Any]) -> Any:
+        """Возвращает отчёт по ключу, построенный для версии version; при промахе вызывает build"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = build()
+        weight = _weight(value)
+        if entry is not None:
+            self._weight -= entry[2]
+        self._entries[key] = (version, value, weight)
+        self._entries.move_to_end(key)
+        self._weight += weight
+        self._evict()
+        return value
+
+    def _evict(self) -> None:
+        entries = self._entries
+        while len(entries) > self.max_entries or (
+            self.max_weight is not None and self._weight > self.max_weight and len(entries) > 1
+        ):
+            _, (_, _, weight) = entries.popitem(last=False)
+            self._weight -= weight
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._weight = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self._weight)
+
+    def __len__(self) -> int:
+        return len(self._entries)
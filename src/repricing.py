@@ -0,0 +1,219 @@
+"""
+Пакетное изменение цен с журналом и откатом.
+
+Новые цены сначала вычисляются и проверяются для всех выбранных товаров; если хотя бы
+одна цена некорректна, ничего не меняется и вызывается RepriceError со списком ошибок.
+Затем цены записываются напрямую, а категории-владельцы получают одно уведомление
+с суммарным изменением агрегатов вместо уведомления от каждого товара.
+
+Каждое изменение добавляется в журнал PriceJournal. Записи журнала не удаляются:
+откат применяет старые цены и добавляет в журнал ещё одну запись.
+"""
+import math
+from itertools import repeat
+from operator import add, attrgetter, mul, sub
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+from src.classes import Category, Product
+
+Predicate = Callable[[Product], bool]
+
+_get_price = attrgetter("price")
+_get_slot_quantity = attrgetter("_quantity")
+_get_owners = attrgetter("_owners")
+_PRICE_PROPERTY = Product.__dict__["price"]
+
+
+class PriceChange(NamedTuple):
+    product: Product
+    old_price: float
+    new_price: float
+
+
+class RepriceError(ValueError):
+    """Пакет цен отклонён целиком; в invalid перечислены товары с некорректной новой ценой"""
+
+    def __init__(self, message: str, invalid: List[PriceChange]):
+        super().__init__(f"{message}: {len(invalid)} шт.")
+        self.invalid = invalid
+
+
+class RepriceBatch(NamedTuple):
+    """Запись журнала: товары с их старыми и новыми ценами"""
+
+    number: int
+    products: List[Product]
+    old_prices: List[float]
+    new_prices: List[float]
+    rollback_of: Optional[int] = None
+
+    def changes(self) -> Iterator[PriceChange]:
+        return map(PriceChange, self.products, self.old_prices, self.new_prices)
+
+
+def _select(categories: Union[Category, Iterable[Category]], where: Optional[Predicate]) -> List[Product]:
+    if isinstance(categories, Category):
+        products = categories._products
+        return list(products if where is None else filter(where, products))
+    else:
+        products = []
+        seen: Set[int] = set()
+        for category in categories:
+            for product in category._products:
+                # товар из нескольких категорий переоценивается один раз
+                if id(product) not in seen:
+                    seen.add(id(product))
+                    products.append(product)
+    if where is not None:
+        products = list(filter(where, products))
+    return products
+
+
+def _invalid(products: List[Product], old_prices: List[float], new_prices: List[float]) -> List[PriceChange]:
+    try:
+        # быстрая проверка: fsum даёт nan или inf, если такие значения есть в колонке
+        if not new_prices or (min(new_prices) > 0 and math.isfinite(math.fsum(new_prices))):
+            return []
+    except OverflowError:
+        pass
+    return [
+        PriceChange(products[row], old_prices[row], price)
+        for row, price in enumerate(new_prices)
+        if not 0 < price < math.inf
+    ]
+
+
+def _write_prices(products: List[Product], old_prices: List[float], new_prices: List[float]) -> None:
+    """
+    Записывает проверенные цены и одним вызовом на категорию сообщает владельцам
+    суммарное изменение суммы цен и стоимости остатка.
+    """
+    if any(product_type.price is not _PRICE_PROPERTY for product_type in {type(product) for product in products}):
+        # цена хранится не в слоте (например, ProductView): обычный сеттер с уведомлением
+        for product, new_price in zip(products, new_prices):
+            product.price = new_price
+        return
+
+    for product, new_price in zip(products, new_prices):
+        product._price = new_price
+        product._rendered = None
+
+    differences = list(map(sub, new_prices, old_prices))
+    stock_differences = list(map(mul, differences, map(_get_slot_quantity, products)))
+
+    owners = list(map(_get_owners, products))
+    if owners and isinstance(owners[0], Category) and owners.count(owners[0]) == len(owners):
+        # частый случай: все товары из одной категории
+        owners[0]._on_prices_change(products, math.fsum(differences), math.fsum(stock_differences))
+        return
+
+    groups: Dict[int, Tuple[Category, List[int]]] = {}
+    for row, product_owners in enumerate(owners):
+        if product_owners is None:
+            continue
+        for owner in product_owners if isinstance(product_owners, list) else (product_owners,):
+            group = groups.get(id(owner))
+            if group is None:
+                group = groups[id(owner)] = (owner, [])
+            group[1].append(row)
+    for category, rows in groups.values():
+        category._on_prices_change(
+            [products[row] for row in rows],
+            math.fsum([differences[row] for row in rows]),
+            math.fsum([stock_differences[row] for row in rows]),
+        )
+
+
+class PriceJournal:
+    """Журнал пакетных изменений цен; хранит все записи в порядке применения"""
+
+    def __init__(self) -> None:
+        self._batches: List[RepriceBatch] = []
+        self._rolled_back: Set[int] = set()
+
+    @property
+    def batches(self) -> Tuple[RepriceBatch, ...]:
+        return tuple(self._batches)
+
+    def reprice(
+        self,
+        categories: Union[Category, Iterable[Category]],
+        percent: Optional[float] = None,
+        amount: Optional[float] = None,
+        where: Optional[Predicate] = None,
+        ndigits: Optional[int] = None,
+    ) -> RepriceBatch:
+        """
+        Меняет цены товаров категорий на percent процентов или на amount рублей.
+
+        where отбирает товары, ndigits округляет новые цены. Новая цена должна быть
+        положительной, иначе пакет отклоняется целиком с RepriceError.
+        """
+        if (percent is None) == (amount is None):
+            raise ValueError("Нужно указать ровно одно изменение: percent или amount")
+        products = _select(categories, where)
+        old_prices = list(map(_get_price, products))
+        if percent is not None:
+            new_prices = list(map(mul, old_prices, repeat(1 + percent / 100)))
+        else:
+            new_prices = list(map(add, old_prices, repeat(amount)))
+        if ndigits is not None:
+            new_prices = list(map(round, new_prices, repeat(ndigits)))
+
+        invalid = _invalid(products, old_prices, new_prices)
+        if invalid:
+            raise RepriceError("Цена не должна быть нулевая или отрицательная", invalid)
+        return self._apply(products, old_prices, new_prices, None)
+
+    def rollback(self, batch: Optional[RepriceBatch] = None) -> RepriceBatch:
+        """
+        Возвращает старые цены пакета (по умолчанию последнего не отменённого).
+
+        Если цена товара с тех пор менялась, откат отклоняется с RepriceError.
+        """
+        if batch is None:
+            batch = next(
+                (
+                    candidate
+                    for candidate in reversed(self._batches)
+                    if candidate.rollback_of is None and candidate.number not in self._rolled_back
+                ),
+                None,
+            )
+            if batch is None:
+                raise ValueError("В журнале нет изменений для отката")
+        elif batch.number in self._rolled_back:
+            raise ValueError(f"Изменение цен №{batch.number} уже отменено")
+
+        current = list(map(_get_price, batch.products))
+        if current != batch.new_prices:
+            conflicts = [
+                PriceChange(product, price, old_price)
+                for product, price, old_price, new_price in zip(
+                    batch.products, current, batch.old_prices, batch.new_prices
+                )
+                if price != new_price
+            ]
+            raise RepriceError("Цены изменились после пакета и не могут быть откачены", conflicts)
+        self._rolled_back.add(batch.number)
+        return self._apply(batch.products, batch.new_prices, batch.old_prices, batch.number)
+
+    def _apply(
+        self, products: List[Product], old_prices: List[float], new_prices: List[float], rollback_of: Optional[int]
+    ) -> RepriceBatch:
+        _write_prices(products, old_prices, new_prices)
+        batch = RepriceBatch(len(self._batches), products, old_prices, new_prices, rollback_of)
+        self._batches.append(batch)
+        return batch
+
+
+def reprice(
+    categories: Union[Category, Iterable[Category]],
+    percent: Optional[float] = None,
+    amount: Optional[float] = None,
+    where: Optional[Predicate] = None,
+    ndigits: Optional[int] = None,
+    journal: Optional[PriceJournal] = None,
+) -> RepriceBatch:
+    """Пакетно меняет цены; изменение записывается в journal (или в новый журнал)"""
+    return (journal or PriceJournal()).reprice(categories, percent, amount, where, ndigits)
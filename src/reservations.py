@@ -0,0 +1,179 @@
+"""
+Резервирование остатков товаров при оформлении заказов.
+
+reserve атомарно списывает со склада все позиции заказа: либо уменьшаются остатки всех
+товаров, либо (если хотя бы одного не хватает) не меняется ничего и вызывается
+ReservationError со списком нехватки. Остаток никогда не становится отрицательным.
+Резерв затем подтверждается (commit — товар продан) или снимается (release — остаток
+возвращается на склад).
+
+Товары защищены полосами блокировок: товар попадает в полосу по своему хэшу, заказ
+захватывает полосы своих товаров в порядке возрастания номера, поэтому заказы
+с разными товарами не ждут друг друга, а взаимные блокировки невозможны.
+Остатки меняются через сеттер quantity, так что агрегаты, индексы и подписчики
+категорий обновляются как обычно; уведомления одной категории сериализуются
+отдельной полосой блокировок категорий.
+
+Гарантия отсутствия перепродажи действует, пока остатки этих товаров меняются только
+через StockReservations (reserve, release, restock).
+"""
+import threading
+from itertools import count
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple, Union
+
+from src.classes import Category, Product
+from src.table import ProductView
+
+DEFAULT_STRIPES = 64
+
+Order = Union[Mapping[Product, int], Iterable[Tuple[Product, int]]]
+
+
+class ReservedItem(NamedTuple):
+    product: Product
+    quantity: int
+
+
+class Reservation(NamedTuple):
+    """Резерв заказа: номер и списанные позиции"""
+
+    number: int
+    items: Tuple[ReservedItem, ...]
+
+
+class Shortage(NamedTuple):
+    """Позиция, которой не хватило: запрошено requested, на складе available"""
+
+    product: Product
+    requested: int
+    available: int
+
+
+class ReservationError(ValueError):
+    """Заказ отклонён целиком; в shortages перечислены позиции, которых не хватает"""
+
+    def __init__(self, message: str, shortages: List[Shortage]):
+        super().__init__(f"{message}: {len(shortages)} шт.")
+        self.shortages = shortages
+
+
+def _order_items(order: Order) -> Dict[Product, int]:
+    """Проверяет позиции заказа и складывает количества повторяющихся товаров"""
+    items: Dict[Product, int] = {}
+    for product, quantity in order.items() if isinstance(order, Mapping) else order:
+        if not isinstance(product, Product):
+            raise TypeError("Резервировать можно только объекты класса Product или его наследников")
+        if type(quantity) is not int or quantity <= 0:
+            raise ValueError("Количество в заказе должно быть положительным целым числом")
+        items[product] = items.get(product, 0) + quantity
+    if not items:
+        raise ValueError("Заказ не содержит позиций")
+    return items
+
+
+def _owners(product: Product) -> Sequence[Category]:
+    """Категории, которые уведомляет сеттер quantity товара"""
+    if isinstance(product, ProductView):
+        return product._table._owners
+    owners = product._owners
+    if owners is None:
+        return ()
+    return owners if isinstance(owners, list) else (owners,)
+
+
+class StockReservations:
+    """Резервы заказов над товарами категорий с полосами блокировок по товарам"""
+
+    def __init__(self, stripes: int = DEFAULT_STRIPES):
+        if stripes < 1:
+            raise ValueError("Число полос блокировок должно быть положительным")
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._category_locks = [threading.Lock() for _ in range(stripes)]
+        self._numbers = count(1)
+        self._pending: Dict[int, Reservation] = {}
+
+    def _stripes(self, products: Iterable[Product]) -> List[threading.Lock]:
+        stripes = len(self._locks)
+        return [self._locks[stripe] for stripe in sorted({hash(product) % stripes for product in products})]
+
+    def _write(self, products: List[Product], quantities: List[int]) -> None:
+        """Записывает остатки; вызывается под блокировками полос этих товаров"""
+        # уведомления меняют агрегаты категорий, поэтому две полосы товаров
+        # не должны уведомлять одну категорию одновременно
+        stripes = len(self._category_locks)
+        owners = {id(owner) % stripes for product in products for owner in _owners(product)}
+        locks = [self._category_locks[stripe] for stripe in sorted(owners)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            for product, quantity in zip(products, quantities):
+                product.quantity = quantity
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def reserve(self, order: Order) -> Reservation:
+        """
+        Списывает позиции заказа {товар: количество} одним атомарным шагом.
+        Если хотя бы одной позиции не хватает, ничего не меняется и вызывается ReservationError.
+        """
+        items = _order_items(order)
+        locks = self._stripes(items)
+        for lock in locks:
+            lock.acquire()
+        try:
+            products = list(items)
+            remaining = [product.quantity - quantity for product, quantity in items.items()]
+            if min(remaining) < 0:
+                shortages = [
+                    Shortage(product, items[product], items[product] + left)
+                    for product, left in zip(products, remaining)
+                    if left < 0
+                ]
+                raise ReservationError("Недостаточно товара на складе", shortages)
+            self._write(products, remaining)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+        reservation = Reservation(next(self._numbers), tuple(map(ReservedItem._make, items.items())))
+        self._pending[reservation.number] = reservation
+        return reservation
+
+    def _close(self, reservation: Reservation) -> Reservation:
+        # dict.pop атомарен: подтвердить или снять резерв может только один поток
+        pending = self._pending.pop(reservation.number, None)
+        if pending is None:
+            raise ValueError(f"Резерв №{reservation.number} уже подтверждён или снят")
+        return pending
+
+    def commit(self, reservation: Reservation) -> None:
+        """Подтверждает резерв: списанный товар считается проданным"""
+        self._close(reservation)
+
+    def release(self, reservation: Reservation) -> None:
+        """Снимает резерв и возвращает его позиции на склад"""
+        pending = self._close(reservation)
+        self._restore(pending.items)
+
+    def _restore(self, items: Iterable[ReservedItem]) -> None:
+        items = list(items)
+        locks = self._stripes(item.product for item in items)
+        for lock in locks:
+            lock.acquire()
+        try:
+            self._write([item.product for item in items], [product.quantity + quantity for product, quantity in items])
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def restock(self, product: Product, quantity: int) -> None:
+        """Пополняет остаток товара на quantity шт."""
+        self._restore(map(ReservedItem._make, _order_items([(product, quantity)]).items()))
+
+    def pending(self) -> Tuple[Reservation, ...]:
+        """Резервы, которые ещё не подтверждены и не сняты"""
+        return tuple(self._pending.values())
+
+    def __len__(self) -> int:
+        return len(self._pending)
@@ -0,0 +1,462 @@
+"""
+Полнотекстовый и фасетный поиск по товарам категорий.
+
+SearchIndex хранит обратный индекс: для каждого слова из названий и описаний товаров
+и для каждого значения фасета (цвет, память, страна, ценовой диапазон, категория) —
+битовую карту номеров товаров в виде целого числа Python. Запрос сводится к операциям &
+и | над этими числами, а счётчик фасета — к (result & bitmap).bit_count(), поэтому даже
+на миллионах товаров ответ занимает миллисекунды независимо от числа найденных товаров.
+
+Изменение битовой карты копирует всё число, поэтому добавления и удаления сначала
+копятся в списке отложенных операций и применяются к карте одним проходом при первом
+запросе, который её использует.
+
+Индекс подписывается на категории через Category.add_listener и обновляется при
+add_product, remove_product и изменениях товаров. Сам индекс не защищён блокировкой:
+в многопоточном режиме запросы нужно согласовывать с писателями снаружи.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from functools import lru_cache
+from typing import (
+    Any,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from src.classes import Category, CategoryListener, Product
+
+# Границы ценовых диапазонов по умолчанию, руб.
+DEFAULT_PRICE_BANDS: Tuple[float, ...] = (1_000, 5_000, 10_000, 50_000, 100_000)
+
+FACETS = ("color", "memory", "country", "price_band", "category")
+# фасеты со свободным текстом, значения которых сравниваются без учёта регистра
+_TEXT_FACETS = frozenset(("color", "country"))
+
+_WORD = re.compile(r"[^\W_]+")
+_WORD_PARTS = re.compile(r"\d+|[^\W\d_]+")
+_MEMORY = re.compile(r"(\d+)\s*(?:gb|гб)(?![^\W\d_])", re.IGNORECASE)
+_COLOR = re.compile(r"([^\W\d_]+)\s+цвет", re.IGNORECASE)
+_NONZERO = re.compile(rb"[^\x00]+")
+
+# номера установленных битов для каждого значения байта
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+# ключ битовой карты: слово текста или пара (фасет, значение)
+Key = Union[str, Tuple[str, Any]]
+
+# ключ карты всех проиндексированных товаров
+_ALL: Key = ("", None)
+
+# Сколько отложенных операций применяется к карте по одной; больше — одной маской
+_DIRECT_OPS = 8
+# С какого размера пакет добавлений применяется к карте сразу, а не при запросе
+_EAGER_OPS = 1024
+
+
+def _fold(text: str) -> str:
+    """Приводит текст к виду для сравнения: нижний регистр, «ё» как «е»"""
+    return text.casefold().replace("ё", "е")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Слова текста для индекса: буквы любого алфавита (в том числе кириллица) и цифры.
+    У слов из цифр и букв вроде «256GB» в индекс попадают и части: «256» и «gb».
+    """
+    tokens = []
+    for word in _WORD.findall(_fold(text)):
+        tokens.append(word)
+        if not word.isalpha() and not word.isdigit():
+            tokens.extend(_WORD_PARTS.findall(word))
+    return tokens
+
+
+@lru_cache(maxsize=4096)
+def _index_tokens(text: str) -> FrozenSet[str]:
+    """Множество слов текста для индекса: то же, что tokenize, но без цикла по словам"""
+    folded = _fold(text)
+    return frozenset(_WORD.findall(folded)).union(_WORD_PARTS.findall(folded))
+
+
+@lru_cache(maxsize=4096)
+def _facet_value(value: Any) -> Any:
+    """Значение цвета или страны без учёта регистра и пробелов по краям: « серый » -> «Серый»"""
+    if isinstance(value, str):
+        return _fold(value.strip()).capitalize()
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _description_facets(description: str) -> Tuple[Optional[str], Optional[int]]:
+    """Цвет и объём памяти, упомянутые в описании товара"""
+    color = _COLOR.search(description)
+    memory = _MEMORY.search(description)
+    return (
+        _facet_value(color.group(1)) if color else None,
+        int(memory.group(1)) if memory else None,
+    )
+
+
+@lru_cache(maxsize=None)
+def _facet_attributes(cls: type) -> Tuple[bool, bool, bool]:
+    """Есть ли у класса товара атрибуты color, memory и country"""
+    return hasattr(cls, "color"), hasattr(cls, "memory"), hasattr(cls, "country")
+
+
+def price_band_labels(bounds: Sequence[float]) -> List[str]:
+    """Названия диапазонов для границ bounds: «до 1000», «1000–5000», ..., «от 100000»"""
+    numbers = [f"{bound:g}" for bound in bounds]
+    if not numbers:
+        return ["любая"]
+    return (
+        [f"до {numbers[0]}"]
+        + [f"{low}–{high}" for low, high in zip(numbers, numbers[1:])]
+        + [f"от {numbers[-1]}"]
+    )
+
+
+class SearchResult(NamedTuple):
+    """Результат запроса: число найденных товаров, товары и счётчики фасетов по найденному"""
+
+    total: int
+    products: List[Product]
+    facets: Dict[str, Dict[Any, int]]
+
+
+class _Document:
+    """Проиндексированное состояние товара: по нему индекс убирает старые записи"""
+
+    __slots__ = ("product", "text", "values", "categories")
+
+    def __init__(self, product: Product):
+        self.product = product
+        self.text: Tuple[str, str] = ("", "")
+        self.values: Tuple[Any, ...] = ()
+        self.categories: List[Category] = []
+
+
+class SearchIndex(CategoryListener):
+    """
+    Обратный индекс товаров категорий с фасетами color, memory, country, price_band и category.
+
+    Значения фасетов берутся из атрибутов товара (Smartphone.memory и color, LawnGrass.country
+    и color), а если их нет — из описания: «256GB» даёт память 256, «Серый цвет» — цвет «Серый».
+    Номера товаров не переиспользуются: после массовых удалений индекс выгоднее построить заново.
+    """
+
+    def __init__(self, categories: Iterable[Category] = (), price_bands: Sequence[float] = DEFAULT_PRICE_BANDS):
+        self.price_bands = tuple(price_bands)
+        self._band_labels = price_band_labels(self.price_bands)
+        self._next_doc = 0
+        self._doc_of: Dict[Product, int] = {}
+        self._documents: Dict[int, _Document] = {}
+        # ключ карты: слово (str) или пара (фасет, значение)
+        self._bits: Dict[Key, int] = {}
+        self._pending: Dict[Key, List[int]] = {}
+        self._sizes: Dict[Key, int] = {}
+        self._facet_values: Dict[str, Set[Any]] = {facet: set() for facet in FACETS}
+        self._vocabulary: Optional[List[str]] = None
+        self._categories: List[Category] = []
+        for category in categories:
+            self.add_category(category)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add_category(self, category: Category) -> None:
+        """Индексирует товары категории и подписывается на её изменения"""
+        if any(existing is category for existing in self._categories):
+            return
+        self._categories.append(category)
+        category.add_listener(self)
+
+    def remove_category(self, category: Category) -> None:
+        """Убирает товары категории из индекса и отписывается от неё"""
+        category.remove_listener(self)
+        self._categories = [existing for existing in self._categories if existing is not category]
+        for product in list(category._products):
+            self.product_removed(category, product)
+
+    # Уведомления от категорий
+
+    def products_added(self, category: Category, products: List[Product]) -> None:
+        """Новые товары индексируются пакетом: номера копятся по ключам и добавляются к картам один раз"""
+        additions: DefaultDict[Key, List[int]] = defaultdict(list)
+        category_key = ("category", category.name)
+        doc_of, documents = self._doc_of, self._documents
+        for product in products:
+            doc = doc_of.get(product)
+            if doc is not None:
+                self._add_owner(category, doc)
+                continue
+            doc = doc_of[product] = self._next_doc
+            self._next_doc += 1
+            document = documents[doc] = _Document(product)
+            document.categories.append(category)
+            name, description = document.text = (product.name, product.description)
+            # описания у товаров часто совпадают, поэтому их слова берутся из кэша
+            keys: Set[Key] = set(_index_tokens(description))
+            keys.update(_index_tokens(name))
+            values = document.values = self._facet_values_of(product)
+            for facet, value in zip(FACETS, values):
+                if value is not None:
+                    keys.add((facet, value))
+            keys.add(category_key)
+            keys.add(_ALL)
+            for key in keys:
+                additions[key].append(doc)
+        for key, docs in additions.items():
+            self._post(key, docs)
+            if len(docs) > _EAGER_OPS:
+                # большой пакет применяется сразу, чтобы первый запрос не платил за сборку карт
+                self._bitmap(key)
+
+    def product_added(self, category: Category, product: Product) -> None:
+        doc = self._doc_of.get(product)
+        if doc is None:
+            self.products_added(category, [product])
+        else:
+            self._add_owner(category, doc)
+
+    def _add_owner(self, category: Category, doc: int) -> None:
+        """Товар, уже бывший в индексе, добавлен ещё в одну категорию"""
+        document = self._documents[doc]
+        if not any(owner.name == category.name for owner in document.categories):
+            self._post(("category", category.name), [doc])
+        document.categories.append(category)
+        self._refresh(doc, document)
+
+    def product_removed(self, category: Category, product: Product) -> None:
+        doc = self._doc_of.get(product)
+        if doc is None:
+            return
+        document = self._documents[doc]
+        for position, owner in enumerate(document.categories):
+            if owner is category:
+                del document.categories[position]
+                break
+        else:
+            return
+        if not any(owner.name == category.name for owner in document.categories):
+            self._unpost(("category", category.name), doc)
+        if document.categories:
+            return
+
+        # товар больше не входит ни в одну категорию индекса
+        for token in _index_tokens(document.text[0]) | _index_tokens(document.text[1]):
+            self._unpost(token, doc)
+        for facet, value in zip(FACETS, document.values):
+            if value is not None:
+                self._unpost((facet, value), doc)
+        self._unpost(_ALL, doc)
+        del self._documents[doc]
+        del self._doc_of[product]
+
+    def product_changed(self, category: Category, product: Product) -> None:
+        doc = self._doc_of.get(product)
+        if doc is not None:
+            self._refresh(doc, self._documents[doc])
+
+    # Построение записей
+
+    def _facet_values_of(self, product: Product) -> Tuple[Any, ...]:
+        has_color, has_memory, has_country = _facet_attributes(type(product))
+        color, memory = _description_facets(product.description)
+        # поля есть только у некоторых наследников Product, поэтому читаются через getattr
+        if has_color:
+            color = _facet_value(getattr(product, "color"))
+        if has_memory:
+            memory = getattr(product, "memory")
+        country = _facet_value(getattr(product, "country")) if has_country else None
+        band = self._band_labels[bisect_right(self.price_bands, product.price)]
+        return color, memory, country, band
+
+    def _refresh(self, doc: int, document: _Document) -> None:
+        """Приводит записи индекса для товара к его текущему состоянию"""
+        product = document.product
+        text = (product.name, product.description)
+        if text != document.text:
+            old_tokens = _index_tokens(document.text[0]) | _index_tokens(document.text[1])
+            new_tokens = _index_tokens(text[0]) | _index_tokens(text[1])
+            for token in old_tokens - new_tokens:
+                self._unpost(token, doc)
+            for token in new_tokens - old_tokens:
+                self._post(token, [doc])
+            document.text = text
+
+        values = self._facet_values_of(product)
+        if values != document.values:
+            for facet, old, new in zip(FACETS, document.values or (None,) * len(values), values):
+                if old != new:
+                    if old is not None:
+                        self._unpost((facet, old), doc)
+                    if new is not None:
+                        self._post((facet, new), [doc])
+            document.values = values
+
+    def _post(self, key: Key, docs: List[int]) -> None:
+        """Добавляет товары docs в карту key; список docs переходит во владение индекса"""
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = docs
+        else:
+            pending.extend(docs)
+        size = self._sizes.get(key, 0)
+        self._sizes[key] = size + len(docs)
+        if not size:
+            if isinstance(key, str):
+                self._vocabulary = None
+            elif key is not _ALL:
+                self._facet_values[key[0]].add(key[1])
+
+    def _unpost(self, key: Key, doc: int) -> None:
+        size = self._sizes[key] - 1
+        if size:
+            self._sizes[key] = size
+            self._pending.setdefault(key, []).append(~doc)
+            return
+        # карта опустела: ключ удаляется целиком
+        del self._sizes[key]
+        self._bits.pop(key, None)
+        self._pending.pop(key, None)
+        if isinstance(key, str):
+            self._vocabulary = None
+        elif key is not _ALL:
+            self._facet_values[key[0]].discard(key[1])
+
+    def _bitmap(self, key: Key) -> int:
+        """Битовая карта ключа с применёнными отложенными операциями"""
+        bits = self._bits.get(key, 0)
+        ops = self._pending.pop(key, None)
+        if not ops:
+            return bits
+        if len(ops) <= _DIRECT_OPS:
+            for op in ops:
+                bits = bits | (1 << op) if op >= 0 else bits & ~(1 << ~op)
+        else:
+            if min(ops) >= 0:
+                added, removed = ops, []
+            else:
+                # для товара важна только последняя операция
+                state = {op if op >= 0 else ~op: op >= 0 for op in ops}
+                added = [doc for doc, present in state.items() if present]
+                removed = [doc for doc, present in state.items() if not present]
+            size = (self._next_doc + 7) >> 3
+            bits = (bits | _mask(added, size)) & ~_mask(removed, size)
+        self._bits[key] = bits
+        return bits
+
+    # Запросы
+
+    def _term_bits(self, term: str) -> int:
+        """Карта товаров со словом term; слово с «*» на конце ищется как префикс («сер*»)"""
+        if not term.endswith("*"):
+            return self._bitmap(term) if term in self._sizes else 0
+        prefix = term[:-1]
+        if self._vocabulary is None:
+            self._vocabulary = sorted(key for key in self._sizes if isinstance(key, str))
+        vocabulary = self._vocabulary
+        bits = 0
+        for word in vocabulary[bisect_left(vocabulary, prefix):]:
+            if not word.startswith(prefix):
+                break
+            bits |= self._bitmap(word)
+        return bits
+
+    def _query_terms(self, text: str) -> List[str]:
+        terms = []
+        for part in text.split():
+            if part.endswith("*") and len(part) > 1:
+                words = tokenize(part[:-1])
+                terms.extend(words[:-1])
+                if words:
+                    terms.append(words[-1] + "*")
+            else:
+                terms.extend(tokenize(part))
+        return list(dict.fromkeys(terms))
+
+    def _match(self, text: str, filters: Dict[str, Any]) -> int:
+        bits = self._bitmap(_ALL)
+        for term in self._query_terms(text):
+            if not bits:
+                return 0
+            bits &= self._term_bits(term)
+        for facet, wanted in filters.items():
+            if facet not in self._facet_values:
+                raise ValueError(f"Неизвестный фасет: {facet}")
+            if not isinstance(wanted, (list, tuple, set, frozenset)):
+                wanted = (wanted,)
+            allowed = 0
+            for value in wanted:
+                key = (facet, _facet_value(value) if facet in _TEXT_FACETS else value)
+                if key in self._sizes:
+                    allowed |= self._bitmap(key)
+            bits &= allowed
+        return bits
+
+    def facet_counts(self, text: str = "", **filters: Any) -> Dict[str, Dict[Any, int]]:
+        """Число товаров с каждым значением фасетов среди подходящих под запрос (по умолчанию — среди всех)"""
+        return self._facet_counts(self._match(text, filters))
+
+    def _facet_counts(self, bits: int) -> Dict[str, Dict[Any, int]]:
+        everything = bits == self._bitmap(_ALL)
+        counts: Dict[str, Dict[Any, int]] = {}
+        for facet, values in self._facet_values.items():
+            facet_counts = counts[facet] = {}
+            for value in values:
+                key = (facet, value)
+                count = self._sizes[key] if everything else (bits & self._bitmap(key)).bit_count()
+                if count:
+                    facet_counts[value] = count
+        return counts
+
+    def search(self, text: str = "", limit: Optional[int] = None, **filters: Any) -> SearchResult:
+        """
+        Ищет товары по словам text и фильтрам фасетов (color, memory, country, price_band, category).
+        Значение фильтра — одно значение или список допустимых значений.
+
+        Товары возвращаются в порядке индексации, не больше limit; счётчики фасетов
+        считаются по всем найденным товарам.
+        """
+        bits = self._match(text, filters)
+        documents = self._documents
+        return SearchResult(
+            bits.bit_count(),
+            [documents[doc].product for doc in _set_bits(bits, limit)],
+            self._facet_counts(bits),
+        )
+
+
+def _mask(docs: Iterable[int], size: int) -> int:
+    """Число с установленными битами docs; size — длина маски в байтах"""
+    mask = bytearray(size)
+    for doc in docs:
+        mask[doc >> 3] |= 1 << (doc & 7)
+    return int.from_bytes(mask, "little")
+
+
+def _set_bits(bits: int, limit: Optional[int] = None) -> List[int]:
+    """Номера установленных битов по возрастанию, не больше limit"""
+    if limit is not None and limit <= 0:
+        return []
+    data = bits.to_bytes((bits.bit_length() + 7) >> 3, "little")
+    docs: List[int] = []
+    for run in _NONZERO.finditer(data):
+        start = run.start()
+        for offset, byte in enumerate(run.group(), start):
+            base = offset << 3
+            docs.extend(base + bit for bit in _BYTE_BITS[byte])
+            if limit is not None and len(docs) >= limit:
+                return docs[:limit]
+    return docs
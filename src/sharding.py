@@ -0,0 +1,682 @@
+"""
+Каталог, разделённый между процессами-шардами.
+
+Каждый шард — отдельный процесс, которому принадлежит часть категорий: в нём живут объекты
+Category и Product, и только он их изменяет. Цены, остатки и агрегаты категорий шард
+зеркалирует в сегмент разделяемой памяти (multiprocessing.shared_memory), подписавшись
+на свои категории через Category.add_listener. Поэтому читатели в любом процессе считают
+middle_price, общий остаток, стоимость остатка и сумму двух товаров, как Product.__add__,
+прямо по колонкам, без обращения к шарду и без копирования объектов Product.
+
+Раскладка сегмента данных шарда (все значения по 8 байт):
+
+    заголовок      ёмкость, занято строк, число категорий, резерв
+    агрегаты       количество, сумма цен, общий остаток, стоимость остатка — по категориям
+    колонки        цена, остаток, номер категории (-1 — свободная строка), код типа — по строкам
+
+Сегмент управления шарда фиксированного размера хранит счётчик записи и имя текущего
+сегмента данных. Шард делает счётчик нечётным на время записи, а читатель повторяет
+чтение, если счётчик был нечётным или изменился (seqlock), поэтому никогда не видит
+частично применённую запись. Когда строки заканчиваются, шард создаёт сегмент данных
+вдвое больше и публикует его имя; читатели переподключаются к нему при следующем чтении.
+
+Все записи идут через координатор ShardedCatalog, который пересылает их шарду-владельцу
+категории. Для других процессов координатор отдаёт описание descriptor, по которому
+CatalogReader подключается к тем же сегментам.
+"""
+import math
+import multiprocessing
+import struct
+import sys
+import threading
+import time
+import zlib
+from itertools import compress, repeat
+from multiprocessing import shared_memory
+from operator import eq, mul
+from typing import Any, Callable, Dict, List, Literal, Mapping, NamedTuple, Optional, Sequence, Tuple, TypeVar, Union
+
+from src.classes import Category, CategoryListener, Product
+from src.registry import product_registry
+from src.utils import DEFAULT_DATA_PATH, build_category, iter_raw_categories
+
+_CONTROL = struct.Struct("<qq64s")
+_HEADER_FIELDS = 4
+_FREE_ROW = -1
+
+# Запас строк шарда сверх начального числа товаров
+MIN_SPARE_ROWS = 1024
+
+_T = TypeVar("_T")
+
+
+class ProductRef(NamedTuple):
+    """Адрес товара в разделяемой памяти: категория, шард и строка в колонках шарда"""
+
+    category: str
+    shard: int
+    row: int
+
+
+class CatalogDescriptor(NamedTuple):
+    """Всё, что нужно другому процессу для чтения каталога: сегменты управления и номера категорий"""
+
+    control_names: Tuple[str, ...]
+    categories: Dict[str, Tuple[int, int]]
+
+
+_type_codes: Dict[type, int] = {}
+
+
+def _type_code(product: Product) -> int:
+    """Код класса товара, одинаковый во всех процессах"""
+    cls = type(product)
+    code = _type_codes.get(cls)
+    if code is None:
+        code = _type_codes[cls] = zlib.crc32(f"{cls.__module__}.{cls.__qualname__}".encode())
+    return code
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Подключается к чужому сегменту так, чтобы при выходе процесса он не был удалён"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # до Python 3.13 параметра track нет: снимаем сегмент с учёта resource_tracker вручную
+    from multiprocessing import resource_tracker
+
+    memory = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(getattr(memory, "_name"), "shared_memory")
+    return memory
+
+
+def _buffer(memory: shared_memory.SharedMemory) -> memoryview:
+    """Буфер сегмента; у закрытого сегмента его нет"""
+    buffer = memory.buf
+    if buffer is None:
+        raise ValueError(f"Сегмент {memory.name} закрыт")
+    return buffer
+
+
+class _Columns:
+    """Представления колонок поверх сегмента данных шарда"""
+
+    def __init__(self, memory: shared_memory.SharedMemory):
+        self.memory = memory
+        buffer = _buffer(memory)
+        header = buffer[:_HEADER_FIELDS * 8].cast("q")
+        self.header = header
+        self.capacity, categories = header[0], header[2]
+        offset = _HEADER_FIELDS * 8
+        views: List["memoryview[Any]"] = []
+        layout: List[Tuple[Literal["q", "d"], int]] = [
+            ("q", categories),
+            ("d", categories),
+            ("q", categories),
+            ("d", categories),
+            ("d", self.capacity),
+            ("q", self.capacity),
+            ("q", self.capacity),
+            ("q", self.capacity),
+        ]
+        for code, size in layout:
+            views.append(buffer[offset:offset + size * 8].cast(code))
+            offset += size * 8
+        (
+            self.counts,
+            self.price_sums,
+            self.quantity_sums,
+            self.stock_values,
+            self.prices,
+            self.quantities,
+            self.categories,
+            self.types,
+        ) = views
+        self._views = [header] + views
+
+    @staticmethod
+    def size(capacity: int, categories: int) -> int:
+        return (_HEADER_FIELDS + 4 * categories + 4 * capacity) * 8
+
+    def release(self) -> None:
+        for view in self._views:
+            view.release()
+        self._views = []
+        self.memory.close()
+
+
+class _ShardStore(CategoryListener):
+    """
+    Зеркало категорий шарда в разделяемой памяти. Работает в процессе шарда и получает
+    уведомления от его категорий; каждая запись выполняется под seqlock сегмента управления.
+    """
+
+    def __init__(self, categories: List[Category], spare_rows: int = MIN_SPARE_ROWS):
+        self.categories = categories
+        self._slot_of = {id(category): slot for slot, category in enumerate(categories)}
+        self._rows: List[Dict[Product, int]] = [{} for _ in categories]
+        self._free: List[int] = []
+        self._used = 0
+        self._generation = 0
+        self.control = shared_memory.SharedMemory(create=True, size=_CONTROL.size)
+        self._control = _buffer(self.control)[:16].cast("q")
+        capacity = sum(len(category._products) for category in categories) + max(spare_rows, 1)
+        self._columns = self._create(capacity)
+        self._publish_name()
+        self._begin()
+        try:
+            for category in categories:
+                category.add_listener(self)
+        finally:
+            self._end()
+
+    # seqlock
+
+    def _begin(self) -> None:
+        self._control[0] += 1
+
+    def _end(self) -> None:
+        self._control[0] += 1
+
+    def _publish_name(self) -> None:
+        self._control[1] = self._generation
+        name = self._columns.memory.name.encode()
+        _buffer(self.control)[16:16 + 64] = name.ljust(64, b"\0")
+
+    # Сегмент данных
+
+    def _create(self, capacity: int) -> _Columns:
+        categories = len(self.categories)
+        memory = shared_memory.SharedMemory(create=True, size=_Columns.size(capacity, categories))
+        header = _buffer(memory)[:_HEADER_FIELDS * 8].cast("q")
+        header[0], header[1], header[2] = capacity, self._used, categories
+        header.release()
+        columns = _Columns(memory)
+        columns.categories[:] = memoryview(bytes(b"\xff" * capacity * 8)).cast("q")
+        return columns
+
+    def _grow(self) -> None:
+        """Переносит колонки в сегмент вдвое больше; вызывается внутри записи"""
+        old = self._columns
+        new = self._create(old.capacity * 2)
+        for name in ("counts", "price_sums", "quantity_sums", "stock_values"):
+            getattr(new, name)[:] = getattr(old, name)
+        rows = old.capacity
+        for name in ("prices", "quantities", "categories", "types"):
+            getattr(new, name)[:rows] = getattr(old, name)
+        self._columns = new
+        self._generation += 1
+        self._publish_name()
+        old.release()
+        old.memory.unlink()
+
+    def _take_row(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._used == self._columns.capacity:
+            self._grow()
+        row = self._used
+        self._used += 1
+        self._columns.header[1] = self._used
+        return row
+
+    def _write_row(self, row: int, slot: int, product: Product) -> None:
+        columns = self._columns
+        columns.prices[row] = product.price
+        columns.quantities[row] = product.quantity
+        columns.categories[row] = slot
+        columns.types[row] = _type_code(product)
+
+    def _write_totals(self, slot: int, category: Category) -> None:
+        columns = self._columns
+        columns.counts[slot] = category._count
+        columns.price_sums[slot] = category._price_sum
+        columns.quantity_sums[slot] = category._quantity_sum
+        columns.stock_values[slot] = category._stock_value
+
+    # Уведомления от категорий
+
+    def products_added(self, category: Category, products: List[Product]) -> None:
+        slot = self._slot_of[id(category)]
+        rows = self._rows[slot]
+        self._begin()
+        try:
+            for product in products:
+                row = rows[product] = self._take_row()
+                self._write_row(row, slot, product)
+            self._write_totals(slot, category)
+        finally:
+            self._end()
+
+    def product_added(self, category: Category, product: Product) -> None:
+        self.products_added(category, [product])
+
+    def product_removed(self, category: Category, product: Product) -> None:
+        slot = self._slot_of[id(category)]
+        self._begin()
+        try:
+            row = self._rows[slot].pop(product)
+            self._columns.categories[row] = _FREE_ROW
+            self._free.append(row)
+            self._write_totals(slot, category)
+        finally:
+            self._end()
+
+    def product_changed(self, category: Category, product: Product) -> None:
+        self.prices_changed(category, [product])
+
+    def prices_changed(self, category: Category, products: List[Product]) -> None:
+        slot = self._slot_of[id(category)]
+        rows = self._rows[slot]
+        columns = self._columns
+        self._begin()
+        try:
+            for product in products:
+                row = rows[product]
+                columns.prices[row] = product.price
+                columns.quantities[row] = product.quantity
+            self._write_totals(slot, category)
+        finally:
+            self._end()
+
+    def row_of(self, slot: int, product: Product) -> int:
+        return self._rows[slot][product]
+
+    def close(self) -> None:
+        self._columns.release()
+        self._columns.memory.unlink()
+        self._control.release()
+        self.control.close()
+        self.control.unlink()
+
+
+class _Shard:
+    """Состояние процесса шарда: его категории, зеркало в разделяемой памяти и обработчики команд"""
+
+    def __init__(self, categories: List[Category], spare_rows: int):
+        self.categories = categories
+        self.by_name = {category.name: slot for slot, category in enumerate(categories)}
+        self.store = _ShardStore(categories, spare_rows)
+
+    def _category(self, name: str) -> Category:
+        return self.categories[self.by_name[name]]
+
+    def _product(self, category: Category, product_name: str) -> Product:
+        # индекс по названию строится при первом запросе и дальше обновляется категорией
+        found = category.find_by_name(product_name)
+        if not found:
+            raise KeyError(f"В категории {category.name} нет товара {product_name}")
+        return found[0]
+
+    def describe(self) -> Tuple[str, List[str]]:
+        return self.store.control.name, [category.name for category in self.categories]
+
+    def add_product(self, name: str, product: Union[Product, Mapping[str, Any]]) -> int:
+        if not isinstance(product, Product):
+            product = product_registry.build(product)
+        category = self._category(name)
+        category.add_product(product)
+        return self.store.row_of(self.by_name[name], category._products[-1])
+
+    def remove_product(self, name: str, product_name: str) -> None:
+        category = self._category(name)
+        category.remove_product(self._product(category, product_name))
+
+    def set_price(self, name: str, product_name: str, price: float) -> None:
+        # сеттер только печатает предупреждение, а координатор должен получить ошибку
+        if not price > 0:
+            raise ValueError("Цена не должна быть нулевая или отрицательная")
+        self._product(self._category(name), product_name).price = price
+
+    def set_quantity(self, name: str, product_name: str, quantity: int) -> None:
+        if type(quantity) is not int or quantity < 0:
+            raise ValueError(f"Остаток товара должен быть неотрицательным целым числом: {quantity!r}")
+        self._product(self._category(name), product_name).quantity = quantity
+
+    def find(self, name: str, product_name: str) -> List[int]:
+        slot = self.by_name[name]
+        return [self.store.row_of(slot, product) for product in self.categories[slot].find_by_name(product_name)]
+
+    def products(self, name: str) -> List[str]:
+        return self._category(name).products
+
+
+def _load_shard_categories(path: str, shard: int, shards: int) -> List[Category]:
+    """Категории файла, принадлежащие шарду: каждая shards-я, начиная с номера shard"""
+    return [
+        build_category(category_data)
+        for number, category_data in enumerate(iter_raw_categories(path))
+        if number % shards == shard
+    ]
+
+
+def _serve(
+    connection: Any, build: Callable[..., List[Category]], build_args: Tuple[Any, ...], spare_rows: int
+) -> None:
+    """Цикл процесса шарда: выполняет команды координатора, пока не получит None"""
+    try:
+        shard = _Shard(build(*build_args), spare_rows)
+    except BaseException as error:
+        connection.send((False, error))
+        return
+    connection.send((True, shard.describe()))
+    try:
+        while True:
+            command = connection.recv()
+            if command is None:
+                break
+            method, args = command
+            try:
+                connection.send((True, getattr(shard, method)(*args)))
+            except Exception as error:
+                connection.send((False, error))
+    finally:
+        shard.store.close()
+        connection.close()
+
+
+def _own_categories(categories: List[Category]) -> List[Category]:
+    return categories
+
+
+class _ShardView:
+    """Подключение читателя к сегментам одного шарда"""
+
+    def __init__(self, control_name: str):
+        self.control = _attach_shared_memory(control_name)
+        self.state = _buffer(self.control)[:16].cast("q")
+        self.generation: Optional[int] = None
+        self.columns: Optional[_Columns] = None
+
+    def read(self, function: Callable[[_Columns], _T]) -> _T:
+        """Выполняет function над согласованным состоянием колонок (seqlock)"""
+        state = self.state
+        while True:
+            sequence = state[0]
+            if sequence & 1:
+                # шард посередине записи: уступаем ему процессор
+                time.sleep(0)
+                continue
+            try:
+                columns = self.columns
+                if state[1] != self.generation or columns is None:
+                    columns = self._reattach()
+                result = function(columns)
+            except (FileNotFoundError, IndexError, ValueError):
+                # сегмент заменён во время чтения: шард уже публикует новый
+                if state[0] == sequence:
+                    raise
+                continue
+            if state[0] == sequence:
+                return result
+
+    def _reattach(self) -> _Columns:
+        if self.columns is not None:
+            self.columns.release()
+            self.columns = None
+        generation = self.state[1]
+        name = bytes(_buffer(self.control)[16:16 + 64]).rstrip(b"\0").decode()
+        columns = self.columns = _Columns(_attach_shared_memory(name))
+        self.generation = generation
+        return columns
+
+    def close(self) -> None:
+        if self.columns is not None:
+            self.columns.release()
+            self.columns = None
+        self.state.release()
+        self.control.close()
+
+
+def _category_rows(columns: _Columns, slot: int) -> Tuple[List[float], List[int], List[int]]:
+    used = columns.header[1]
+    selected = list(map(eq, columns.categories[:used], repeat(slot)))
+    return (
+        list(compress(columns.prices[:used], selected)),
+        list(compress(columns.quantities[:used], selected)),
+        list(compress(columns.types[:used], selected)),
+    )
+
+
+class CatalogReader:
+    """
+    Чтение каталога по разделяемой памяти шардов в любом процессе.
+
+    Все методы работают только с колонками и агрегатами в разделяемой памяти
+    и не обращаются к процессам шардов.
+    """
+
+    def __init__(self, descriptor: CatalogDescriptor):
+        self.descriptor = descriptor
+        self._shards = [_ShardView(name) for name in descriptor.control_names]
+
+    def _locate(self, category: str) -> Tuple[_ShardView, int]:
+        try:
+            shard, slot = self.descriptor.categories[category]
+        except KeyError:
+            raise KeyError(f"Категория {category} не найдена") from None
+        return self._shards[shard], slot
+
+    @property
+    def category_names(self) -> List[str]:
+        return list(self.descriptor.categories)
+
+    def totals(self, category: str) -> Tuple[int, float, int, float]:
+        """Количество товаров, сумма цен, общий остаток и стоимость остатка категории"""
+        shard, slot = self._locate(category)
+        return shard.read(
+            lambda columns: (
+                columns.counts[slot],
+                columns.price_sums[slot],
+                columns.quantity_sums[slot],
+                columns.stock_values[slot],
+            )
+        )
+
+    def middle_price(self, category: str) -> float:
+        count, price_sum, _, _ = self.totals(category)
+        return price_sum / count if count else 0
+
+    def total_quantity(self, category: str) -> int:
+        return self.totals(category)[2]
+
+    def stock_value(self, category: str) -> float:
+        return self.totals(category)[3]
+
+    def valuation(self, category: str) -> float:
+        """
+        Стоимость остатка категории, пересчитанная по колонкам цен и остатков (как сумма
+        Product.__add__ по парам товаров); товары разных классов вызывают TypeError.
+        """
+        shard, slot = self._locate(category)
+        prices, quantities, types = shard.read(lambda columns: _category_rows(columns, slot))
+        if len(set(types)) > 1:
+            raise TypeError("Можно складывать только товары одного типа")
+        return math.fsum(map(mul, prices, quantities))
+
+    def add(self, first: ProductRef, second: ProductRef) -> float:
+        """То же, что first + second для товаров: price * quantity двух товаров одного типа"""
+
+        def read(ref: ProductRef) -> Tuple[float, int, int, int]:
+            return self._shards[ref.shard].read(
+                lambda columns: (
+                    columns.prices[ref.row],
+                    columns.quantities[ref.row],
+                    columns.types[ref.row],
+                    columns.categories[ref.row],
+                )
+            )
+
+        first_price, first_quantity, first_type, first_slot = read(first)
+        second_price, second_quantity, second_type, second_slot = read(second)
+        if first_slot == _FREE_ROW or second_slot == _FREE_ROW:
+            raise LookupError("Товар удалён из каталога")
+        if first_type != second_type:
+            raise TypeError("Можно складывать только товары одного типа")
+        return first_price * first_quantity + second_price * second_quantity
+
+    def close(self) -> None:
+        for shard in self._shards:
+            shard.close()
+        self._shards = []
+
+    def __enter__(self) -> "CatalogReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ShardedCatalog:
+    """
+    Координатор каталога, разделённого между процессами-шардами.
+
+    Категории распределяются по шардам при создании. Записи (add_product, remove_product,
+    set_price, set_quantity) координатор пересылает шарду-владельцу категории и ждёт
+    ответа; чтения по ценам и остаткам выполняются через CatalogReader без обращения к шардам.
+    Товар внутри категории указывается по названию.
+    """
+
+    def __init__(
+        self,
+        categories: Sequence[Category] = (),
+        shards: Optional[int] = None,
+        spare_rows: int = MIN_SPARE_ROWS,
+        _builds: Optional[List[Tuple[Callable[..., List[Category]], Tuple[Any, ...]]]] = None,
+    ):
+        if _builds is None:
+            shards = max(1, min(shards or multiprocessing.cpu_count(), len(categories) or 1))
+            # жадное распределение: следующая по размеру категория уходит в наименее загруженный шард
+            parts: List[List[Category]] = [[] for _ in range(shards)]
+            loads = [0] * shards
+            for category in sorted(categories, key=lambda item: len(item._products), reverse=True):
+                lightest = loads.index(min(loads))
+                parts[lightest].append(category)
+                loads[lightest] += len(category._products)
+            _builds = [(_own_categories, (part,)) for part in parts]
+
+        self._connections: List[Any] = []
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+        self._locks: List[threading.Lock] = []
+        control_names: List[str] = []
+        directory: Dict[str, Tuple[int, int]] = {}
+        try:
+            for number, (build, args) in enumerate(_builds):
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_serve, args=(child, build, args, spare_rows), name=f"shard-{number}", daemon=True
+                )
+                process.start()
+                child.close()
+                self._connections.append(parent)
+                self._processes.append(process)
+                self._locks.append(threading.Lock())
+            for number, connection in enumerate(self._connections):
+                control_name, names = self._receive(connection)
+                control_names.append(control_name)
+                for slot, name in enumerate(names):
+                    if name in directory:
+                        raise ValueError(f"Категория {name} встречается в каталоге дважды")
+                    directory[name] = (number, slot)
+        except BaseException:
+            self.close()
+            raise
+        self.descriptor = CatalogDescriptor(tuple(control_names), directory)
+        self.reader = CatalogReader(self.descriptor)
+
+    @classmethod
+    def from_json(
+        cls, path: str = DEFAULT_DATA_PATH, shards: Optional[int] = None, **options: Any
+    ) -> "ShardedCatalog":
+        """Каждый шард сам читает файл и создаёт только свои категории"""
+        shards = max(1, shards or multiprocessing.cpu_count())
+        builds = [(_load_shard_categories, (path, shard, shards)) for shard in range(shards)]
+        return cls(_builds=builds, **options)
+
+    @staticmethod
+    def _receive(connection: Any) -> Any:
+        ok, value = connection.recv()
+        if not ok:
+            raise value
+        return value
+
+    def _shard_of(self, category: str) -> int:
+        try:
+            return self.descriptor.categories[category][0]
+        except KeyError:
+            raise KeyError(f"Категория {category} не найдена") from None
+
+    def _call(self, category: str, method: str, *args: Any) -> Any:
+        shard = self._shard_of(category)
+        with self._locks[shard]:
+            connection = self._connections[shard]
+            connection.send((method, (category,) + args))
+            return self._receive(connection)
+
+    # Записи
+
+    def add_product(self, category: str, product: Union[Product, Mapping[str, Any]]) -> ProductRef:
+        """
+        Добавляет товар (объект или словарь в формате products.json) в категорию шарда.
+        Шард получает копию товара без категорий, в которых товар состоит в этом процессе.
+        """
+        row = self._call(category, "add_product", product)
+        return ProductRef(category, self._shard_of(category), row)
+
+    def remove_product(self, category: str, product_name: str) -> None:
+        self._call(category, "remove_product", product_name)
+
+    def set_price(self, category: str, product_name: str, price: float) -> None:
+        self._call(category, "set_price", product_name, price)
+
+    def set_quantity(self, category: str, product_name: str, quantity: int) -> None:
+        self._call(category, "set_quantity", product_name, quantity)
+
+    # Чтения
+
+    def find(self, category: str, product_name: str) -> List[ProductRef]:
+        """Адреса товаров категории с указанным названием"""
+        rows = self._call(category, "find", product_name)
+        return [ProductRef(category, self._shard_of(category), row) for row in rows]
+
+    def products(self, category: str) -> List[str]:
+        """Строки товаров категории (строит шард-владелец)"""
+        listing: List[str] = self._call(category, "products")
+        return listing
+
+    @property
+    def category_names(self) -> List[str]:
+        return list(self.descriptor.categories)
+
+    def middle_price(self, category: str) -> float:
+        return self.reader.middle_price(category)
+
+    def total_quantity(self, category: str) -> int:
+        return self.reader.total_quantity(category)
+
+    def stock_value(self, category: str) -> float:
+        return self.reader.stock_value(category)
+
+    def close(self) -> None:
+        """Останавливает процессы шардов; их сегменты разделяемой памяти удаляются"""
+        reader = getattr(self, "reader", None)
+        if reader is not None:
+            reader.close()
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self) -> "ShardedCatalog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,228 @@
+"""
+Бинарный снимок каталога для быстрого старта.
+
+Файл состоит из заголовка, таблицы строк, записей категорий с готовыми агрегатами
+и колонок товаров (цена, остаток, номера строк, тип товара). При загрузке файл
+отображается в память через mmap, а объекты Product создаются только при первом
+обращении к конкретному товару, без повторных проверок и логирования.
+"""
+import mmap
+import struct
+from array import array
+from typing import Any, Dict, Iterable, List, Literal, Tuple, Type
+
+from src.classes import Category, LawnGrass, Product, Smartphone
+from src.metrics import LOAD_SECONDS, LOADED_PRODUCTS, metrics
+from src.storage import DeferredProducts
+from src.table import ProductView
+
+MAGIC = b"ECSNAP1\0"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIQQQQQQ")
+_CATEGORY = struct.Struct("<IIQQdqd")
+_NO_STRING = 0xFFFFFFFF
+
+# Код типа -> (класс, дополнительные поля). Дополнительные поля хранятся как строки
+# в общих колонках и при восстановлении приводятся к типу из описания.
+_PRODUCT_TYPES: List[Tuple[Type[Product], Tuple[Tuple[str, type], ...]]] = [
+    (Product, ()),
+    (Smartphone, (("efficiency", str), ("model", str), ("memory", int), ("color", str))),
+    (LawnGrass, (("country", str), ("germination_period", str), ("color", str))),
+]
+_EXTRA_COLUMNS = max(len(fields) for _, fields in _PRODUCT_TYPES)
+_TYPE_CODES: Dict[type, int] = {cls: code for code, (cls, _) in enumerate(_PRODUCT_TYPES)}
+_TYPE_CODES[ProductView] = _TYPE_CODES[Product]
+
+
+def _type_code(product: Product) -> int:
+    code = _TYPE_CODES.get(type(product))
+    if code is None:
+        raise TypeError(f"Тип товара {type(product).__name__} не поддерживается снимком")
+    return code
+
+
+def _pad(size: int) -> int:
+    return (8 - size % 8) % 8
+
+
+def save_snapshot(categories: Iterable[Category], path: str) -> None:
+    """Записывает категории и их товары в бинарный снимок"""
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        string_id = string_ids.get(value)
+        if string_id is None:
+            string_id = string_ids[value] = len(strings)
+            strings.append(value)
+        return string_id
+
+    category_records = []
+    prices, quantities = array("d"), array("q")
+    name_ids, description_ids = array("I"), array("I")
+    extras = [array("I") for _ in range(_EXTRA_COLUMNS)]
+    types = array("B")
+
+    for category in categories:
+        first = len(prices)
+        for product in category._products:
+            code = _type_code(product)
+            types.append(code)
+            prices.append(product.price)
+            quantities.append(product.quantity)
+            name_ids.append(intern(product.name))
+            description_ids.append(intern(product.description))
+            fields = _PRODUCT_TYPES[code][1]
+            for column, extra in enumerate(extras):
+                if column < len(fields):
+                    extra.append(intern(str(getattr(product, fields[column][0]))))
+                else:
+                    extra.append(_NO_STRING)
+        category_records.append(
+            _CATEGORY.pack(
+                intern(category.name),
+                intern(category.description),
+                first,
+                len(prices) - first,
+                category._price_sum,
+                category._quantity_sum,
+                category._stock_value,
+            )
+        )
+
+    encoded = [value.encode("utf-8") for value in strings]
+    string_offsets = array("Q", [0])
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+    blob = b"".join(encoded)
+
+    string_offsets_pos = _HEADER.size
+    blob_pos = string_offsets_pos + len(string_offsets) * 8
+    categories_pos = blob_pos + len(blob) + _pad(len(blob))
+    products_pos = categories_pos + len(category_records) * _CATEGORY.size
+
+    with open(path, "wb") as file:
+        file.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(category_records),
+                len(prices),
+                len(strings),
+                string_offsets_pos,
+                blob_pos,
+                categories_pos,
+                products_pos,
+            )
+        )
+        file.write(string_offsets.tobytes())
+        file.write(blob + b"\0" * _pad(len(blob)))
+        file.write(b"".join(category_records))
+        # колонки одинаковой ширины идут подряд, каждая выровнена по 8 байтам
+        columns: List["array[Any]"] = [prices, quantities, name_ids, description_ids, *extras, types]
+        for values in columns:
+            data = values.tobytes()
+            file.write(data + b"\0" * _pad(len(data)))
+
+
+class Snapshot:
+    """Отображённый в память снимок: колонки читаются напрямую из файла"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        (
+            magic,
+            version,
+            self.category_count,
+            self.product_count,
+            string_count,
+            string_offsets_pos,
+            blob_pos,
+            self._categories_pos,
+            products_pos,
+        ) = _HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Файл {path} не является снимком каталога версии {VERSION}")
+
+        self._string_offsets = buffer[string_offsets_pos:string_offsets_pos + (string_count + 1) * 8].cast("Q")
+        self._blob = buffer[blob_pos:]
+        self._buffer = buffer
+
+        position = products_pos
+        count = self.product_count
+
+        def column(code: Literal["d", "q", "I", "B"]) -> "memoryview[Any]":
+            nonlocal position
+            size = count * struct.calcsize(code)
+            view = buffer[position:position + size].cast(code)
+            position += size + _pad(size)
+            return view
+
+        self.prices: "memoryview[float]" = column("d")
+        self.quantities: "memoryview[int]" = column("q")
+        self.name_ids: "memoryview[int]" = column("I")
+        self.description_ids: "memoryview[int]" = column("I")
+        self.extras: List["memoryview[int]"] = [column("I") for _ in range(_EXTRA_COLUMNS)]
+        self.types: "memoryview[int]" = column("B")
+
+    def string(self, string_id: int) -> str:
+        start = self._string_offsets[string_id]
+        return str(self._blob[start:self._string_offsets[string_id + 1]], "utf-8")
+
+    def category_record(self, number: int) -> Tuple[int, int, int, int, float, int, float]:
+        return _CATEGORY.unpack_from(self._buffer, self._categories_pos + number * _CATEGORY.size)
+
+    def materialize(self, row: int) -> Product:
+        """Создаёт объект товара для строки снимка"""
+        cls, fields = _PRODUCT_TYPES[self.types[row]]
+        extra = {
+            field: field_type(self.string(self.extras[column][row]))
+            for column, (field, field_type) in enumerate(fields)
+        }
+        return cls._restore(
+            self.string(self.name_ids[row]),
+            self.string(self.description_ids[row]),
+            self.prices[row],
+            self.quantities[row],
+            **extra,
+        )
+
+
+class SnapshotProducts(DeferredProducts):
+    """
+    Хранилище товаров категории поверх снимка.
+
+    Товары из снимка создаются при первом обращении и запоминаются; добавленные
+    позже через add_product хранятся отдельно. Агрегаты берутся из записи категории.
+    """
+
+    def __init__(self, snapshot: Snapshot, first: int, count: int, aggregates: Tuple[int, float, int, float]):
+        super().__init__(count)
+        self._snapshot = snapshot
+        self._first = first
+        self._initial_aggregates = aggregates
+
+    def _aggregates(self) -> Tuple[int, float, int, float]:
+        return self._initial_aggregates
+
+    def _materialize(self, index: int) -> Product:
+        return self._snapshot.materialize(self._first + index)
+
+
+def load_snapshot(path: str) -> List[Category]:
+    """Загружает категории из снимка; товары создаются лениво при обращении"""
+    with LOAD_SECONDS.time("snapshot"):
+        snapshot = Snapshot(path)
+        categories = []
+        for number in range(snapshot.category_count):
+            name_id, description_id, first, count, price_sum, quantity_sum, stock_value = snapshot.category_record(
+                number
+            )
+            storage = SnapshotProducts(snapshot, first, count, (count, price_sum, quantity_sum, stock_value))
+            categories.append(Category(snapshot.string(name_id), snapshot.string(description_id), storage))
+    if metrics.enabled:
+        LOADED_PRODUCTS.inc("snapshot", amount=snapshot.product_count)
+    return categories
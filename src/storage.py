@@ -0,0 +1,76 @@
+"""
+Основа хранилищ товаров категории, которые создают объекты Product при первом обращении.
+
+Хранилище подключается к Category так же, как ProductTable: категория вызывает _attach
+и берёт готовые агрегаты из _aggregates, не перебирая товары. Наследник хранит
+исходные строки по-своему (снимок в mmap, колонки разобранного файла) и создаёт
+объект товара в _materialize.
+"""
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional, Tuple
+
+from src.classes import Category, Product
+
+
+class DeferredProducts(ABC):
+    """
+    Хранилище, в котором первые строки превращаются в объекты при обращении и запоминаются.
+
+    За отложенными строками идут товары, добавленные позже через add_product;
+    они хранятся отдельно, в _appended.
+    """
+
+    def __init__(self, count: int):
+        self._materialized: List[Optional[Product]] = [None] * count
+        self._appended: List[Product] = []
+        self._owners: List[Category] = []
+
+    @abstractmethod
+    def _materialize(self, index: int) -> Product:
+        """Создаёт объект товара для отложенной строки index"""
+
+    @abstractmethod
+    def _aggregates(self) -> Tuple[int, float, int, float]:
+        """Число товаров, сумма цен, общий остаток и стоимость остатка без создания объектов"""
+
+    def _attach(self, category: Category) -> None:
+        self._owners.append(category)
+        for product in self._materialized:
+            if product is not None:
+                product._attach(category)
+
+    def __len__(self) -> int:
+        return len(self._materialized) + len(self._appended)
+
+    def __getitem__(self, index: int) -> Product:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Индекс товара вне диапазона категории")
+        deferred = len(self._materialized)
+        if index >= deferred:
+            return self._appended[index - deferred]
+        product = self._materialized[index]
+        if product is None:
+            product = self._materialize(index)
+            for category in self._owners:
+                product._attach(category)
+            self._materialized[index] = product
+        return product
+
+    def __iter__(self) -> Iterator[Product]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __contains__(self, item: object) -> bool:
+        # товар может оказаться в хранилище, только если он уже создан
+        return any(product is item for product in self._materialized) or item in self._appended
+
+    def append(self, product: Product) -> None:
+        self._appended.append(product)
+
+    @property
+    def materialized_count(self) -> int:
+        """Сколько отложенных строк уже превращено в объекты"""
+        return len(self._materialized) - self._materialized.count(None)
@@ -0,0 +1,182 @@
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.classes import Category, Product
+
+
+class ProductTable:
+    """
+    Колоночное хранилище товаров.
+
+    Цены и остатки лежат в непрерывных числовых массивах, а названия и описания — в общем пуле
+    строк, где каждая уникальная строка хранится один раз и на неё ссылается номер.
+    Таблицу можно передать в Category вместо списка товаров: при обращении к элементу
+    она отдаёт лёгкое представление ProductView, а не хранит объекты Product.
+    """
+
+    def __init__(self, products: Optional[Iterable[Product]] = None):
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._name_ids = array("I")
+        self._description_ids = array("I")
+        self._prices = array("d")
+        self._quantities = array("q")
+        self._owners: List[Category] = []
+
+        if products is not None:
+            for product in products:
+                self.append(product)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "ProductTable":
+        """Заполняет таблицу напрямую из словарей товаров, минуя создание объектов Product"""
+        table = cls()
+        for record in records:
+            table._append_row(record["name"], record["description"], float(record["price"]), int(record["quantity"]))
+        return table
+
+    def _intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def _append_row(self, name: str, description: str, price: float, quantity: int) -> None:
+        if quantity <= 0:
+            raise ValueError("Товар с нулевым количеством не может быть добавлен")
+        self._name_ids.append(self._intern(name))
+        self._description_ids.append(self._intern(description))
+        self._prices.append(price if price > 0 else 0)
+        self._quantities.append(quantity)
+
+    def append(self, product: Product) -> None:
+        """Копирует данные товара в таблицу"""
+        if type(product) not in (Product, ProductView):
+            raise TypeError("ProductTable хранит только товары класса Product")
+        self._append_row(product.name, product.description, product.price, product.quantity)
+
+    def _attach(self, category: Category) -> None:
+        """Подписывает категорию на изменения строк таблицы"""
+        if all(owner is not category for owner in self._owners):
+            self._owners.append(category)
+
+    def _aggregates(self) -> Tuple[int, float, int, float]:
+        """Количество строк, сумма цен, общий остаток и стоимость остатка по колонкам"""
+        prices, quantities = self._prices, self._quantities
+        return (
+            len(prices),
+            sum(prices),
+            sum(quantities),
+            sum(price * quantity for price, quantity in zip(prices, quantities)),
+        )
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def __getitem__(self, index: int) -> "ProductView":
+        size = len(self._prices)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Индекс товара вне диапазона таблицы")
+        return ProductView(self, index)
+
+    def __iter__(self) -> Iterator["ProductView"]:
+        for index in range(len(self._prices)):
+            yield ProductView(self, index)
+
+    def __contains__(self, item: object) -> bool:
+        return isinstance(item, ProductView) and item._table is self and item._index < len(self._prices)
+
+    def nbytes(self) -> int:
+        """Возвращает объём памяти, занятой числовыми колонками (без пула строк)"""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self._name_ids, self._description_ids, self._prices, self._quantities)
+        )
+
+
+class ProductView(Product):
+    """
+    Представление строки ProductTable в виде товара.
+
+    Не копирует данные: чтение и запись атрибутов идут прямо в колонки таблицы.
+    Конструктор Product не вызывается, поэтому представления создаются без логирования.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: ProductTable, index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def name(self) -> str:
+        return self._table._strings[self._table._name_ids[self._index]]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._table._name_ids[self._index] = self._table._intern(value)
+        self._notify(self.price, self.quantity)
+
+    @property
+    def description(self) -> str:
+        return self._table._strings[self._table._description_ids[self._index]]
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._table._description_ids[self._index] = self._table._intern(value)
+        self._notify(self.price, self.quantity)
+
+    @property
+    def price(self) -> float:
+        return self._table._prices[self._index]
+
+    @price.setter
+    def price(self, value: float) -> None:
+        if value <= 0:
+            print("Цена не должна быть нулевая или отрицательная")
+        else:
+            old_price = self._table._prices[self._index]
+            self._table._prices[self._index] = value
+            self._notify(old_price, self.quantity)
+
+    @property
+    def quantity(self) -> int:
+        return self._table._quantities[self._index]
+
+    @quantity.setter
+    def quantity(self, value: int) -> None:
+        old_quantity = self._table._quantities[self._index]
+        self._table._quantities[self._index] = value
+        self._notify(self.price, old_quantity)
+
+    def _attach(self, category: Category) -> None:
+        self._table._attach(category)
+
+    @classmethod
+    def _product_type(cls) -> type:
+        # строка таблицы — обычный Product, поэтому складывается с Product
+        return Product
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # представление передаётся в pickle как обычный товар, без таблицы
+        return Product._restore, (self.name, self.description, self.price, self.quantity)
+
+    def __str__(self) -> str:
+        # представления недолговечны, поэтому строка не кэшируется
+        return self._render()
+
+    def _notify(self, old_price: float, old_quantity: int) -> None:
+        for category in self._table._owners:
+            category._on_product_change(self, old_price, old_quantity)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ProductView):
+            return self._table is other._table and self._index == other._index
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._table), self._index))
@@ -1,34 +1,288 @@
 import json
-from typing import List
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 from src.classes import Category, Product
+from src.lazy import LazyProducts
+from src.metrics import LOAD_SECONDS, LOADED_PRODUCTS, metrics
+from src.parsers import ParsedCategory, Parser, Row, get_parser
+from src.registry import ProductSpec, RecordError, product_registry
 
+DEFAULT_DATA_PATH = "data/products.json"
+CHUNK_SIZE = 1 << 16
 
-def load_data_from_json() -> List[Category]:
+_WHITESPACE = " \t\n\r"
+
+
+def iter_raw_categories(path: str = DEFAULT_DATA_PATH, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
     """
-    Загружает данные из файла data/products.json и создаёт объекты классов Product и Category.
+    Потоково читает JSON-массив категорий и по одной отдаёт их в виде словарей.
+
+    В памяти одновременно находится только текущая категория и непрочитанный остаток буфера,
+    поэтому расход памяти ограничен размером самой большой категории, а не всего файла.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, "r", encoding="utf-8") as file:
+        buffer = ""
+        position = 0
+        eof = False
+
+        def fill(min_size: int) -> bool:
+            """Дочитывает файл в буфер; возвращает False, если файл закончился"""
+            nonlocal buffer, position, eof
+            if eof:
+                return False
+            chunk = file.read(max(chunk_size, min_size))
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+
+        def skip_whitespace() -> str:
+            """Пропускает пробелы и возвращает следующий значимый символ ('' в конце файла)"""
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in _WHITESPACE:
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if not fill(chunk_size):
+                    return ""
+
+        if skip_whitespace() != "[":
+            raise ValueError(f"Файл {path} должен содержать JSON-массив категорий")
+        position += 1
+
+        if skip_whitespace() == "]":
+            return
+
+        while True:
+            skip_whitespace()
+            while True:
+                try:
+                    category_data, end = decoder.raw_decode(buffer, position)
+                    break
+                except json.JSONDecodeError:
+                    # Объект категории ещё не прочитан целиком: удваиваем буфер и пробуем снова
+                    if not fill(len(buffer) - position):
+                        raise
+            position = end
+            yield category_data
+
+            separator = skip_whitespace()
+            if separator == ",":
+                position += 1
+            elif separator == "]":
+                return
+            else:
+                raise ValueError(f"Некорректный разделитель в файле {path}: {separator!r}")
+
+
+def build_product(product_data: Dict[str, Any]) -> Product:
+    """
+    Создаёт товар нужного класса из словаря одного товара.
+
+    Класс выбирается по полю "type" через реестр src.registry.product_registry
+    (Product, Smartphone, LawnGrass или зарегистрированный позже тип).
     """
-    with open("data/products.json", "r", encoding="utf-8") as file:
-        data = json.load(file)
-
-    categories = []
-
-    for category_data in data:
-        products = []
-        for product_data in category_data["products"]:
-            product = Product(
-                name=product_data["name"],
-                description=product_data["description"],
-                price=float(product_data["price"]),
-                quantity=int(product_data["quantity"]),
-            )
-            products.append(product)
-
-        category = Category(
-            name=category_data["name"],
-            description=category_data["description"],
-            products=products,
-        )
-        categories.append(category)
+    return product_registry.build(product_data)
 
+
+def build_category(category_data: Dict[str, Any]) -> Category:
+    """Создаёт объект Category и его товары из словаря одной категории"""
+    return Category(
+        name=category_data["name"],
+        description=category_data["description"],
+        products=[build_product(product_data) for product_data in category_data["products"]],
+    )
+
+
+def iter_categories_from_json(path: str = DEFAULT_DATA_PATH, chunk_size: int = CHUNK_SIZE) -> Iterator[Category]:
+    """
+    Генератор категорий: разбирает файл потоково и отдаёт объекты Category по мере чтения.
+    """
+    for category_data in iter_raw_categories(path, chunk_size):
+        yield build_category(category_data)
+
+
+def build_parsed_category(parsed: ParsedCategory) -> Category:
+    """Создаёт Category из уже проверенных строк товаров"""
+    construct = product_registry.construct
+    return Category(
+        name=parsed.name,
+        description=parsed.description,
+        products=[construct(type_name, args) for type_name, args in parsed.rows],
+    )
+
+
+def load_data_from_json(
+    path: str = DEFAULT_DATA_PATH, parser: Union[str, Parser, None] = None, lazy: bool = False
+) -> List[Category]:
+    """
+    Загружает данные из файла data/products.json и создаёт объекты классов Product и Category.
+
+    Файл разбирается парсером из src.parsers (по умолчанию самым быстрым из доступных).
+    Все записи проверяются до создания первой категории, поэтому при ошибке в файле
+    общие счётчики Category не меняются.
+
+    Парсер читает и разбирает файл целиком, поэтому пиковая память включает весь документ
+    вместе с созданными товарами. Для файлов, которые не помещаются в память, служит
+    потоковый iter_categories_from_json (категории создаются по одной, без предварительной
+    проверки всего файла).
+
+    При lazy=True категории хранят строки товаров в колонках (src.lazy.LazyProducts),
+    а объекты Product создаются только при обращении к конкретному товару.
+    """
+    parser = get_parser(parser)
+    with LOAD_SECONDS.time("json"):
+        parsed_categories = parser.parse_file(path)
+        if lazy:
+            storages = [LazyProducts(parsed.rows) for parsed in parsed_categories]
+            categories = [
+                Category(parsed.name, parsed.description, storage)
+                for parsed, storage in zip(parsed_categories, storages)
+            ]
+        else:
+            categories = [build_parsed_category(parsed) for parsed in parsed_categories]
+    if metrics.enabled:
+        LOADED_PRODUCTS.inc("json", amount=sum(len(category._products) for category in categories))
     return categories
+
+
+class ReloadError(NamedTuple):
+    """Строка товара из файла, которая не применена при перезагрузке"""
+
+    category: str
+    row: int
+    field: str
+    message: str
+
+
+class ReloadResult(NamedTuple):
+    """Итог инкрементальной перезагрузки: новый список категорий, число изменённых товаров и отклонённые строки"""
+
+    categories: List[Category]
+    added: int
+    removed: int
+    updated: int
+    errors: List[ReloadError]
+
+
+class _CategoryPlan(NamedTuple):
+    """Изменения одной категории, вычисленные до их применения"""
+
+    category: Optional[Category]
+    parsed: ParsedCategory
+    removed: List[Product]
+    updated: List[Tuple[Product, Dict[str, Any]]]
+
+
+def _changed_fields(product: Product, spec: ProductSpec, args: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+    """
+    Поля товара (все поля его типа из реестра, кроме названия), значения которых
+    в строке файла отличаются от текущих; None, если в файле у товара другой тип.
+    """
+    if product_registry.spec_for(type(product)) is not spec:
+        return None
+    return {field: value for field, value in zip(spec._names[1:], args[1:]) if getattr(product, field) != value}
+
+
+def _plan_category(
+    category: Optional[Category], category_data: Dict[str, Any], errors: List[ReloadError]
+) -> _CategoryPlan:
+    """Проверяет строки категории через реестр и сопоставляет их с товарами по названию"""
+    name = category_data["name"]
+    current: Dict[str, List[Product]] = {}
+    if category is not None:
+        for stored in category._products:
+            current.setdefault(stored.name, []).append(stored)
+
+    rows: List[Row] = []
+    replaced = []
+    updated = []
+    for row, record in enumerate(category_data["products"]):
+        product_name = record.get("name")
+        matches = current.get(product_name) if isinstance(product_name, str) else None
+        product = matches.pop(0) if matches else None
+        try:
+            type_name, args = product_registry.coerce(record)
+        except RecordError as error:
+            # товар с таким названием остаётся без изменений
+            errors.append(ReloadError(name, row, error.field, str(error)))
+            continue
+        if product is None:
+            rows.append((type_name, args))
+            continue
+        changes = _changed_fields(product, product_registry.spec(type_name), args)
+        if changes is None:
+            # товар сменил тип: старый объект заменяется новым
+            replaced.append(product)
+            rows.append((type_name, args))
+        elif "price" in changes and changes["price"] <= 0:
+            # сеттер цены не примет такое значение, поэтому товар не меняется совсем
+            errors.append(ReloadError(name, row, "price", "Цена не должна быть нулевая или отрицательная"))
+        elif changes:
+            updated.append((product, changes))
+
+    removed = replaced + [product for leftovers in current.values() for product in leftovers]
+    return _CategoryPlan(category, ParsedCategory(name, category_data["description"], rows), removed, updated)
+
+
+def _apply_plan(plan: _CategoryPlan) -> Category:
+    category = plan.category
+    if category is None:
+        return build_parsed_category(plan.parsed)
+    category.description = plan.parsed.description
+    for product in plan.removed:
+        category.remove_product(product)
+    for product, changes in plan.updated:
+        for field, value in changes.items():
+            setattr(product, field, value)
+    for type_name, args in plan.parsed.rows:
+        category.add_product(product_registry.construct(type_name, args))
+    return category
+
+
+def reload_data_from_json(categories: List[Category], path: str = DEFAULT_DATA_PATH) -> ReloadResult:
+    """
+    Инкрементально применяет новую версию файла к уже загруженным категориям.
+
+    Категории сопоставляются по названию, товары внутри них — тоже по названию.
+    Новые товары добавляются через add_product, пропавшие удаляются через remove_product,
+    а у оставшихся изменённые поля (все поля типа из реестра) меняются на месте через сеттеры,
+    поэтому агрегаты, индексы и общие счётчики Category остаются верными. Объекты создаются
+    только для новых товаров и категорий, а также для товаров, у которых сменился тип.
+
+    Строки товаров проверяются через реестр src.registry. Некорректная строка не применяется
+    (товар с таким названием остаётся как был) и попадает в ReloadResult.errors.
+    Все изменения вычисляются до применения первого из них: если хранилище категории
+    не поддерживает удаление, TypeError возникает до изменения каталога.
+    """
+    existing = {category.name: category for category in categories}
+    plans: List[_CategoryPlan] = []
+    errors: List[ReloadError] = []
+
+    with LOAD_SECONDS.time("reload"):
+        for category_data in iter_raw_categories(path):
+            category = existing.pop(category_data["name"], None)
+            plans.append(_plan_category(category, category_data, errors))
+
+        for plan in plans:
+            if plan.category is not None and plan.removed and getattr(plan.category._products, "remove", None) is None:
+                raise TypeError(f"Хранилище товаров категории {plan.parsed.name} не поддерживает удаление")
+
+        result = [_apply_plan(plan) for plan in plans]
+        added = sum(len(plan.parsed.rows) for plan in plans)
+        removed = sum(len(plan.removed) for plan in plans)
+        updated = sum(len(plan.updated) for plan in plans)
+
+        # пропавшие из файла категории целиком выводятся из общих счётчиков
+        for category in existing.values():
+            removed += len(category._products)
+            Category._bump_counters(-1, -len(category._products))
+
+    if metrics.enabled:
+        LOADED_PRODUCTS.inc("reload", amount=added)
+    return ReloadResult(result, added, removed, updated, errors)
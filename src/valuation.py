@@ -0,0 +1,162 @@
+"""
+Оценка стоимости остатков за один проход по колонкам цен и остатков.
+
+Стоимость группы — сумма price * quantity её товаров, то есть то же, что считает
+Product.__add__ для пары товаров. Произведения вычисляются поэлементно (через NumPy,
+если он установлен), а суммируются math.fsum: результат округляется один раз и
+для двух товаров побитово совпадает с product_a + product_b.
+
+Как и в __add__, складывать можно только товары одного типа: группа с товарами
+разных классов вызывает TypeError.
+"""
+import math
+from itertools import chain
+from operator import attrgetter, mul
+from typing import Callable, Dict, Hashable, Iterable, List, Sequence, Tuple
+
+from src.classes import Category, Product
+from src.table import ProductTable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy необязателен
+    np = None  # type: ignore[assignment]
+
+GroupKey = Callable[[Category, Product], Hashable]
+
+_get_price = attrgetter("price")
+_get_quantity = attrgetter("quantity")
+
+
+def _by_category(category: Category, product: Product) -> Hashable:
+    return category.name
+
+
+def _by_type(category: Category, product: Product) -> Hashable:
+    return product._product_type().__name__
+
+
+def _product_type(cls: type) -> type:
+    """Класс товара, как его сравнивает Product.__add__ (строка ProductTable считается Product)"""
+    if not issubclass(cls, Product):
+        raise TypeError("Можно складывать только товары и их наследников")
+    return cls._product_type()
+
+
+def _check_types(product_types: Iterable[type]) -> type:
+    """Возвращает общий класс товаров или вызывает TypeError, как Product.__add__"""
+    product_types = set(map(_product_type, set(product_types)))
+    if len(product_types) > 1:
+        raise TypeError("Можно складывать только товары одного типа")
+    return product_types.pop()
+
+
+class _Groups:
+    """Колонки цен и остатков, разложенные по группам"""
+
+    def __init__(self) -> None:
+        self.keys: List[Hashable] = []
+        self.types: List[type] = []
+        self.prices: List[List[Sequence[float]]] = []
+        self.quantities: List[List[Sequence[int]]] = []
+        self._ids: Dict[Hashable, int] = {}
+
+    def group(self, key: Hashable, product_type: type) -> int:
+        group_id = self._ids.get(key)
+        if group_id is None:
+            group_id = self._ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.types.append(product_type)
+            self.prices.append([])
+            self.quantities.append([])
+        elif self.types[group_id] is not product_type:
+            raise TypeError("Можно складывать только товары одного типа")
+        return group_id
+
+    def add_columns(
+        self, key: Hashable, product_type: type, prices: Sequence[float], quantities: Sequence[int]
+    ) -> None:
+        group_id = self.group(key, product_type)
+        self.prices[group_id].append(prices)
+        self.quantities[group_id].append(quantities)
+
+    def add_rows(self, key: GroupKey, category: Category, products: Iterable[Product]) -> None:
+        rows: Dict[int, Tuple[List[float], List[int]]] = {}
+        for product in products:
+            product_type = _product_type(type(product))
+            group_id = self.group(key(category, product), product_type)
+            columns = rows.get(group_id)
+            if columns is None:
+                columns = rows[group_id] = ([], [])
+            columns[0].append(product.price)
+            columns[1].append(product.quantity)
+        for group_id, (prices, quantities) in rows.items():
+            self.prices[group_id].append(prices)
+            self.quantities[group_id].append(quantities)
+
+    def sums(self) -> List[float]:
+        """Точные суммы price * quantity по группам"""
+        return [_stock_value(prices, quantities) for prices, quantities in zip(self.prices, self.quantities)]
+
+
+def _stock_value(prices: List[Sequence[float]], quantities: List[Sequence[int]]) -> float:
+    if np is not None:
+        values = np.multiply(
+            np.concatenate([np.asarray(column, dtype=np.float64) for column in prices]),
+            np.concatenate([np.asarray(column, dtype=np.float64) for column in quantities]),
+        )
+        return math.fsum(values.tolist())
+    return math.fsum(map(mul, chain.from_iterable(prices), chain.from_iterable(quantities)))
+
+
+def _collect(categories: Iterable[Category], key: GroupKey) -> _Groups:
+    groups = _Groups()
+    for category in categories:
+        storage = category._products
+        if not len(storage):
+            continue
+        if isinstance(storage, ProductTable):
+            # у колоночной таблицы все строки — ProductView, а её колонки всегда актуальны,
+            # поэтому берутся целиком (у других хранилищ колонки могут отставать от товаров)
+            if key is _by_category or key is _by_type:
+                first = storage[0]
+                groups.add_columns(
+                    key(category, first), _product_type(type(first)), storage._prices, storage._quantities
+                )
+                continue
+        elif key is _by_category:
+            product_type = _check_types(map(type, storage))
+            prices = list(map(_get_price, storage))
+            groups.add_columns(category.name, product_type, prices, list(map(_get_quantity, storage)))
+            continue
+        groups.add_rows(key, category, storage)
+    return groups
+
+
+def value_by(categories: Iterable[Category], key: GroupKey) -> Dict[Hashable, float]:
+    """
+    Стоимость остатков по произвольной группировке.
+
+    key(category, product) возвращает ключ группы; все товары группы должны быть одного класса.
+    """
+    groups = _collect(categories, key)
+    return dict(zip(groups.keys, groups.sums()))
+
+
+def value_by_category(categories: Iterable[Category]) -> Dict[Hashable, float]:
+    """Стоимость остатков каждой категории; пустые категории не попадают в результат"""
+    return value_by(categories, _by_category)
+
+
+def value_by_type(categories: Iterable[Category]) -> Dict[Hashable, float]:
+    """Стоимость остатков по классам товаров (ключ — имя класса)"""
+    return value_by(categories, _by_type)
+
+
+def stock_value(products: Iterable[Product]) -> float:
+    """Стоимость остатков набора товаров одного типа, как цепочка Product.__add__"""
+    products = list(products)
+    if not products:
+        return 0.0
+    _check_types(map(type, products))
+    return _stock_value([list(map(_get_price, products))], [list(map(_get_quantity, products))])
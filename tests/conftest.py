@@ -0,0 +1,87 @@
+import copy
+import json
+
+import pytest
+
+from src.classes import Category, LogMixin
+from src.log_sinks import LogSink, NullSink
+
+CATALOG = [
+    {
+        "name": "Смартфоны",
+        "description": "Категория смартфонов",
+        "products": [
+            {"name": "Iphone 15", "description": "512GB, Gray space", "price": 210000.0, "quantity": 8},
+            {"name": "Xiaomi Redmi Note 11", "description": "1024GB, Синий", "price": "31000", "quantity": "14"},
+        ],
+    },
+    {
+        "name": "Телевизоры",
+        "description": "Категория телевизоров",
+        "products": [{"name": "55\" QLED 4K", "description": "Фоновая подсветка", "price": 123000.0, "quantity": 7}],
+    },
+]
+
+
+class ListSink(LogSink):
+    """Приёмник журнала, который складывает записи в список"""
+
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    Category.category_count = 0
+    Category.product_count = 0
+
+
+@pytest.fixture
+def use_sink():
+    """Подключает приёмник журнала к LogMixin до конца теста"""
+    previous = []
+
+    def install(sink):
+        previous.append(LogMixin.set_log_sink(sink))
+        return sink
+
+    yield install
+    for sink in reversed(previous):
+        LogMixin.set_log_sink(sink)
+
+
+@pytest.fixture
+def quiet_log(use_sink):
+    """Отключает журнал создания товаров (для тестов с тысячами товаров)"""
+    use_sink(NullSink())
+
+
+@pytest.fixture
+def list_sink():
+    return ListSink()
+
+
+@pytest.fixture
+def write_catalog(tmp_path):
+    """Записывает данные каталога в JSON-файл во временной папке и возвращает путь к нему"""
+
+    def write(data, name="products.json"):
+        path = tmp_path / name
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def catalog_data():
+    """Данные каталога для catalog_file; тестовый модуль может переопределить фикстуру"""
+    return copy.deepcopy(CATALOG)
+
+
+@pytest.fixture
+def catalog_file(write_catalog, catalog_data):
+    return write_catalog(catalog_data)
@@ -0,0 +1,121 @@
+import asyncio
+
+from src.aio import AsyncCatalog
+from src.classes import Category, Product, Smartphone
+from src.concurrent_category import ConcurrentCategory
+from src.repricing import RepriceError
+from src.table import ProductTable
+
+
+def test_async_load_and_queries(catalog_file):
+    async def scenario():
+        catalog = AsyncCatalog()
+        loaded = await catalog.load(catalog_file)
+        return loaded, await catalog.categories(), await catalog.summary("Смартфоны")
+
+    loaded, names, summary = asyncio.run(scenario())
+    assert [category.name for category in loaded] == names == ["Смартфоны", "Телевизоры"]
+    assert summary == "Смартфоны, общее количество товаров: 22 шт."
+
+
+def test_concurrent_writers_are_coalesced():
+    category = Category("Электроника", "Техника")
+    products = [Product(f"Товар {i}", "Описание", 10 + i, 1) for i in range(100)]
+
+    async def scenario():
+        catalog = AsyncCatalog([category])
+        await asyncio.gather(*(catalog.add_product("Электроника", product) for product in products))
+        await catalog.set_prices({products[0]: 1000})
+        return catalog.apply_steps, await catalog.middle_price("Электроника")
+
+    steps, middle_price = asyncio.run(scenario())
+    assert steps == 2
+    assert len(category.products) == 100
+    assert middle_price == (1000 + sum(10 + i for i in range(1, 100))) / 100
+
+
+def test_failed_write_only_fails_its_caller():
+    category = Category("Электроника", "Техника")
+
+    async def scenario():
+        catalog = AsyncCatalog([category])
+        return await asyncio.gather(
+            catalog.add_product("Электроника", Product("Мышь", "Беспроводная", 10, 1)),
+            catalog.add_product("Электроника", "не товар"),
+            return_exceptions=True,
+        )
+
+    ok, failed = asyncio.run(scenario())
+    assert ok is None
+    assert isinstance(failed, TypeError)
+    assert category.products == ["Мышь, 10 руб. Остаток: 1 шт."]
+
+
+def test_storage_rejection_in_merged_additions_fails_only_that_write():
+    category = Category("Периферия", "Устройства", ProductTable())
+    phone = Smartphone("Iphone", "512GB", 210000.0, 1, "98", "15", 512, "Gray space")
+
+    async def scenario():
+        catalog = AsyncCatalog([category])
+        return await asyncio.gather(
+            catalog.add_product("Периферия", Product("Мышь", "Беспроводная", 10, 1)),
+            catalog.add_product("Периферия", phone),
+            catalog.add_product("Периферия", Product("Коврик", "Тканевый", 5, 2)),
+            return_exceptions=True,
+        )
+
+    first, rejected, last = asyncio.run(scenario())
+    assert first is None and last is None
+    assert isinstance(rejected, TypeError)
+    assert category.products == ["Мышь, 10 руб. Остаток: 1 шт.", "Коврик, 5 руб. Остаток: 2 шт."]
+
+
+class CountingCategory(ConcurrentCategory):
+    def __init__(self, name, description):
+        super().__init__(name, description)
+        self.batches = []
+
+    def add_products(self, products):
+        products = list(products)
+        self.batches.append(len(products))
+        super().add_products(products)
+
+
+def test_additions_to_one_category_become_one_add_products_call(quiet_log):
+    category = CountingCategory("Электроника", "Техника")
+    products = [Product(f"Товар {i}", "Описание", 10, 1) for i in range(50)]
+
+    async def scenario():
+        catalog = AsyncCatalog([category])
+        await asyncio.gather(
+            *(catalog.add_product("Электроника", product) for product in products[:40]),
+            catalog.add_products("Электроника", products[40:]),
+        )
+        return catalog.apply_steps
+
+    assert asyncio.run(scenario()) == 1
+    assert category.batches == [50]
+    assert category.snapshot() == tuple(products)
+
+
+def test_invalid_prices_and_quantities_fail_their_caller_without_changes():
+    mouse = Product("Мышь", "Беспроводная", 10, 1)
+    keyboard = Product("Клавиатура", "Механическая", 70, 3)
+    category = Category("Электроника", "Техника", [mouse, keyboard])
+
+    async def scenario():
+        catalog = AsyncCatalog([category])
+        return await asyncio.gather(
+            catalog.set_prices({mouse: 20, keyboard: 0}),
+            catalog.set_prices({keyboard: 80}),
+            catalog.set_quantities({mouse: 5, keyboard: -1}),
+            catalog.set_quantities({mouse: 2}),
+            return_exceptions=True,
+        )
+
+    bad_prices, prices_ok, bad_quantities, quantities_ok = asyncio.run(scenario())
+    assert isinstance(bad_prices, RepriceError) and [change.product for change in bad_prices.invalid] == [keyboard]
+    assert isinstance(bad_quantities, ValueError)
+    assert prices_ok is None and quantities_ok is None
+    assert (mouse.price, mouse.quantity, keyboard.price, keyboard.quantity) == (10, 2, 80, 3)
+    assert category.middle_price() == 45
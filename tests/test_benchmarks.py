@@ -0,0 +1,32 @@
+from benchmarks.catalog import write_catalog
+from benchmarks.suite import compare
+from src.classes import Category, LawnGrass, Smartphone
+from src.utils import load_data_from_json
+
+
+def test_generated_catalog_loads(tmp_path):
+    path = str(tmp_path / "catalog.json")
+    write_catalog(path, categories=3, products_per_category=40, seed=1)
+
+    categories = load_data_from_json(path)
+
+    assert Category.category_count == 3
+    assert Category.product_count == 120
+    types = {type(product) for category in categories for product in category._products}
+    assert types == {Smartphone, LawnGrass}
+    with open(path, encoding="utf-8") as file:
+        first = file.read()
+    write_catalog(path, categories=3, products_per_category=40, seed=1)
+    with open(path, encoding="utf-8") as file:
+        assert file.read() == first
+
+
+def test_compare_reports_regressions():
+    baseline = {"meta": {"calibration": 1.0}, "results": {"a": {"min": 1.0}, "b": {"min": 1.0}, "old": {"min": 1.0}}}
+    current = {"meta": {"calibration": 2.0}, "results": {"a": {"min": 2.1}, "b": {"min": 3.0}, "new": {"min": 1.0}}}
+
+    comparisons, regressions = compare(baseline, current, threshold=0.25)
+
+    # машина вдвое медленнее по калибровке, поэтому замедлением считается только b
+    assert [comparison.key for comparison in comparisons] == ["a", "b"]
+    assert [comparison.key for comparison in regressions] == ["b"]
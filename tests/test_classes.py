@@ -1,15 +1,10 @@
+import pickle
+
 import pytest
 
 from src.classes import Smartphone, LawnGrass
 
 
-# === Фикстура для сброса счётчиков перед каждым тестом ===
-@pytest.fixture(autouse=True)
-def reset_counters():
-    Category.category_count = 0
-    Category.product_count = 0
-
-
 # === Тесты ===
 def test_product_initialization():
     """Проверяет инициализацию объекта Product"""
@@ -314,7 +309,7 @@ def test_product_with_zero_quantity_raises_error():
         Product("Товар", "Описание", 100, 0)
 
 
-from src.classes import Product, Category
+from src.classes import Product, Category, RowError
 
 
 def test_product_with_negative_quantity_raises_error():
@@ -335,3 +330,228 @@ def test_category_middle_price():
     product2 = Product("Товар2", "Описание2", 200, 5)
     category = Category("Электроника", "Техника", [product1, product2])
     assert category.middle_price() == (100 + 200) / 2  # (100 + 200) / 2 = 150.0
+
+
+def test_products_have_no_instance_dict():
+    """Проверяет, что товары хранят атрибуты в __slots__, без __dict__"""
+    product = Product("Товар", "Описание", 100, 10)
+    smartphone = Smartphone("iPhone", "Флагман", 100000, 5, "A15", "iPhone 13", 256, "Черный")
+    grass = LawnGrass("Газонная трава", "Для дачи", 500, 20, "Россия", "3 недели", "Зелёный")
+    for item in (product, smartphone, grass):
+        assert not hasattr(item, "__dict__")
+    with pytest.raises(AttributeError):
+        product.extra = 1
+
+
+def test_price_is_stored_once():
+    """Проверяет, что цена хранится в одном поле и сеттер меняет именно его"""
+    product = Product("Товар", "Описание", 100, 10)
+    product.price = 250
+    assert product._price == 250
+    assert product.price == 250
+
+
+def test_new_product_batch_collects_errors_per_row():
+    """Проверяет, что пакетное создание не останавливается на первой ошибке"""
+    records = [
+        {"name": "Ноутбук", "description": "Мощный", "price": "99999.99", "quantity": "5"},
+        {"name": "Телефон", "description": "Простой", "price": ["1"], "quantity": 3},
+        {"name": "Планшет", "description": "Сенсорный", "price": 30000, "quantity": -1},
+        {"name": "Часы", "price": 5000, "quantity": 2},
+        {"name": "Наушники", "description": "Беспроводные", "price": 7000, "quantity": 0},
+        {"name": "Монитор", "description": "27 дюймов", "price": 25000.0, "quantity": 4},
+    ]
+    snapshot = [dict(record) for record in records]
+
+    result = Product.new_product_batch(records)
+
+    assert [product.name for product in result.products] == ["Ноутбук", "Монитор"]
+    assert result.products[0].price == 99999.99
+    assert result.products[0].quantity == 5
+    assert [(error.row, error.field) for error in result.errors] == [
+        (1, "price"), (2, "quantity"), (3, "description"), (4, "quantity")
+    ]
+    assert result.errors[3].message == "Товар с нулевым количеством не может быть добавлен"
+    assert records == snapshot
+
+
+def test_new_product_batch_reports_string_fields_and_constructor_fields():
+    class Checked(Product):
+        __slots__ = ()
+
+        def __init__(self, name, description, price, quantity):
+            if name.startswith(" "):
+                error = ValueError("Название не может начинаться с пробела")
+                error.field = "name"
+                raise error
+            super().__init__(name, description, price, quantity)
+
+    records = [
+        {"name": 15, "description": "Описание", "price": 1, "quantity": 1},
+        {"name": "Товар", "description": ["Описание"], "price": 1, "quantity": 1},
+        {"name": " Товар", "description": "Описание", "price": 1, "quantity": 1},
+    ]
+
+    result = Checked.new_product_batch(records)
+
+    assert result.products == []
+    assert result.errors == [
+        RowError(0, "name", "Поле 'name' должно быть строкой"),
+        RowError(1, "description", "Поле 'description' должно быть строкой"),
+        RowError(2, "name", "Название не может начинаться с пробела"),
+    ]
+
+
+def test_new_product_batch_accepts_columns():
+    columns = {
+        "name": ["Ноутбук", "Телефон"],
+        "description": ["Мощный", "Простой"],
+        "price": [100, "-5"],
+        "quantity": ["1", 2],
+    }
+    products, errors = Product.new_product_batch(columns)
+    assert len(products) == 1
+    assert errors[0].row == 1
+    assert errors[0].message == "Цена товара не может быть отрицательной"
+    assert columns["price"] == [100, "-5"]
+
+
+def test_category_aggregates_follow_product_changes():
+    """Проверяет, что агрегаты категории обновляются при изменении цены и остатка"""
+    product1 = Product("Товар1", "Описание1", 100, 10)
+    product2 = Product("Товар2", "Описание2", 200, 5)
+    category = Category("Электроника", "Техника", [product1])
+    category.add_product(product2)
+
+    assert category.total_quantity == 15
+    assert category.stock_value == product1 + product2
+
+    product1.price = 300
+    product2.quantity = 1
+    assert category.middle_price() == (300 + 200) / 2
+    assert category.total_quantity == 11
+    assert category.stock_value == 300 * 10 + 200 * 1
+    assert str(category) == "Электроника, общее количество товаров: 11 шт."
+
+
+def test_product_in_two_categories_updates_both():
+    product = Product("Товар", "Описание", 100, 10)
+    first = Category("Первая", "Описание", [product])
+    second = Category("Вторая", "Описание", [product])
+    product.quantity = 3
+    assert first.total_quantity == 3
+    assert second.total_quantity == 3
+
+
+def test_pickled_product_leaves_its_categories_behind():
+    smartphone = Smartphone("iPhone", "Флагман", 100000, 5, "A15", "iPhone 13", 256, "Черный")
+    category = Category("Смартфоны", "Описание", [smartphone])
+    str(smartphone)
+
+    copy = pickle.loads(pickle.dumps(smartphone))
+    copy.quantity = 1
+
+    assert (copy._owners, copy._rendered) == (None, None)
+    assert str(copy) == "iPhone, 100000 руб. Остаток: 1 шт., модель: iPhone 13, память: 256 ГБ, цвет: Черный"
+    assert copy.efficiency == "A15"
+    assert category.total_quantity == 5
+
+
+def test_product_str_cache_is_invalidated():
+    """Проверяет, что кэш строки сбрасывается при изменении цены, остатка и описательных полей"""
+    smartphone = Smartphone("iPhone", "Флагман", 100000, 5, "A15", "iPhone 13", 256, "Черный")
+    assert str(smartphone) is str(smartphone)
+    smartphone.price = 90000
+    smartphone.quantity = 2
+    smartphone.color = "Белый"
+    assert str(smartphone) == "iPhone, 90000 руб. Остаток: 2 шт., модель: iPhone 13, память: 256 ГБ, цвет: Белый"
+
+
+def test_category_products_listing_is_memoized():
+    product = Product("Ноутбук", "Мощный", 100, 5)
+    category = Category("Электроника", "Техника", [product])
+    assert category.products == ["Ноутбук, 100 руб. Остаток: 5 шт."]
+    assert category._listing is not None
+
+    category.products.append("мусор")
+    assert category.products == ["Ноутбук, 100 руб. Остаток: 5 шт."]
+
+    product.name = "Ультрабук"
+    assert category.products == ["Ультрабук, 100 руб. Остаток: 5 шт."]
+    category.add_product(Product("Мышь", "Беспроводная", 10, 1))
+    assert category.products[-1] == "Мышь, 10 руб. Остаток: 1 шт."
+
+
+@pytest.fixture
+def indexed_category():
+    products = [
+        Product("Ноутбук", "Мощный", 90000, 3),
+        Product("Смартфон", "Флагман", 70000, 10),
+        Product("Мышь", "Беспроводная", 1500, 1),
+        Product("Смартфон", "Бюджетный", 15000, 25),
+    ]
+    return Category("Электроника", "Техника", products), products
+
+
+def test_category_find_by_name(indexed_category):
+    category, products = indexed_category
+    assert category.find_by_name("Смартфон") == [products[1], products[3]]
+    assert category.find_by_name("Телевизор") == []
+
+
+def test_category_price_queries(indexed_category):
+    category, products = indexed_category
+    assert category.products_in_price_range(1500, 70000) == [products[2], products[3], products[1]]
+    assert category.cheapest(2) == [products[2], products[3]]
+    assert category.most_expensive(1) == [products[0]]
+    assert category.low_stock(3) == [products[2], products[0]]
+
+
+def test_category_indexes_follow_changes(indexed_category):
+    category, products = indexed_category
+    category.cheapest()  # строит индексы
+    new_product = Product("Планшет", "Сенсорный", 500, 2)
+    category.add_product(new_product)
+    products[0].price = 100
+    products[1].quantity = 0
+    products[2].name = "Клавиатура"
+
+    assert category.cheapest(2) == [products[0], new_product]
+    assert category.low_stock(0) == [products[1]]
+    assert category.find_by_name("Мышь") == []
+    assert category.find_by_name("Клавиатура") == [products[2]]
+
+
+def test_category_indexes_after_many_changes_match_products():
+    products = [Product(f"Товар {i}", "Описание", 100 + i % 7, 1 + i % 5) for i in range(100)]
+    category = Category("Склад", "Описание", list(products))
+    category.cheapest()  # строит индексы
+    for i, product in enumerate(products):
+        product.price = 1000 - i % 13
+        product.quantity = 1 + i % 3
+    for product in products[::10]:
+        category.remove_product(product)
+    remaining = [product for product in products if product not in products[::10]]
+
+    by_price = sorted(remaining, key=lambda product: product.price)
+    assert category.cheapest(len(remaining)) == by_price
+    assert category.products_in_price_range(990, 995) == [p for p in by_price if 990 <= p.price <= 995]
+    assert set(category.low_stock(1)) == {p for p in remaining if p.quantity == 1}
+    products[1].price = 1
+    assert category.cheapest(1) == [products[1]]
+
+
+def test_category_sums_do_not_drift_after_add_remove_cycles():
+    product = Product("Товар", "Описание", 0.3, 1)
+    category = Category("Категория", "Описание", [product])
+    for price in (0.1, 0.7, 1234.57, 99.99, 1_000_000.01) * 100:
+        other = Product("Другой", "Описание", price, 3)
+        category.add_product(other)
+        other.price = price * 2
+        category.remove_product(other)
+
+    assert category.middle_price() == 0.3
+    assert category.stock_value == 0.3
+
+    category.remove_product(product)
+    assert (category.middle_price(), category.stock_value, category._price_sum) == (0, 0.0, 0.0)
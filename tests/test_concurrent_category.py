@@ -0,0 +1,131 @@
+import sys
+import threading
+
+import pytest
+
+from src.classes import Category, Product
+from src.concurrent_category import ConcurrentCategory
+
+pytestmark = pytest.mark.usefixtures("quiet_log")
+
+WRITERS = 8
+PRODUCTS_PER_WRITER = 300
+
+
+def test_concurrent_category_behaves_like_category():
+    product = Product("Ноутбук", "Мощный", 100, 5)
+    category = ConcurrentCategory("Электроника", "Техника", [product])
+    category.add_product(Product("Мышь", "Беспроводная", 50, 2))
+    product.price = 200
+
+    assert category.snapshot()[0] is product
+    assert category.middle_price() == 125
+    assert category.total_quantity == 7
+    assert category.products == ["Ноутбук, 200 руб. Остаток: 5 шт.", "Мышь, 50 руб. Остаток: 2 шт."]
+    assert category.cheapest(1)[0].name == "Мышь"
+    assert str(category) == "Электроника, общее количество товаров: 7 шт."
+
+
+def test_snapshot_is_not_affected_by_later_writes():
+    category = ConcurrentCategory("Электроника", "Техника")
+    before = category.snapshot()
+    category.add_products([Product("Мышь", "Беспроводная", 50, 2), Product("Клавиатура", "Механическая", 70, 1)])
+    assert before == ()
+    assert len(category.snapshot()) == 2
+
+
+def test_publishing_does_not_copy_products_and_remove_keeps_old_snapshots():
+    mouse, keyboard = Product("Мышь", "Беспроводная", 50, 2), Product("Клавиатура", "Механическая", 70, 1)
+    category = ConcurrentCategory("Электроника", "Техника", [mouse])
+    category.add_product(keyboard)
+    state = category._state
+
+    category.remove_product(mouse)
+
+    assert state.products is not category._products
+    assert state.items() == (mouse, keyboard)
+    assert category.snapshot() == (keyboard,)
+    category.add_product(mouse)
+    assert category._state.products is category._products
+    assert category.snapshot() == (keyboard, mouse)
+    assert category.middle_price() == 60
+
+
+def test_concurrent_writers_and_readers_keep_exact_counts():
+    """Стресс-тест: писатели добавляют товары, читатели проверяют согласованность снимков"""
+    category = ConcurrentCategory("Нагрузка", "Стресс-тест")
+    start = threading.Barrier(WRITERS + 2)
+    done = threading.Event()
+    inconsistencies = []
+
+    def writer(worker: int) -> None:
+        start.wait()
+        for i in range(PRODUCTS_PER_WRITER):
+            category.add_product(Product(f"Товар {worker}-{i}", "Описание", 10, 1))
+
+    def reader() -> None:
+        start.wait()
+        while not done.is_set():
+            state = category._state
+            if len(state.items()) != state.size or state.quantity_sum != state.size:
+                inconsistencies.append(state)
+            category.products
+
+    writers = [threading.Thread(target=writer, args=(worker,)) for worker in range(WRITERS)]
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    total = WRITERS * PRODUCTS_PER_WRITER
+    assert inconsistencies == []
+    assert len(category.snapshot()) == total
+    assert category.total_quantity == total
+    assert len(category.products) == total
+    assert Category.product_count == total
+    assert Category.category_count == 1
+
+
+def test_concurrent_writes_to_one_product_keep_aggregates_exact():
+    product = Product("Ноутбук", "Мощный", 100, 5)
+    category = ConcurrentCategory("Электроника", "Техника", [product, Product("Мышь", "Беспроводная", 50, 2)])
+    start = threading.Barrier(4)
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    def writer(worker: int) -> None:
+        start.wait()
+        for i in range(2_000):
+            product.quantity = worker * 10_000 + i + 1
+            product.price = float(worker * 100_000 + i + 1)
+
+    threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(previous_interval)
+
+    assert category.total_quantity == product.quantity + 2
+    assert category.middle_price() == (product.price + 50) / 2
+    assert category.stock_value == product.price * product.quantity + 100
+
+
+def test_class_counters_are_exact_under_threads():
+    def create_categories() -> None:
+        for _ in range(200):
+            Category("Категория", "Описание", [Product("Товар", "Описание", 10, 1)])
+
+    threads = [threading.Thread(target=create_categories) for _ in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert Category.category_count == WRITERS * 200
+    assert Category.product_count == WRITERS * 200
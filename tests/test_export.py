@@ -0,0 +1,155 @@
+import pytest
+
+from src.classes import Category, LawnGrass, Product, Smartphone
+from src.export import FORMATS, export_catalog, export_columns, iter_export_records, load_export
+from src.table import ProductTable
+from src.utils import load_data_from_json
+
+pytestmark = pytest.mark.usefixtures("quiet_log")
+
+EXTENSIONS = {"json": "json", "jsonl": "jsonl", "csv": "csv", "columnar": "ecol"}
+
+
+@pytest.fixture
+def catalog():
+    return [
+        Category(
+            "Смартфоны",
+            "Категория смартфонов, \"лучшие\"\nмодели",
+            [
+                Smartphone("Iphone 15", "512GB, Gray space", 210000.0, 8, "98.2", "15", 512, "Gray space"),
+                Product("Чехол", "Силикон", 990.5, 14),
+                Smartphone("Xiaomi", "1024GB", 31000.25, 3, "95", "Note 11", 1024, "Синий"),
+            ],
+        ),
+        Category("Пустая", "Без товаров"),
+        Category(
+            "Сад",
+            "Растения",
+            [
+                LawnGrass("Газон", "Для дачи", 500.0, 20, "Россия", "3 недели", "Зелёный"),
+                LawnGrass("Газон 2", "Для дачи", 0.1 + 0.2, 1, "США", "5 дней", "Зелёный"),
+            ],
+        ),
+    ]
+
+
+def _load(path, format):
+    return load_data_from_json(path) if format == "json" else load_export(path, format)
+
+
+def _snapshot(categories):
+    return [
+        (
+            category.name,
+            category.description,
+            category.products,
+            [(type(product), product.price, product.quantity) for product in category._products],
+        )
+        for category in categories
+    ]
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 10_000])
+@pytest.mark.parametrize("format", FORMATS)
+def test_round_trip(catalog, tmp_path, format, chunk_rows):
+    path = str(tmp_path / f"catalog.{EXTENSIONS[format]}")
+
+    written = export_catalog(catalog, path, chunk_rows=chunk_rows)
+    loaded = _load(path, format)
+
+    assert written == (5 if format == "json" else 6)
+    assert _snapshot(loaded) == _snapshot(catalog)
+    assert loaded[0]._products[0].memory == 512
+    assert loaded[2]._products[0].germination_period == "3 недели"
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_round_trip_keeps_empty_strings(tmp_path, format):
+    catalog = [
+        Category("Без описания", "", [Product("Чехол", "", 990.5, 14)]),
+        Category("", "", [Smartphone("", "", 100.0, 1, "", "", 64, "")]),
+        Category("Пустая", ""),
+    ]
+    path = str(tmp_path / f"catalog.{EXTENSIONS[format]}")
+
+    export_catalog(catalog, path)
+    loaded = _load(path, format)
+
+    assert _snapshot(loaded) == _snapshot(catalog)
+    assert [product.description for category in loaded for product in category._products] == ["", ""]
+    assert (loaded[1]._products[0].model, loaded[1]._products[0].color) == ("", "")
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_round_trip_of_loaded_file(tmp_path, format):
+    original = load_data_from_json("data/products.json")
+    path = str(tmp_path / "export.out")
+
+    export_catalog(original, path, format=format)
+
+    assert _snapshot(_load(path, format)) == _snapshot(original)
+
+
+def test_records_include_subclass_fields(catalog, tmp_path):
+    path = str(tmp_path / "catalog.jsonl")
+    export_catalog(catalog, path)
+
+    records = list(iter_export_records(path))
+
+    assert records[0] == {
+        "category": "Смартфоны",
+        "category_description": "Категория смартфонов, \"лучшие\"\nмодели",
+        "type": "smartphone",
+        "name": "Iphone 15",
+        "description": "512GB, Gray space",
+        "price": 210000.0,
+        "quantity": 8,
+        "efficiency": "98.2",
+        "model": "15",
+        "memory": 512,
+        "color": "Gray space",
+    }
+    assert records[3] == {"category": "Пустая", "category_description": "Без товаров"}
+
+
+def test_columnar_records_match_jsonl(catalog, tmp_path):
+    export_catalog(catalog, str(tmp_path / "catalog.jsonl"))
+    export_catalog(catalog, str(tmp_path / "catalog.ecol"), chunk_rows=4)
+
+    assert list(iter_export_records(str(tmp_path / "catalog.ecol"))) == list(
+        iter_export_records(str(tmp_path / "catalog.jsonl"))
+    )
+
+
+def test_product_table_views_export_as_products(tmp_path):
+    table = ProductTable([Product("Мышь", "Беспроводная", 50.0, 2)])
+    path = str(tmp_path / "table.csv")
+
+    export_catalog([Category("Периферия", "Устройства", table)], path)
+
+    assert [record["type"] for record in iter_export_records(path)] == ["product"]
+
+
+def test_columns_cover_all_registered_fields():
+    assert export_columns()[:7] == (
+        "category", "category_description", "type", "name", "description", "price", "quantity"
+    )
+    assert {"memory", "country", "germination_period", "color"} <= set(export_columns())
+
+
+def test_unknown_format(catalog, tmp_path):
+    with pytest.raises(ValueError, match="формат"):
+        export_catalog(catalog, str(tmp_path / "catalog.xml"))
+    with pytest.raises(ValueError, match="Неизвестный формат"):
+        export_catalog(catalog, str(tmp_path / "catalog.out"), format="xml")
+    with pytest.raises(ValueError, match="load_data_from_json"):
+        list(iter_export_records(str(tmp_path / "catalog.json")))
+
+
+def test_columnar_rejects_other_files(tmp_path):
+    path = tmp_path / "catalog.ecol"
+    path.write_bytes(b"not a catalog")
+
+    with pytest.raises(ValueError, match="колоночной выгрузкой"):
+        list(iter_export_records(str(path)))
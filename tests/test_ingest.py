@@ -0,0 +1,63 @@
+import pytest
+
+from src.classes import Category
+from src.ingest import find_feeds, load_feeds_parallel
+
+
+@pytest.fixture
+def feeds(tmp_path, write_catalog):
+    write_catalog(
+        [
+            {
+                "name": "Смартфоны",
+                "description": "Смартфоны от поставщика A",
+                "products": [
+                    {"name": "Iphone 15", "description": "512GB", "price": 210000.0, "quantity": 8},
+                    {"name": "Брак", "description": "Нет цены", "quantity": 1},
+                ],
+            }
+        ],
+        "supplier_a.json",
+    )
+    write_catalog(
+        [
+            {
+                "name": "Смартфоны",
+                "description": "Смартфоны от поставщика B",
+                "products": [{"name": "Xiaomi", "description": "1024GB", "price": "31000", "quantity": "14"}],
+            },
+            {
+                "name": "Телевизоры",
+                "description": "Телевизоры",
+                "products": [{"name": "QLED", "description": "4K", "price": 123000.0, "quantity": 0}],
+            },
+        ],
+        "supplier_b.json",
+    )
+    (tmp_path / "notes.txt").write_text("не фид", encoding="utf-8")
+    return tmp_path
+
+
+def test_find_feeds_in_directory_and_glob(feeds):
+    assert [path.rsplit("/", 1)[-1] for path in find_feeds(str(feeds))] == ["supplier_a.json", "supplier_b.json"]
+    assert len(find_feeds(str(feeds / "supplier_*.json"))) == 2
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_load_feeds_parallel_merges_categories(feeds, max_workers):
+    categories, errors = load_feeds_parallel(str(feeds), max_workers=max_workers)
+
+    by_name = {category.name: category for category in categories}
+    assert list(by_name) == ["Смартфоны", "Телевизоры"]
+    assert by_name["Смартфоны"].description == "Смартфоны от поставщика A"
+    assert by_name["Смартфоны"].products == [
+        "Iphone 15, 210000 руб. Остаток: 8 шт.",
+        "Xiaomi, 31000 руб. Остаток: 14 шт.",
+    ]
+    assert by_name["Телевизоры"].products == []
+    assert [(error.category, error.row, error.field) for error in errors] == [
+        ("Смартфоны", 1, "price"),
+        ("Телевизоры", 0, "quantity"),
+    ]
+    assert Category.category_count == 2
+    assert Category.product_count == 2
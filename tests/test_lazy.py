@@ -0,0 +1,117 @@
+import copy
+
+import pytest
+
+from src.classes import Category, Product, Smartphone
+from src.lazy import LazyProducts
+from src.utils import load_data_from_json
+
+CATALOG = [
+    {
+        "name": "Смартфоны",
+        "description": "Категория смартфонов",
+        "products": [
+            {
+                "type": "smartphone",
+                "name": "Iphone 15",
+                "description": "512GB, Gray space",
+                "price": 210000.0,
+                "quantity": 8,
+                "efficiency": 98.2,
+                "model": "15",
+                "memory": 512,
+                "color": "Gray space",
+            },
+            {"name": "Чехол", "description": "Силикон", "price": "990.5", "quantity": "14"},
+            {
+                "type": "lawn_grass",
+                "name": "Газон",
+                "description": "Для дачи",
+                "price": 500,
+                "quantity": 20,
+                "country": "Россия",
+                "germination_period": "3 недели",
+                "color": "Зелёный",
+            },
+        ],
+    },
+    {"name": "Пустая", "description": "Без товаров", "products": []},
+]
+
+
+@pytest.fixture
+def catalog_data():
+    return copy.deepcopy(CATALOG)
+
+
+@pytest.fixture
+def log(use_sink, list_sink):
+    return use_sink(list_sink).records
+
+
+def test_summary_without_materialization(catalog_file, log):
+    phones, empty = load_data_from_json(catalog_file, lazy=True)
+
+    assert isinstance(phones._products, LazyProducts)
+    assert str(phones) == "Смартфоны, общее количество товаров: 42 шт."
+    assert phones.middle_price() == pytest.approx((210000.0 + 990.5 + 500) / 3)
+    assert phones.stock_value == pytest.approx(210000.0 * 8 + 990.5 * 14 + 500 * 20)
+    assert len(phones._products) == 3
+    assert (Category.category_count, Category.product_count) == (2, 3)
+    assert empty.middle_price() == 0
+    assert phones._products.materialized_count == 0
+    assert log == []
+
+
+def test_lazy_matches_eager(catalog_file, log):
+    eager = load_data_from_json(catalog_file)
+    lazy = load_data_from_json(catalog_file, lazy=True)
+
+    assert [category.products for category in lazy] == [category.products for category in eager]
+    assert [str(category) for category in lazy] == [str(category) for category in eager]
+    assert [type(product) for product in lazy[0]._products] == [type(product) for product in eager[0]._products]
+    assert lazy[0]._products[0].memory == 512
+    assert lazy[0]._products[2].country == "Россия"
+
+
+def test_products_materialize_once_on_access(catalog_file, log):
+    phones = load_data_from_json(catalog_file, lazy=True)[0]
+
+    phone = phones._products[0]
+
+    assert isinstance(phone, Smartphone)
+    assert phones._products[0] is phone
+    assert phones._products.materialized_count == 1
+    assert [record.name for record in log] == ["Iphone 15"]
+
+
+def test_materialized_product_updates_category(catalog_file, log):
+    phones = load_data_from_json(catalog_file, lazy=True)[0]
+
+    phones._products[1].quantity = 4
+    phones.add_product(Product("Плёнка", "Защитная", 300, 2))
+
+    assert str(phones) == "Смартфоны, общее количество товаров: 34 шт."
+    assert phones.products[-1] == "Плёнка, 300 руб. Остаток: 2 шт."
+    assert phones.cheapest(1)[0].name == "Плёнка"
+
+
+def test_remove_materialized_product(catalog_file, log):
+    phones = load_data_from_json(catalog_file, lazy=True)[0]
+    case = phones._products[1]
+
+    phones.remove_product(case)
+
+    assert case not in phones._products
+    assert [product.name for product in phones._products] == ["Iphone 15", "Газон"]
+    assert phones.total_quantity == 28
+    assert Category.product_count == 2
+
+
+def test_zero_quantity_rejected_before_categories_are_created(catalog_data, write_catalog):
+    catalog_data[0]["products"][1]["quantity"] = 0
+    path = write_catalog(catalog_data, "zero.json")
+
+    with pytest.raises(ValueError, match="нулевым количеством"):
+        load_data_from_json(path, lazy=True)
+    assert Category.category_count == 0
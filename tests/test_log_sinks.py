@@ -0,0 +1,55 @@
+import io
+
+import pytest
+
+from src.classes import Product, Smartphone
+from src.log_sinks import BufferedSink, LogRecord, LogSink, NullSink, SampledSink
+
+
+def test_default_sink_prints_like_before(capfd):
+    Product("Ноутбук", "Мощный", 99999.99, 5)
+    out, _ = capfd.readouterr()
+    assert out == "Product(Ноутбук, Мощный, 99999.99, 5)\n"
+
+
+def test_records_are_structured(use_sink, list_sink):
+    sink = use_sink(list_sink)
+    Smartphone("iPhone", "Флагман", 100000, 5, "A15", "iPhone 13", 256, "Черный")
+    assert sink.records == [LogRecord("Smartphone", "iPhone", "Флагман", 100000, 5)]
+
+
+def test_null_sink_is_silent(use_sink, capfd):
+    use_sink(NullSink())
+    Product("Ноутбук", "Мощный", 99999.99, 5)
+    out, _ = capfd.readouterr()
+    assert out == ""
+
+
+def test_sampled_sink_forwards_every_nth(use_sink, list_sink):
+    use_sink(SampledSink(list_sink, every=3))
+    for i in range(7):
+        Product(f"Товар {i}", "Описание", 100, 1)
+    assert [record.name for record in list_sink.records] == ["Товар 0", "Товар 3", "Товар 6"]
+
+
+def test_sampled_sink_rejects_bad_rate():
+    with pytest.raises(ValueError):
+        SampledSink(NullSink(), every=0)
+
+
+def test_buffered_sink_writes_batches(use_sink):
+    stream = io.StringIO()
+    sink = use_sink(BufferedSink(stream, batch_size=4))
+    for i in range(10):
+        Product(f"Товар {i}", "Описание", 100, 1)
+    sink.close()
+    lines = stream.getvalue().splitlines()
+    assert lines == [f"Product(Товар {i}, Описание, 100, 1)" for i in range(10)]
+
+
+def test_sink_without_emit_cannot_be_created():
+    class Incomplete(LogSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
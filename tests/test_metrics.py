@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+
+from src.classes import Category, Product, Smartphone
+from src.concurrent_category import ConcurrentCategory
+from src.metrics import (
+    ADD_PRODUCT_SECONDS,
+    LOAD_SECONDS,
+    LOADED_PRODUCTS,
+    NEW_PRODUCT_ERRORS,
+    PRODUCT_INIT_SECONDS,
+    QUERY_SECONDS,
+    metrics,
+)
+from src.table import ProductTable
+from src.utils import load_data_from_json
+
+
+@pytest.fixture
+def enabled(quiet_log):
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_metrics_leave_methods_untouched():
+    original = Category.__dict__["add_product"]
+    metrics.enable()
+    assert Category.__dict__["add_product"] is not original
+    metrics.disable()
+    assert Category.__dict__["add_product"] is original
+    Category("Пусто", "Без товаров").middle_price()
+    assert QUERY_SECONDS.count("middle_price") == 0
+
+
+def test_catalog_operations_are_recorded(enabled, write_catalog):
+    Smartphone("Телефон", "Смартфон", 100.0, 1, 95.5, "S23", 256, "Серый")
+    with pytest.raises(ValueError):
+        Product.new_product({"name": "Ошибка", "description": "Описание", "price": 1.0, "quantity": -1})
+    category = ConcurrentCategory("Электроника", "Техника")
+    category.add_product(Product("Мышь", "USB", 10.0, 1))
+    category.middle_price()
+    category.total_quantity
+
+    products = [{"name": "Товар", "description": "Описание", "price": 1.0, "quantity": 1}]
+    load_data_from_json(write_catalog([{"name": "К", "description": "О", "products": products}]))
+
+    # конструкторы по цепочке super() и переопределённый add_product учитываются один раз
+    assert PRODUCT_INIT_SECONDS.count("Smartphone") == 1
+    assert PRODUCT_INIT_SECONDS.count("Product") == 2
+    assert NEW_PRODUCT_ERRORS.value("ValueError") == 1
+    assert ADD_PRODUCT_SECONDS.count("ConcurrentCategory") == 1
+    assert QUERY_SECONDS.count("middle_price") == 1
+    assert QUERY_SECONDS.count("total_quantity") == 1
+    assert LOAD_SECONDS.count("json") == 1
+    assert LOADED_PRODUCTS.value("json") == 1
+
+
+def test_product_table_views_are_not_counted_as_constructions(enabled):
+    table = ProductTable([Product("Мышь", "USB", 10.0, 1)])
+    metrics.reset()
+
+    for _ in range(10):
+        table[0]
+
+    assert PRODUCT_INIT_SECONDS.count("ProductView") == 0
+    assert PRODUCT_INIT_SECONDS.count("Product") == 0
+
+
+def test_counts_are_exact_under_threads(enabled):
+    category = ConcurrentCategory("Нагрузка", "Потоки")
+
+    def worker():
+        for number in range(500):
+            category.add_product(Product(f"Товар {number}", "Описание", 1.0, 1))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ADD_PRODUCT_SECONDS.count("ConcurrentCategory") == 4000
+    assert PRODUCT_INIT_SECONDS.count("Product") == 4000
+
+
+def test_exports(enabled, tmp_path):
+    Category("Электроника", "Техника", [Product("Мышь", "USB", 10.0, 1)]).middle_price()
+
+    snapshot = metrics.snapshot()
+    query = snapshot["catalog_query_seconds"]
+    assert query["type"] == "histogram"
+    assert query["samples"][0]["labels"] == {"query": "middle_price"}
+    assert query["samples"][0]["buckets"]["+Inf"] == 1
+
+    path = tmp_path / "catalog.prom"
+    metrics.write_prometheus(str(path))
+    text = path.read_text(encoding="utf-8")
+    assert "# TYPE catalog_query_seconds histogram" in text
+    assert 'catalog_query_seconds_bucket{query="middle_price",le="+Inf"} 1' in text
+    assert 'catalog_query_seconds_count{query="middle_price"} 1' in text
@@ -0,0 +1,145 @@
+import json
+import math
+
+import pytest
+
+import src.parsers as parsers
+from benchmarks.catalog import generate_catalog
+from src.classes import Category, LawnGrass, Smartphone
+from src.parsers import ParsedCategory, Parser, SchemaParser, StdlibParser, available_parsers, get_parser
+from src.registry import RecordError
+from src.utils import iter_categories_from_json, load_data_from_json
+
+
+@pytest.fixture(params=available_parsers())
+def parser(request):
+    return get_parser(request.param)
+
+
+def encode(catalog):
+    return json.dumps(catalog, ensure_ascii=False).encode("utf-8")
+
+
+def test_default_parser_is_schema():
+    assert available_parsers()[0] == "schema"
+    assert isinstance(get_parser(), SchemaParser)
+
+
+def test_unknown_and_unavailable_parsers(monkeypatch):
+    with pytest.raises(ValueError):
+        get_parser("yaml")
+    monkeypatch.setattr(parsers.OrjsonParser, "available", False)
+    assert "orjson" not in available_parsers()
+    with pytest.raises(ValueError):
+        get_parser("orjson")
+    assert isinstance(get_parser().raw, StdlibParser)
+
+
+def test_parser_without_loads_cannot_be_created():
+    class Incomplete(Parser):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_parsers_agree_on_synthetic_catalog(parser):
+    data = encode(generate_catalog(3, 50, seed=1))
+    assert parser.parse(data) == StdlibParser().parse(data)
+
+
+def test_mixed_and_mistyped_records_keep_order(parser):
+    catalog = [
+        {
+            "name": "Смешанная",
+            "description": "Разные типы",
+            "products": [
+                {"name": "A", "description": "a", "price": "100", "quantity": "2"},
+                {
+                    "type": "lawn_grass", "name": "G", "description": "g", "price": 10.5, "quantity": 3,
+                    "country": "Россия", "germination_period": "7 дней", "color": "Зеленый",
+                },
+                {"name": "B", "description": "b", "price": 5.0, "quantity": 1},
+            ],
+        }
+    ]
+    [category] = parser.parse(encode(catalog))
+    assert category == ParsedCategory(
+        "Смешанная",
+        "Разные типы",
+        [
+            ("product", ("A", "a", 100.0, 2)),
+            ("lawn_grass", ("G", "g", 10.5, 3, "Россия", "7 дней", "Зеленый")),
+            ("product", ("B", "b", 5.0, 1)),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "record, field",
+    [
+        ({"name": "A", "description": "a", "price": -1.0, "quantity": 1}, "price"),
+        ({"name": "A", "description": "a", "price": 1.0, "quantity": -1}, "quantity"),
+        ({"name": "A", "description": "a", "price": 1.0}, "quantity"),
+        ({"type": "boat", "name": "A", "description": "a", "price": 1.0, "quantity": 1}, "type"),
+    ],
+)
+def test_invalid_records_raise_record_error(parser, record, field):
+    valid = {"name": "B", "description": "b", "price": 2.0, "quantity": 1}
+    catalog = [{"name": "C", "description": "c", "products": [valid, record]}]
+    with pytest.raises(RecordError) as error:
+        parser.parse(encode(catalog))
+    assert error.value.field == field
+
+
+def test_nan_price_does_not_hide_negative_price():
+    parser = SchemaParser(StdlibParser())
+    records = [
+        {"name": "A", "description": "a", "price": math.nan, "quantity": 1},
+        {"name": "B", "description": "b", "price": -1.0, "quantity": 1},
+    ]
+    with pytest.raises(RecordError):
+        parser.rows(records)
+
+
+def test_not_an_array(parser):
+    with pytest.raises(ValueError):
+        parser.parse(b'{"name": "C"}')
+
+
+def test_load_data_from_json_with_parsers(tmp_path, parser):
+    path = tmp_path / "products.json"
+    path.write_bytes(encode(generate_catalog(2, 20, seed=3)))
+    categories = load_data_from_json(str(path), parser=parser)
+    expected = list(iter_categories_from_json(str(path)))
+    assert [str(category) for category in categories] == [str(category) for category in expected]
+    assert [category.products for category in categories] == [category.products for category in expected]
+    assert {type(product) for category in categories for product in category._products} == {Smartphone, LawnGrass}
+
+
+def test_invalid_file_does_not_change_counters(tmp_path):
+    valid = {"name": "A", "description": "a", "price": 1.0, "quantity": 1}
+    invalid = {"name": "B", "description": "b", "price": "x", "quantity": 1}
+    catalog = [
+        {"name": "C1", "description": "c", "products": [valid]},
+        {"name": "C2", "description": "c", "products": [invalid]},
+    ]
+    path = tmp_path / "products.json"
+    path.write_bytes(encode(catalog))
+    with pytest.raises(RecordError):
+        load_data_from_json(str(path))
+    assert Category.category_count == 0
+    assert Category.product_count == 0
+
+
+def test_zero_quantity_rejected_before_categories_are_created(write_catalog, parser):
+    valid = {"name": "A", "description": "a", "price": 1.0, "quantity": 1}
+    zero = {"name": "B", "description": "b", "price": 1.0, "quantity": 0}
+    catalog = [
+        {"name": "C1", "description": "c", "products": [valid]},
+        {"name": "C2", "description": "c", "products": [zero]},
+    ]
+    with pytest.raises(RecordError, match="нулевым количеством"):
+        load_data_from_json(write_catalog(catalog), parser=parser)
+    assert Category.category_count == 0
+    assert Category.product_count == 0
@@ -0,0 +1,85 @@
+import pytest
+
+from src.classes import LawnGrass, Product, Smartphone
+from src.registry import ProductRegistry, RecordError, product_registry
+from src.utils import load_data_from_json
+
+
+class Laptop(Product):
+    __slots__ = ("cpu",)
+
+    def __init__(self, name: str, description: str, price: float, quantity: int, cpu: str):
+        super().__init__(name, description, price, quantity)
+        self.cpu = cpu
+
+
+def test_loader_builds_subclasses(write_catalog):
+    path = write_catalog(
+        [
+            {
+                "name": "Смешанная",
+                "description": "Разные товары",
+                "products": [
+                    {
+                        "type": "smartphone",
+                        "name": "iPhone",
+                        "description": "Флагман",
+                        "price": "100000",
+                        "quantity": 5,
+                        "efficiency": "A15",
+                        "model": "iPhone 13",
+                        "memory": "256",
+                        "color": "Черный",
+                    },
+                    {
+                        "type": "lawn_grass",
+                        "name": "Газонная трава",
+                        "description": "Для дачи",
+                        "price": 500,
+                        "quantity": 20,
+                        "country": "Россия",
+                        "germination_period": "3 недели",
+                        "color": "Зелёный",
+                    },
+                    {"name": "Чехол", "description": "Силикон", "price": 990, "quantity": 40},
+                ],
+            }
+        ]
+    )
+    phone, grass, case = load_data_from_json(path)[0]._products
+
+    assert type(phone) is Smartphone and phone.memory == 256 and phone.price == 100000.0
+    assert type(grass) is LawnGrass and grass.country == "Россия"
+    assert type(case) is Product
+
+
+def test_registry_accepts_new_types():
+    registry = ProductRegistry()
+    registry.register("laptop", Laptop, {"cpu": str})
+    laptop = registry.build(
+        {"type": "laptop", "name": "Ноутбук", "description": "Мощный", "price": 1, "quantity": 1, "cpu": "M3"}
+    )
+    assert isinstance(laptop, Laptop) and laptop.cpu == "M3"
+    assert "laptop" not in product_registry
+
+
+@pytest.mark.parametrize(
+    "record, field",
+    [
+        ({"type": "tablet", "name": "Т", "description": "О", "price": 1, "quantity": 1}, "type"),
+        ({"name": "Т", "description": "О", "quantity": 1}, "price"),
+        ({"name": "Т", "description": "О", "price": "дорого", "quantity": 1}, "price"),
+        ({"name": "Т", "description": "О", "price": 1, "quantity": -1}, "quantity"),
+        ({"name": "Т", "description": "О", "price": 1, "quantity": 0}, "quantity"),
+        ({"name": None, "description": "О", "price": 1, "quantity": 1}, "name"),
+        ({"name": "Т", "description": ["a"], "price": 1, "quantity": 1}, "description"),
+        (
+            {"type": "smartphone", "name": "Т", "description": "О", "price": 1, "quantity": 1, "model": "M"},
+            "efficiency",
+        ),
+    ],
+)
+def test_registry_reports_bad_records(record, field):
+    with pytest.raises(RecordError) as error:
+        product_registry.build(record)
+    assert error.value.field == field
@@ -0,0 +1,74 @@
+import pytest
+
+from src.classes import Category, Product
+from src.concurrent_category import ConcurrentCategory
+from src.report_cache import ReportCache
+from src.repricing import reprice
+
+
+@pytest.fixture
+def category():
+    return Category(
+        "Электроника",
+        "Техника",
+        [Product("Телефон", "Смартфон", 100.0, 2), Product("Ноутбук", "Игровой", 1000.0, 1)],
+    )
+
+
+def test_reports_are_cached_until_category_changes(category):
+    assert category.report("most_expensive", 1) == ("Ноутбук, 1000 руб. Остаток: 1 шт.",)
+    assert category.report("most_expensive", 1) == ("Ноутбук, 1000 руб. Остаток: 1 шт.",)
+    assert category.report_stats()[:2] == (1, 1)
+
+    category.add_product(Product("Мышь", "USB", 5000.0, 3))
+    assert category.report("most_expensive", 1) == ("Мышь, 5000 руб. Остаток: 3 шт.",)
+
+    category._products[0].price = 50.0
+    assert category.report("price_band", 0, 60) == ("Телефон, 50 руб. Остаток: 2 шт.",)
+
+    reprice(category, percent=100)
+    assert category.report("middle_price") == (100.0 + 2000.0 + 10000.0) / 3
+
+    category.name = "Гаджеты"
+    assert category.report("summary") == "Гаджеты, общее количество товаров: 6 шт."
+    assert category.report_stats().hits == 1
+
+
+def test_parameters_are_part_of_the_key(category):
+    category.report("cheapest", 1)
+    category.report("cheapest", 2)
+    category.report("cheapest", 1)
+    stats = category.report_stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+
+
+def test_unknown_report(category):
+    with pytest.raises(ValueError):
+        category.report("nothing")
+
+
+def test_lru_eviction_by_entries_and_weight():
+    cache = ReportCache(max_entries=2, max_weight=3)
+    cache.get("a", 0, lambda: 1)
+    cache.get("b", 0, lambda: 2)
+    cache.get("a", 0, lambda: 1)
+    cache.get("c", 0, lambda: 3)
+    assert cache.get("a", 0, lambda: None) == 1
+    assert cache.stats().evictions == 1
+
+    cache.get("big", 0, lambda: ("x", "y", "z"))
+    assert len(cache) == 1
+    assert cache.stats().weight == 3
+    with pytest.raises(ValueError):
+        ReportCache(max_entries=0)
+
+
+def test_configured_limits_and_concurrent_category():
+    category = ConcurrentCategory("Аксессуары", "Мелочи", [Product("Чехол", "Силикон", 30.0, 1)])
+    category.configure_report_cache(max_entries=1)
+    category.report("summary")
+    category.report("middle_price")
+    category.add_product(Product("Кабель", "USB-C", 20.0, 4))
+    assert category.report("summary") == "Аксессуары, общее количество товаров: 5 шт."
+    stats = category.report_stats()
+    assert (stats.misses, stats.evictions, stats.entries) == (3, 2, 1)
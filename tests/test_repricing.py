@@ -0,0 +1,89 @@
+import pytest
+
+from src.classes import Category, Product
+from src.concurrent_category import ConcurrentCategory
+from src.repricing import PriceJournal, RepriceError, reprice
+from src.table import ProductTable
+
+
+@pytest.fixture
+def category():
+    return Category(
+        "Электроника",
+        "Техника",
+        [
+            Product("Телефон", "Смартфон", 100, 2),
+            Product("Ноутбук", "Игровой", 1000.0, 1),
+            Product("Мышь", "USB", 10, 5),
+        ],
+    )
+
+
+def assert_aggregates(category):
+    products = list(category._products)
+    assert category.middle_price() == pytest.approx(sum(p.price for p in products) / len(products))
+    assert category.stock_value == pytest.approx(sum(p.price * p.quantity for p in products))
+
+
+def test_percent_with_filter(category):
+    category.products_in_price_range(0, 10_000)
+    batch = reprice(category, percent=-10, where=lambda product: product.price >= 100)
+
+    assert [product.price for product in category._products] == [90.0, 900.0, 10]
+    assert batch.old_prices == [100, 1000.0]
+    assert category.products[0] == "Телефон, 90 руб. Остаток: 2 шт."
+    assert [product.name for product in category.products_in_price_range(50, 95)] == ["Телефон"]
+    assert_aggregates(category)
+
+
+def test_invalid_batch_changes_nothing(category):
+    with pytest.raises(RepriceError) as error:
+        reprice(category, amount=-50)
+    assert [change.product.name for change in error.value.invalid] == ["Мышь"]
+    assert [product.price for product in category._products] == [100, 1000.0, 10]
+    with pytest.raises(ValueError):
+        reprice(category)
+
+
+def test_rollback_restores_exact_prices(category):
+    journal = PriceJournal()
+    listing = category.products
+    journal.reprice(category, percent=15, ndigits=2)
+    rollback = journal.rollback()
+
+    assert rollback.rollback_of == 0
+    assert len(journal.batches) == 2
+    assert category.products == listing
+    assert_aggregates(category)
+    with pytest.raises(ValueError):
+        journal.rollback()
+
+
+def test_rollback_conflict(category):
+    journal = PriceJournal()
+    batch = journal.reprice(category, amount=5)
+    category._products[0].price = 1
+    with pytest.raises(RepriceError):
+        journal.rollback(batch)
+
+
+def test_shared_product_updates_every_owner():
+    shared = Product("Кабель", "USB-C", 20, 4)
+    first = Category("Провода", "Кабели", [shared])
+    second = ConcurrentCategory("Аксессуары", "Мелочи", [shared, Product("Чехол", "Силикон", 30, 1)])
+
+    batch = reprice([first, second], amount=10)
+
+    assert len(batch.products) == 2
+    assert shared.price == 30
+    assert first.stock_value == 120
+    assert second.middle_price() == 35
+    assert second.stock_value == 30 * 4 + 40
+
+
+def test_product_table_storage():
+    table = ProductTable.from_records([{"name": "Товар", "description": "Описание", "price": 10.0, "quantity": 3}])
+    category = Category("Таблица", "Колонки", table)
+    reprice(category, percent=50)
+    assert table[0].price == 15.0
+    assert category.stock_value == 45.0
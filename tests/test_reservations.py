@@ -0,0 +1,144 @@
+import random
+import threading
+
+import pytest
+
+from src.classes import Category, Product, Smartphone
+from src.concurrent_category import ConcurrentCategory
+from src.reservations import ReservationError, StockReservations
+from src.table import ProductTable
+
+pytestmark = pytest.mark.usefixtures("quiet_log")
+
+
+@pytest.fixture
+def category():
+    return Category(
+        "Электроника",
+        "Техника",
+        [
+            Product("Ноутбук", "Мощный", 100.0, 5),
+            Product("Мышь", "Беспроводная", 50.0, 2),
+            Smartphone("Iphone 15", "512GB", 210000.0, 8, 98.2, "15", 512, "Gray space"),
+        ],
+    )
+
+
+def test_reserve_decrements_stock_and_category_aggregates(category):
+    laptop, mouse, phone = category._products
+    engine = StockReservations()
+
+    reservation = engine.reserve({laptop: 2, mouse: 1})
+
+    assert [item.quantity for item in reservation.items] == [2, 1]
+    assert (laptop.quantity, mouse.quantity) == (3, 1)
+    assert category.total_quantity == 12
+    assert category.stock_value == 100.0 * 3 + 50.0 + 210000.0 * 8
+    assert category.low_stock(1) == [mouse]
+    assert str(laptop) == "Ноутбук, 100 руб. Остаток: 3 шт."
+    assert engine.pending() == (reservation,)
+
+
+def test_shortage_rejects_whole_order(category):
+    laptop, mouse, phone = category._products
+    engine = StockReservations()
+
+    with pytest.raises(ReservationError) as error:
+        engine.reserve([(laptop, 1), (mouse, 2), (mouse, 1), (phone, 1)])
+
+    assert [(shortage.product, shortage.requested, shortage.available) for shortage in error.value.shortages] == [
+        (mouse, 3, 2)
+    ]
+    assert (laptop.quantity, mouse.quantity, phone.quantity) == (5, 2, 8)
+    assert category.total_quantity == 15
+    assert len(engine) == 0
+
+
+def test_commit_and_release(category):
+    laptop, mouse, phone = category._products
+    engine = StockReservations()
+    sold = engine.reserve({laptop: 1})
+    cancelled = engine.reserve({laptop: 2, phone: 8})
+
+    engine.commit(sold)
+    engine.release(cancelled)
+
+    assert (laptop.quantity, phone.quantity) == (4, 8)
+    assert category.total_quantity == 14
+    assert len(engine) == 0
+    with pytest.raises(ValueError, match="уже подтверждён или снят"):
+        engine.release(sold)
+    with pytest.raises(ValueError, match="уже подтверждён или снят"):
+        engine.commit(cancelled)
+
+
+def test_reserve_allows_selling_out_but_not_below_zero(category):
+    laptop = category._products[0]
+    engine = StockReservations()
+
+    engine.reserve({laptop: 5})
+    with pytest.raises(ReservationError):
+        engine.reserve({laptop: 1})
+    engine.restock(laptop, 3)
+
+    assert laptop.quantity == 3
+
+
+@pytest.mark.parametrize("order", [{}, {"Ноутбук": 1}, [(None, 1)]])
+def test_invalid_order_items(order):
+    with pytest.raises((TypeError, ValueError)):
+        StockReservations().reserve(order)
+
+
+@pytest.mark.parametrize("quantity", [0, -1, 1.5, "2"])
+def test_invalid_quantity(category, quantity):
+    with pytest.raises(ValueError, match="положительным целым"):
+        StockReservations().reserve({category._products[0]: quantity})
+
+
+def test_product_table_views():
+    table = ProductTable([Product("Ноутбук", "Мощный", 100.0, 5), Product("Мышь", "Беспроводная", 50.0, 2)])
+    category = Category("Электроника", "Техника", table)
+    engine = StockReservations()
+
+    engine.reserve({table[0]: 4, table[1]: 2})
+
+    assert list(table._quantities) == [1, 0]
+    assert category.total_quantity == 1
+
+
+def test_concurrent_orders_never_oversell():
+    """Стресс-тест: потоки оформляют заказы из нескольких позиций, пока товар не закончится"""
+    products = [Product(f"Товар {i}", "Описание", 10.0 + i, 50) for i in range(10)]
+    categories = [ConcurrentCategory("Первая", "А", products[:5]), Category("Вторая", "Б", products[5:])]
+    engine = StockReservations(stripes=4)
+    start = threading.Barrier(8)
+    sold = [[0] * len(products) for _ in range(8)]
+
+    def buyer(worker: int) -> None:
+        rng = random.Random(worker)
+        start.wait()
+        for _ in range(400):
+            order = {product: rng.randint(1, 3) for product in rng.sample(products, 3)}
+            try:
+                reservation = engine.reserve(order)
+            except ReservationError:
+                continue
+            if rng.random() < 0.2:
+                engine.release(reservation)
+                continue
+            engine.commit(reservation)
+            for product, quantity in reservation.items:
+                sold[worker][products.index(product)] += quantity
+
+    threads = [threading.Thread(target=buyer, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    totals = [sum(column) for column in zip(*sold)]
+    assert all(product.quantity >= 0 for product in products)
+    assert [product.quantity for product in products] == [50 - total for total in totals]
+    assert sum(category.total_quantity for category in categories) == 500 - sum(totals)
+    assert len(engine) == 0
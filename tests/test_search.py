@@ -0,0 +1,183 @@
+import random
+
+import pytest
+
+from benchmarks.catalog import generate_catalog
+from src.classes import Category, CategoryListener, LawnGrass, Product, Smartphone
+from src.concurrent_category import ConcurrentCategory
+from src.registry import product_registry
+from src.repricing import reprice
+from src.search import SearchIndex, price_band_labels, tokenize
+from src.table import ProductTable
+
+
+@pytest.fixture
+def phones():
+    return Category(
+        "Смартфоны",
+        "Телефоны",
+        [
+            Product("Samsung Galaxy C23 Ultra", "256GB, Серый цвет, 200MP камера", 180000.0, 5),
+            Product("Iphone 15", "512GB, Gray space", 210000.0, 8),
+            Smartphone("Xiaomi Redmi", "Бюджетный", 31000.0, 14, "90", "Note 11", 1024, "Синий"),
+        ],
+    )
+
+
+@pytest.fixture
+def grass():
+    lawn = LawnGrass("Газон «Ёжик»", "Трава для дачи", 450.0, 20, "Россия", "7 дней", "Зелёный")
+    return Category("Трава", "Газон", [lawn])
+
+
+def names(result):
+    return [product.name for product in result.products]
+
+
+def test_tokenize_handles_cyrillic_and_mixed_words():
+    assert tokenize("256GB, Серый цвет, 200MP камера") == [
+        "256gb", "256", "gb", "серый", "цвет", "200mp", "200", "mp", "камера"
+    ]
+    assert tokenize("Ёжик ЗЕЛЁНЫЙ") == ["ежик", "зеленый"]
+
+
+def test_price_band_labels():
+    assert price_band_labels((1000, 5000)) == ["до 1000", "1000–5000", "от 5000"]
+
+
+def test_keyword_and_facet_queries(phones, grass):
+    index = SearchIndex([phones, grass])
+    assert len(index) == 4
+    assert names(index.search("samsung")) == ["Samsung Galaxy C23 Ultra"]
+    assert names(index.search("СЕРЫЙ камера")) == ["Samsung Galaxy C23 Ultra"]
+    assert names(index.search("ежик")) == ["Газон «Ёжик»"]
+    assert names(index.search("256")) == ["Samsung Galaxy C23 Ultra"]
+    assert names(index.search(memory=512)) == ["Iphone 15"]
+    assert names(index.search(color="серый")) == ["Samsung Galaxy C23 Ultra"]
+    assert names(index.search(color=["Синий", "Зеленый"])) == ["Xiaomi Redmi", "Газон «Ёжик»"]
+    assert names(index.search(country="россия", price_band="до 1000")) == ["Газон «Ёжик»"]
+    assert names(index.search("газон", category="Смартфоны")) == []
+    assert index.search().total == 4
+    with pytest.raises(ValueError):
+        index.search(weight=1)
+
+
+def test_facet_counts(phones, grass):
+    index = SearchIndex([phones, grass])
+    counts = index.facet_counts()
+    assert counts["memory"] == {256: 1, 512: 1, 1024: 1}
+    assert counts["color"] == {"Серый": 1, "Синий": 1, "Зеленый": 1}
+    assert counts["category"] == {"Смартфоны": 3, "Трава": 1}
+    assert counts["price_band"] == {"до 1000": 1, "10000–50000": 1, "от 100000": 2}
+
+    result = index.search(category="Смартфоны", price_band="от 100000")
+    assert result.total == 2
+    assert result.facets["memory"] == {256: 1, 512: 1}
+    assert result.facets["country"] == {}
+
+
+def test_prefix_and_limit(phones):
+    index = SearchIndex([phones])
+    assert names(index.search("gal*")) == ["Samsung Galaxy C23 Ultra"]
+    assert index.search("s*").total == 2
+    result = index.search(category="Смартфоны", limit=2)
+    assert result.total == 3
+    assert names(result) == ["Samsung Galaxy C23 Ultra", "Iphone 15"]
+
+
+def test_incremental_updates(phones):
+    index = SearchIndex([phones])
+    phone = Smartphone("Honor 90", "Новинка", 40000.0, 3, "95", "90", 256, "Черный")
+    phones.add_product(phone)
+    assert names(index.search("honor", memory=256)) == ["Honor 90"]
+
+    phone.description = "Уценка"
+    phone.price = 500.0
+    assert names(index.search("уценка", price_band="до 1000")) == ["Honor 90"]
+    assert index.search("новинка").total == 0
+
+    reprice(phones, percent=1000)
+    assert index.search("уценка", price_band="5000–10000").total == 1
+    assert index.facet_counts()["price_band"] == {"5000–10000": 1, "от 100000": 3}
+
+    phones.remove_product(phone)
+    assert index.search("honor").total == 0
+    assert index.facet_counts()["memory"] == {256: 1, 512: 1, 1024: 1}
+
+
+def test_product_in_several_categories(phones):
+    sale = Category("Распродажа", "Скидки", [phones._products[0]])
+    index = SearchIndex([phones, sale])
+    assert len(index) == 3
+    assert index.search("samsung").facets["category"] == {"Смартфоны": 1, "Распродажа": 1}
+
+    index.remove_category(sale)
+    sale.add_product(Product("Не в индексе", "Описание", 1.0, 1))
+    assert index.search("samsung").facets["category"] == {"Смартфоны": 1}
+    assert index.search("индексе").total == 0
+
+
+def test_table_and_concurrent_categories():
+    table = Category("Таблица", "Колонки", ProductTable([Product("Samsung A", "64GB, Белый цвет", 100.0, 1)]))
+    concurrent = ConcurrentCategory("Потоки", "Блокировки", [Product("Samsung B", "128GB", 200.0, 1)])
+    index = SearchIndex([table, concurrent])
+    table._products[0].price = 2000.0
+    concurrent.add_product(Product("Samsung C", "Черный цвет", 300.0, 1))
+    assert index.search("samsung").total == 3
+    assert names(index.search(price_band="1000–5000")) == ["Samsung A"]
+    assert index.facet_counts()["color"] == {"Белый": 1, "Черный": 1}
+
+
+def test_listener_receives_notifications(phones):
+    events = []
+
+    class Recorder(CategoryListener):
+        def products_added(self, category, products):
+            events.append(("bulk", len(products)))
+
+        def product_added(self, category, product):
+            events.append(("added", product.name))
+
+        def product_removed(self, category, product):
+            events.append(("removed", product.name))
+
+        def product_changed(self, category, product):
+            events.append(("changed", product.name))
+
+    phones.add_listener(Recorder())
+    product = Product("Новый", "Описание", 10.0, 1)
+    phones.add_product(product)
+    product.quantity = 2
+    reprice(phones, amount=1, where=lambda item: item is product)
+    phones.remove_product(product)
+    assert events == [
+        ("bulk", 3), ("added", "Новый"), ("changed", "Новый"), ("changed", "Новый"), ("removed", "Новый")
+    ]
+
+
+def test_matches_linear_scan_after_random_changes():
+    rng = random.Random(5)
+    categories = [
+        Category(data["name"], data["description"], [product_registry.build(record) for record in data["products"]])
+        for data in generate_catalog(3, 1500, seed=2)
+    ]
+    index = SearchIndex(categories)
+    for step in range(300):
+        category = rng.choice(categories)
+        action = rng.random()
+        if action < 0.3 and category._products:
+            category.remove_product(rng.choice(category._products))
+        elif action < 0.6:
+            category.add_product(Product(f"Samsung extra {step}", "64GB, Белый цвет", rng.uniform(100, 9000), 1))
+        elif category._products:
+            rng.choice(category._products).price = rng.uniform(100, 200_000)
+
+    products = [product for category in categories for product in category._products]
+    expected = [product for product in products if "samsung" in product.name.lower() and product.price < 5000]
+    result = index.search("samsung", price_band=["до 1000", "1000–5000"])
+    assert result.total == len(expected)
+    assert {id(product) for product in result.products} == {id(product) for product in expected}
+    white = sum(
+        1 for product in products if getattr(product, "color", "") == "Белый" or "Белый цвет" in product.description
+    )
+    assert index.facet_counts()["color"]["Белый"] == white
@@ -0,0 +1,147 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from src.classes import Category, LawnGrass, Product, Smartphone
+from src.concurrent_category import ConcurrentCategory
+from src.sharding import CatalogReader, ShardedCatalog
+
+
+def make_categories():
+    return [
+        Category("Смартфоны", "Телефоны", [
+            Smartphone("Samsung", "256GB", 180000.0, 5, "95", "S23", 256, "Серый"),
+            Smartphone("Iphone", "512GB", 210000.0, 8, "98", "15", 512, "Gray space"),
+        ]),
+        Category("Трава", "Газон", [LawnGrass("Газон", "Трава", 450.0, 20, "Россия", "7 дней", "Зеленый")]),
+        Category(
+            "Товары", "Разное", [Product("A", "a", 10.0, 3), Product("B", "b", 20.0, 1), Product("C", "c", 5.5, 2)]
+        ),
+    ]
+
+
+@pytest.fixture
+def catalog():
+    categories = make_categories()
+    with ShardedCatalog(categories, shards=2, spare_rows=1) as catalog:
+        yield catalog, {category.name: category for category in categories}
+
+
+def test_reads_match_categories(catalog):
+    catalog, originals = catalog
+    assert sorted(catalog.category_names) == sorted(originals)
+    assert {shard for shard, _ in catalog.descriptor.categories.values()} == {0, 1}
+    for name, category in originals.items():
+        assert catalog.middle_price(name) == category.middle_price()
+        assert catalog.total_quantity(name) == category.total_quantity
+        assert catalog.stock_value(name) == pytest.approx(category.stock_value)
+        assert catalog.reader.valuation(name) == pytest.approx(category.stock_value)
+    first, second = originals["Смартфоны"]._products
+    refs = catalog.find("Смартфоны", "Samsung") + catalog.find("Смартфоны", "Iphone")
+    assert catalog.reader.add(*refs) == first + second
+
+
+def test_writes_are_routed_to_owner(catalog):
+    catalog, _ = catalog
+    ref = catalog.add_product("Товары", {"name": "D", "description": "d", "price": "100", "quantity": 4})
+    catalog.add_product("Товары", Product("E", "e", 4.5, 2))
+    assert catalog.total_quantity("Товары") == 12
+    assert catalog.middle_price("Товары") == pytest.approx((10 + 20 + 5.5 + 100 + 4.5) / 5)
+
+    catalog.set_price("Товары", "A", 1.0)
+    catalog.set_quantity("Товары", "D", 1)
+    assert catalog.reader.add(catalog.find("Товары", "A")[0], ref) == 1.0 * 3 + 100.0
+    catalog.remove_product("Товары", "B")
+    assert catalog.reader.valuation("Товары") == pytest.approx(3 * 1.0 + 2 * 5.5 + 100 + 2 * 4.5)
+    assert catalog.products("Товары")[0] == "A, 1 руб. Остаток: 3 шт."
+
+    with pytest.raises(ValueError, match="Цена"):
+        catalog.set_price("Товары", "A", -1)
+    with pytest.raises(ValueError, match="Остаток"):
+        catalog.set_quantity("Товары", "A", -1)
+    assert catalog.reader.add(catalog.find("Товары", "A")[0], ref) == 1.0 * 3 + 100.0
+    with pytest.raises(KeyError):
+        catalog.set_price("Товары", "Нет такого", 1)
+    with pytest.raises(KeyError):
+        catalog.add_product("Нет такой категории", Product("X", "x", 1.0, 1))
+
+
+def test_products_owned_by_local_categories_are_sent_without_them(catalog):
+    catalog, _ = catalog
+    shared = Product("F", "f", 2.0, 5)
+    local = Category("Локальная", "Не в шарде", [shared])
+    guarded = Product("G", "g", 3.0, 1)
+    ConcurrentCategory("Потокобезопасная", "С блокировкой", [guarded])
+
+    catalog.add_product("Товары", shared)
+    catalog.add_product("Товары", guarded)
+    shared.quantity = 100
+
+    assert catalog.total_quantity("Товары") == 6 + 5 + 1
+    assert catalog.products("Товары")[-2:] == ["F, 2 руб. Остаток: 5 шт.", "G, 3 руб. Остаток: 1 шт."]
+    assert local.total_quantity == 100
+
+
+def test_mixed_types_are_not_added(catalog):
+    catalog, _ = catalog
+    phone = catalog.find("Смартфоны", "Samsung")[0]
+    grass = catalog.find("Трава", "Газон")[0]
+    with pytest.raises(TypeError):
+        catalog.reader.add(phone, grass)
+    catalog.add_product("Трава", Product("Семена", "Пакет", 10.0, 1))
+    with pytest.raises(TypeError):
+        catalog.reader.valuation("Трава")
+
+
+def _read_in_process(descriptor, queue):
+    with CatalogReader(descriptor) as reader:
+        queue.put({name: (reader.middle_price(name), reader.total_quantity(name)) for name in reader.category_names})
+
+
+def test_reader_in_other_process(catalog):
+    catalog, originals = catalog
+    catalog.add_product("Трава", LawnGrass("Газон 2", "Трава", 550.0, 1, "Россия", "7 дней", "Зеленый"))
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_read_in_process, args=(catalog.descriptor, queue))
+    process.start()
+    result = queue.get(timeout=30)
+    process.join(timeout=30)
+    assert result["Трава"] == (500.0, 21)
+    assert result["Смартфоны"] == (195000.0, 13)
+
+
+def test_readers_never_see_partial_writes():
+    categories = [Category("Одинаковые", "Цена 10", [Product("P", "p", 10.0, 1)])]
+    with ShardedCatalog(categories, shards=1, spare_rows=1) as catalog:
+        done = threading.Event()
+
+        def write():
+            for number in range(300):
+                catalog.add_product("Одинаковые", Product(f"P{number}", "p", 10.0, 1))
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        reads = 0
+        while not done.is_set() or reads < 10:
+            count, price_sum, quantity, stock_value = catalog.reader.totals("Одинаковые")
+            assert price_sum == 10.0 * count
+            assert quantity == count
+            reads += 1
+        writer.join()
+        assert catalog.total_quantity("Одинаковые") == 301
+        assert catalog.reader.valuation("Одинаковые") == 3010.0
+
+
+def test_from_json(write_catalog):
+    data = [
+        {"name": f"Категория {number}", "description": "d", "products": [
+            {"name": f"Товар {number}", "description": "d", "price": 10.0 * (number + 1), "quantity": number + 1}
+        ]}
+        for number in range(5)
+    ]
+    with ShardedCatalog.from_json(write_catalog(data), shards=2) as catalog:
+        assert sorted(catalog.category_names) == sorted(item["name"] for item in data)
+        assert catalog.middle_price("Категория 3") == 40.0
+        assert catalog.descriptor.categories["Категория 3"][0] == 1
@@ -0,0 +1,71 @@
+import pytest
+
+from src.classes import Category, LawnGrass, Product, Smartphone
+from src.snapshot import load_snapshot, save_snapshot
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    phones = Category(
+        "Смартфоны",
+        "Категория смартфонов",
+        [
+            Smartphone("iPhone", "Флагман", 100000, 5, "A15", "iPhone 13", 256, "Черный"),
+            Product("Чехол", "Силикон", 990.5, 40),
+        ],
+    )
+    garden = Category(
+        "Сад", "Растения", [LawnGrass("Газонная трава", "Для дачи", 500, 20, "Россия", "3 недели", "Зелёный")]
+    )
+    empty = Category("Пустая", "Без товаров")
+    path = tmp_path / "catalog.snap"
+    save_snapshot([phones, garden, empty], str(path))
+    Category.category_count = 0
+    Category.product_count = 0
+    return str(path)
+
+
+def test_snapshot_round_trip(snapshot_path, capfd):
+    phones, garden, empty = load_snapshot(snapshot_path)
+
+    assert (phones.name, phones.description) == ("Смартфоны", "Категория смартфонов")
+    assert phones.products == [
+        "iPhone, 100000 руб. Остаток: 5 шт., модель: iPhone 13, память: 256 ГБ, цвет: Черный",
+        "Чехол, 990 руб. Остаток: 40 шт.",
+    ]
+    grass = garden._products[0]
+    assert isinstance(grass, LawnGrass)
+    assert (grass.country, grass.germination_period, grass.color) == ("Россия", "3 недели", "Зелёный")
+    assert phones._products[0].memory == 256
+    assert len(empty.products) == 0
+    assert Category.category_count == 3
+    assert Category.product_count == 3
+    # товары восстанавливаются без логирования LogMixin
+    out, _ = capfd.readouterr()
+    assert out == ""
+
+
+def test_snapshot_summary_without_materialization(snapshot_path):
+    phones = load_snapshot(snapshot_path)[0]
+    assert str(phones) == "Смартфоны, общее количество товаров: 45 шт."
+    assert phones.middle_price() == (100000 + 990.5) / 2
+    assert phones.stock_value == 100000 * 5 + 990.5 * 40
+    assert phones._products.materialized_count == 0
+
+    phones._products[1].quantity = 10
+    assert phones._products.materialized_count == 1
+    assert phones.total_quantity == 15
+
+
+def test_snapshot_category_accepts_new_products(snapshot_path):
+    garden = load_snapshot(snapshot_path)[1]
+    garden.add_product(Product("Лейка", "10 литров", 700, 3))
+    assert len(garden.products) == 2
+    assert garden.total_quantity == 23
+
+
+def test_load_rejects_foreign_file(tmp_path):
+    path = tmp_path / "broken.snap"
+    path.write_bytes(b"\0" * 128)
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
@@ -0,0 +1,99 @@
+import pickle
+
+import pytest
+
+from src.classes import Category, Product, Smartphone
+from src.table import ProductTable
+
+
+@pytest.fixture
+def table():
+    return ProductTable.from_records(
+        [
+            {"name": "Ноутбук", "description": "Мощный", "price": 99999.99, "quantity": 5},
+            {"name": "Смартфон", "description": "Мощный", "price": "69999.99", "quantity": "10"},
+        ]
+    )
+
+
+def test_table_stores_columns(table):
+    assert len(table) == 2
+    assert list(table._prices) == [99999.99, 69999.99]
+    assert list(table._quantities) == [5, 10]
+    # одинаковые описания хранятся в пуле один раз
+    assert table._description_ids[0] == table._description_ids[1]
+
+
+def test_view_reads_and_writes_table(table):
+    view = table[1]
+    assert isinstance(view, Product)
+    assert view.name == "Смартфон"
+    assert str(view) == "Смартфон, 69999 руб. Остаток: 10 шт."
+    view.price = 50000
+    view.quantity = 3
+    assert table[-1].price == 50000
+    assert table[-1].quantity == 3
+    assert view == table[1]
+
+
+def test_view_price_setter_validation(table, capfd):
+    table[0].price = -1
+    out, _ = capfd.readouterr()
+    assert "Цена не должна быть нулевая или отрицательная" in out
+    assert table[0].price == 99999.99
+
+
+def test_table_rejects_zero_quantity_and_subclasses():
+    table = ProductTable()
+    with pytest.raises(ValueError):
+        ProductTable.from_records([{"name": "Т", "description": "О", "price": 1.0, "quantity": 0}])
+    with pytest.raises(TypeError):
+        table.append(Smartphone("iPhone", "Флагман", 100000, 5, "A15", "iPhone 13", 256, "Черный"))
+
+
+def test_category_with_table_storage(table):
+    category = Category("Электроника", "Техника", table)
+    category.add_product(Product("Планшет", "Сенсорный экран", 30000.0, 5))
+
+    assert Category.product_count == 3
+    assert len(category._products) == 3
+    assert category.products[-1] == "Планшет, 30000 руб. Остаток: 5 шт."
+    assert category.middle_price() == pytest.approx((99999.99 + 69999.99 + 30000.0) / 3)
+    assert str(category) == "Электроника, общее количество товаров: 20 шт."
+    assert table[0] + table[1] == pytest.approx(99999.99 * 5 + 69999.99 * 10)
+
+
+def test_category_aggregates_with_table_storage(table):
+    category = Category("Электроника", "Техника", table)
+    table[0].quantity = 1
+    category._products[1].price = 100
+    assert category.total_quantity == 11
+    assert category.stock_value == pytest.approx(99999.99 + 1000)
+
+
+def test_category_indexes_with_table_storage(table):
+    category = Category("Электроника", "Техника", table)
+    assert category.cheapest(1) == [table[1]]
+    table[1].price = 200000
+    assert category.most_expensive(1)[0].name == "Смартфон"
+    assert category.find_by_name("Ноутбук") == [table[0]]
+
+
+def test_pickled_view_is_a_plain_product():
+    table = ProductTable([Product("Мышь", "Беспроводная", 50.0, 2)])
+    Category("Периферия", "Устройства", table)
+
+    copy = pickle.loads(pickle.dumps(table[0]))
+
+    assert type(copy) is Product
+    assert (copy.name, copy.price, copy.quantity, copy._owners) == ("Мышь", 50.0, 2, None)
+
+
+def test_view_adds_up_with_plain_products():
+    table = ProductTable([Product("Мышь", "Беспроводная", 50.0, 2), Product("Коврик", "Тканевый", 5.0, 4)])
+
+    assert table[0] + Product("Клавиатура", "Механическая", 70.0, 1) == 170.0
+    assert Product("Клавиатура", "Механическая", 70.0, 1) + table[1] == 90.0
+    assert table[0] + table[1] == 120.0
+    with pytest.raises(TypeError, match="одного типа"):
+        table[0] + Smartphone("Iphone", "512GB", 210000.0, 1, "98", "15", 512, "Gray space")
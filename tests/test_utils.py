@@ -0,0 +1,142 @@
+import pytest
+
+from src.classes import Category, LawnGrass, Product
+from src.snapshot import load_snapshot, save_snapshot
+from src.utils import iter_categories_from_json, iter_raw_categories, load_data_from_json, reload_data_from_json
+
+
+def test_iter_raw_categories_with_small_chunks(catalog_file, catalog_data):
+    """Проверяет, что потоковый разбор с маленьким буфером даёт те же данные, что и json.load"""
+    assert list(iter_raw_categories(catalog_file, chunk_size=7)) == catalog_data
+
+
+def test_iter_raw_categories_empty_array(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text("  [ ]  ", encoding="utf-8")
+    assert list(iter_raw_categories(str(path))) == []
+
+
+def test_iter_raw_categories_not_array(tmp_path):
+    path = tmp_path / "object.json"
+    path.write_text("{}", encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_raw_categories(str(path)))
+
+
+def test_iter_categories_is_lazy(catalog_file):
+    """Проверяет, что генератор создаёт категории по одной"""
+    categories = iter_categories_from_json(catalog_file, chunk_size=16)
+    first = next(categories)
+    assert first.name == "Смартфоны"
+    assert Category.category_count == 1
+    assert first.products[1] == "Xiaomi Redmi Note 11, 31000 руб. Остаток: 14 шт."
+
+
+def test_load_data_from_json_returns_list(catalog_file):
+    categories = load_data_from_json(catalog_file)
+    assert [category.name for category in categories] == ["Смартфоны", "Телевизоры"]
+    assert Category.category_count == 2
+    assert Category.product_count == 3
+
+
+def test_reload_applies_only_changes(catalog_file, catalog_data, write_catalog):
+    categories = load_data_from_json(catalog_file)
+    phones = categories[0]
+    iphone, xiaomi = phones._products
+
+    updated = catalog_data
+    updated[0]["products"][0]["price"] = 199000.0
+    updated[0]["products"][1:] = [{"name": "Pixel 8", "description": "128GB", "price": 70000, "quantity": 3}]
+    updated[1] = {"name": "Ноутбуки", "description": "Категория ноутбуков", "products": []}
+    result = reload_data_from_json(categories, write_catalog(updated, "products_v2.json"))
+
+    assert [category.name for category in result.categories] == ["Смартфоны", "Ноутбуки"]
+    assert result.categories[0] is phones
+    assert phones._products[0] is iphone
+    assert xiaomi not in phones._products
+    assert phones.products == ["Iphone 15, 199000 руб. Остаток: 8 шт.", "Pixel 8, 70000 руб. Остаток: 3 шт."]
+    assert phones.middle_price() == (199000 + 70000) / 2
+    assert (result.added, result.removed, result.updated) == (1, 2, 1)
+    assert Category.category_count == 2
+    assert Category.product_count == 2
+
+
+def test_reload_without_changes_keeps_counters(catalog_file):
+    categories = load_data_from_json(catalog_file)
+    result = reload_data_from_json(categories, catalog_file)
+    assert (result.added, result.removed, result.updated) == (0, 0, 0)
+    assert Category.category_count == 2
+    assert Category.product_count == 3
+
+
+def test_reload_compares_all_fields_of_the_type(write_catalog):
+    phone = {
+        "type": "smartphone", "name": "Iphone 15", "description": "512GB", "price": 210000.0, "quantity": 8,
+        "efficiency": "A16", "model": "15", "memory": 512, "color": "Gray space",
+    }
+    case = {"name": "Чехол", "description": "Силикон", "price": 990.0, "quantity": 14}
+    catalog = [{"name": "Смартфоны", "description": "Категория смартфонов", "products": [phone, case]}]
+    categories = load_data_from_json(write_catalog(catalog))
+    iphone, old_case = categories[0]._products
+
+    phone.update(color="Синий", memory=1024)
+    grass = {"type": "lawn_grass", "country": "Китай", "germination_period": "1 неделя", "color": "Зелёный"}
+    catalog[0]["products"][1] = {**case, **grass}
+    result = reload_data_from_json(categories, write_catalog(catalog, "products_v2.json"))
+
+    assert (result.added, result.removed, result.updated) == (1, 1, 1)
+    assert categories[0]._products[0] is iphone
+    assert (iphone.color, iphone.memory) == ("Синий", 1024)
+    assert categories[0].products[0] == (
+        "Iphone 15, 210000 руб. Остаток: 8 шт., модель: 15, память: 1024 ГБ, цвет: Синий"
+    )
+    assert old_case not in categories[0]._products
+    assert isinstance(categories[0]._products[1], LawnGrass)
+    assert Category.product_count == 2
+
+
+def test_reload_reports_invalid_rows_and_keeps_their_products(catalog_file, catalog_data, write_catalog):
+    categories = load_data_from_json(catalog_file)
+    iphone, xiaomi = categories[0]._products
+    catalog_data[0]["products"][0]["price"] = 0
+    catalog_data[0]["products"][1]["quantity"] = "много"
+    catalog_data[1]["products"].append({"name": "OLED", "description": "4K", "price": -1, "quantity": 2})
+
+    result = reload_data_from_json(categories, write_catalog(catalog_data, "products_v2.json"))
+
+    assert [(error.category, error.row, error.field) for error in result.errors] == [
+        ("Смартфоны", 0, "price"),
+        ("Смартфоны", 1, "quantity"),
+        ("Телевизоры", 1, "price"),
+    ]
+    assert (result.added, result.removed, result.updated) == (0, 0, 0)
+    assert list(categories[0]._products) == [iphone, xiaomi]
+    assert iphone.price == 210000.0
+    assert Category.product_count == 3
+
+
+def test_reload_checks_storage_before_changing_anything(catalog_file, catalog_data, write_catalog, tmp_path):
+    snapshot_path = str(tmp_path / "catalog.snap")
+    save_snapshot(load_data_from_json(catalog_file), snapshot_path)
+    categories = load_snapshot(snapshot_path)
+    catalog_data[0]["products"][0]["price"] = 1.0
+    del catalog_data[0]["products"][1]
+
+    with pytest.raises(TypeError, match="удаление"):
+        reload_data_from_json(categories, write_catalog(catalog_data, "products_v2.json"))
+
+    assert categories[0].middle_price() == (210000.0 + 31000) / 2
+    assert categories[0]._products[0].price == 210000.0
+
+
+def test_remove_product_updates_category():
+    product = Product("Товар", "Описание", 100, 10)
+    other = Product("Другой", "Описание", 50, 2)
+    category = Category("Категория", "Описание", [product, other])
+    category.cheapest()
+    category.remove_product(product)
+    product.price = 500
+    assert category.products == ["Другой, 50 руб. Остаток: 2 шт."]
+    assert category.total_quantity == 2
+    assert category.most_expensive(1) == [other]
+    assert Category.product_count == 1
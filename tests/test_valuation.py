@@ -0,0 +1,87 @@
+import pytest
+
+import src.valuation as valuation
+from src.classes import Category, LawnGrass, Product, Smartphone
+from src.lazy import LazyProducts
+from src.table import ProductTable
+from src.valuation import stock_value, value_by, value_by_category, value_by_type
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    if request.param == "numpy":
+        if valuation.np is None:
+            pytest.skip("NumPy не установлен")
+    else:
+        monkeypatch.setattr(valuation, "np", None)
+    return request.param
+
+
+def make_phone(name, price, quantity):
+    return Smartphone(name, "Описание", price, quantity, 95.5, "S23", 256, "Серый")
+
+
+def make_grass(name, price, quantity):
+    return LawnGrass(name, "Описание", price, quantity, "Россия", "7 дней", "Зеленый")
+
+
+def test_two_products_match_add_exactly(engine):
+    first, second = Product("A", "a", 0.1, 3), Product("B", "b", 0.7, 7)
+    assert stock_value([first, second]) == first + second
+
+
+def test_groupings(engine):
+    phones = Category("Смартфоны", "Телефоны", [make_phone("P1", 100.5, 3), make_phone("P2", 200.25, 2)])
+    grass = Category("Трава", "Газон", [make_grass("G1", 10.1, 7)])
+    categories = [phones, grass]
+
+    assert value_by_category(categories) == {"Смартфоны": 100.5 * 3 + 200.25 * 2, "Трава": 10.1 * 7}
+    assert value_by_type(categories) == {"Smartphone": 100.5 * 3 + 200.25 * 2, "LawnGrass": 10.1 * 7}
+    by_band = value_by(categories, lambda category, product: (category.name, product.price > 150))
+    assert by_band == {("Смартфоны", False): 100.5 * 3, ("Смартфоны", True): 200.25 * 2, ("Трава", False): 10.1 * 7}
+
+
+def test_mixed_types_in_group_are_rejected(engine):
+    mixed = Category("Разное", "Всё подряд", [make_phone("P1", 100.0, 1), make_grass("G1", 10.0, 1)])
+    with pytest.raises(TypeError, match="одного типа"):
+        value_by_category([mixed])
+    assert value_by_type([mixed]) == {"Smartphone": 100.0, "LawnGrass": 10.0}
+    with pytest.raises(TypeError):
+        stock_value([Product("A", "a", 1.0, 1), make_phone("P1", 100.0, 1)])
+
+
+def test_product_table_columns(engine):
+    table = ProductTable.from_records(
+        [{"name": f"Товар {i}", "description": "Описание", "price": 0.1 * i, "quantity": i} for i in range(1, 100)]
+    )
+    category = Category("Таблица", "Колонки", table)
+    expected = stock_value(list(table))
+    assert value_by_category([category]) == {"Таблица": expected}
+    assert value_by_type([category]) == {"Product": expected}
+
+
+def test_product_table_rows_group_with_plain_products(engine):
+    table = Category("Таблица", "Колонки", ProductTable([Product("Мышь", "USB", 5.0, 1)]))
+    plain = Category("Список", "Товары", [Product("Клавиатура", "USB", 50.0, 1)])
+
+    assert value_by_type([plain, table]) == {"Product": 55.0}
+    assert value_by(
+        [plain, table], lambda category, product: product.price > 10
+    ) == {True: 50.0, False: 5.0}
+    assert stock_value([plain._products[0], table._products[0]]) == plain._products[0] + table._products[0]
+
+
+def test_lazy_category_uses_current_products(engine):
+    phone = ("smartphone", ("Телефон", "Описание", 115.0, 2, "95.5", "S23", 256, "Серый"))
+    grass = ("lawn_grass", ("Газон", "Описание", 10.5, 10, "Россия", "7 дней", "Зеленый"))
+    category = Category("Смешанная", "Разные товары", LazyProducts([phone, grass]))
+
+    assert value_by_type([category]) == {"Smartphone": 230.0, "LawnGrass": 105.0}
+    with pytest.raises(TypeError):
+        value_by_category([category])
+
+    category._products[0].price = 900.0
+    category.add_product(make_grass("Газон 2", 5.0, 1))
+
+    assert value_by_type([category]) == {"Smartphone": 1800.0, "LawnGrass": 110.0}
+    assert sum(value_by_type([category]).values()) == category.stock_value